@@ -0,0 +1,118 @@
+"""
+Autenticação JWT sem consulta ao banco para leituras.
+
+Em requisições de leitura (GET/HEAD/OPTIONS) o usuário é montado a
+partir das claims do token (ClaimsTokenUser), sem buscar o User no
+banco. Escritas continuam carregando o usuário completo (is_active,
+permissões), assim como tokens sem as claims (emitidos antes delas): sem
+role/is_staff/is_superuser no token o usuário seria tratado como comum.
+Token com is_active falso é recusado.
+
+Janela de revogação: as claims só valem por JWT_CLAIMS_MAX_AGE segundos
+a partir da emissão (claim iat); depois disso as leituras também buscam
+o usuário no banco até o próximo refresh. Um usuário desativado ou
+rebaixado perde o acesso de leitura em no máximo esse tempo, sem encurtar
+o access token (JWT_TTL). O refresh relê o usuário e regrava as claims
+(api/serializers.py).
+
+Tokens já validados ficam em um cache LRU por processo até expirarem,
+evitando refazer assinatura/claims a cada requisição.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import has_user_claims
+
+
+class ClaimsTokenUser(TokenUser):
+    """Usuário construído a partir das claims do token (sem acesso ao banco)."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', 'USER')
+
+
+class ValidatedTokenCache:
+    """Cache LRU de tokens validados, respeitando a expiração (claim exp)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._tokens = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, raw_token):
+        with self._lock:
+            token = self._tokens.get(raw_token)
+            if token is None:
+                return None
+            if token.get('exp', 0) <= time.time():
+                del self._tokens[raw_token]
+                return None
+            self._tokens.move_to_end(raw_token)
+            return token
+
+    def set(self, raw_token, token):
+        with self._lock:
+            self._tokens[raw_token] = token
+            self._tokens.move_to_end(raw_token)
+            while len(self._tokens) > self.maxsize:
+                self._tokens.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+
+token_cache = ValidatedTokenCache(settings.JWT_VALIDATED_TOKEN_CACHE_SIZE)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que só consulta o banco em métodos de escrita.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and self.trusts_claims(validated_token):
+            if not validated_token['is_active']:
+                raise AuthenticationFailed('User is inactive', code='user_inactive')
+            return self.get_token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def trusts_claims(self, validated_token):
+        """Claims completas e emitidas há menos de JWT_CLAIMS_MAX_AGE segundos."""
+        if not has_user_claims(validated_token):
+            return False
+        return time.time() - validated_token.get('iat', 0) < settings.JWT_CLAIMS_MAX_AGE
+
+    def get_validated_token(self, raw_token):
+        token = token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            token_cache.set(raw_token, token)
+        return token
+
+    def get_token_user(self, validated_token):
+        """Usuário leve a partir das claims (equivalente ao JWTStatelessUserAuthentication)."""
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        return api_settings.TOKEN_USER_CLASS(validated_token)
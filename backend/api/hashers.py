@@ -0,0 +1,21 @@
+"""
+Hashers de senha com custo configurável.
+
+O hasher preferido (primeiro de PASSWORD_HASHERS) é usado para novas
+senhas e, no login bem-sucedido, o Django refaz o hash de senhas antigas
+(PBKDF2 ou parâmetros diferentes) de forma transparente.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id com parâmetros de ARGON2_* (padrão: recomendação OWASP)."""
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 com número de iterações de PBKDF2_ITERATIONS."""
+    iterations = settings.PBKDF2_ITERATIONS
@@ -0,0 +1,102 @@
+"""
+Benchmark HTTP simples contra um servidor em execução (gunicorn, runserver...).
+
+Uso:
+    python manage.py bench_http http://127.0.0.1:8000 --concurrency 16 --duration 10
+    python manage.py bench_http http://127.0.0.1:8000 --path /api/blog/posts/ --path /api/products/categories/
+
+Abre ``--concurrency`` conexões keep-alive (uma por thread) e repete os
+GETs em rodízio pelos ``--path`` durante ``--duration`` segundos. Relata
+requisições/s, latências p50/p95/p99 e respostas não-200. Usado para as
+medições de GUNICORN.md.
+"""
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    '/api/products/categories/',
+    '/api/products/products/by-category/cat-0/',
+    '/api/blog/posts/',
+]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = 'Mede vazão e latência de GETs contra um servidor HTTP'
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='Ex: http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths', help='Caminho (repetível)')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos')
+        parser.add_argument('--header', action='append', default=[], help='Header extra "Nome: valor"')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        if url.scheme not in ('http', 'https') or not url.netloc:
+            raise CommandError('base_url deve ser http(s)://host[:porta]')
+        paths = options['paths'] or DEFAULT_PATHS
+        headers = dict(h.split(':', 1) for h in options['header'])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+        deadline = time.perf_counter() + options['duration']
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def worker(offset):
+            connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+            conn = connection_class(url.netloc, timeout=30)
+            local, local_errors, i = [], [], offset
+            while time.perf_counter() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as exc:
+                    local_errors.append(type(exc).__name__)
+                    conn.close()
+                    conn = connection_class(url.netloc, timeout=30)
+                    continue
+                local.append(time.perf_counter() - start)
+                if response.status != 200:
+                    local_errors.append(str(response.status))
+            conn.close()
+            with lock:
+                latencies.extend(local)
+                errors.extend(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        ms = [value * 1000 for value in latencies]
+        self.stdout.write(
+            f'{len(latencies)} requisições em {elapsed:.1f}s: {len(latencies) / elapsed:.1f} req/s'
+        )
+        if ms:
+            self.stdout.write(
+                f'latência ms: média {statistics.mean(ms):.1f}  p50 {percentile(ms, 0.5):.1f}  '
+                f'p95 {percentile(ms, 0.95):.1f}  p99 {percentile(ms, 0.99):.1f}'
+            )
+        if errors:
+            counts = {name: errors.count(name) for name in set(errors)}
+            self.stdout.write(self.style.WARNING(f'não-200/erros: {counts}'))
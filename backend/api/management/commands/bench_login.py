@@ -0,0 +1,135 @@
+"""
+Benchmark de capacidade do login x latência do catálogo.
+
+Uso:
+    python manage.py bench_login
+    python manage.py bench_login --workers 3 --duration 5
+
+1. Mede o tempo de verificação de senha de cada hasher disponível e a
+   vazão máxima de logins por worker síncrono (1 / tempo de verificação).
+2. Simula ``--workers`` workers síncronos (threads consumindo uma fila,
+   como os workers do gunicorn) recebendo requisições do catálogo a uma
+   taxa fixa e logins a taxas crescentes, e mede a latência do catálogo
+   (espera na fila + atendimento). Mostra a partir de quantos logins/s
+   o catálogo degrada.
+"""
+import queue
+import statistics
+import threading
+import time
+
+from django.contrib.auth.hashers import check_password, get_hasher, get_hashers
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+PASSWORD = 'senha-de-benchmark-123'
+CATALOG_URL = '/api/products/products/'
+
+
+def verify_time(encoded, samples):
+    """Tempo mediano (s) de check_password para um hash."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        check_password(PASSWORD, encoded)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Mede logins/s por worker e a latência do catálogo sob carga de login"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3, help='Workers síncronos simulados')
+        parser.add_argument('--duration', type=float, default=3.0, help='Segundos por cenário')
+        parser.add_argument('--catalog-rate', type=float, default=20.0, help='Requisições/s ao catálogo')
+        parser.add_argument('--samples', type=int, default=5, help='Amostras por hasher')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Hashers (verificação de senha):')
+        for hasher in get_hashers():
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except (ValueError, ImportError):
+                continue
+            seconds = verify_time(encoded, options['samples'])
+            self.stdout.write(
+                f'  {hasher.__class__.__name__:32} {seconds * 1000:8.1f} ms  '
+                f'→ {1 / seconds:7.1f} logins/s por worker'
+            )
+
+        preferred = get_hasher()
+        encoded = preferred.encode(PASSWORD, preferred.salt())
+        login_seconds = verify_time(encoded, options['samples'])
+        capacity = options['workers'] / login_seconds
+        self.stdout.write(
+            f'\nHasher preferido: {preferred.algorithm} ({login_seconds * 1000:.1f} ms); '
+            f'capacidade com {options["workers"]} workers ≈ {capacity:.1f} logins/s'
+        )
+
+        self.stdout.write(
+            f'\nLatência do catálogo ({options["catalog_rate"]:.0f} req/s) '
+            f'com {options["workers"]} workers:'
+        )
+        self.stdout.write(f'  {"logins/s":>9} {"p50 (ms)":>9} {"p95 (ms)":>9} {"atendidas":>10}')
+        for fraction in (0, 0.25, 0.5, 0.75, 0.9):
+            login_rate = capacity * fraction
+            latencies = self._run_scenario(encoded, login_rate, options)
+            if latencies:
+                self.stdout.write(
+                    f'  {login_rate:9.1f} {percentile(latencies, 50) * 1000:9.1f} '
+                    f'{percentile(latencies, 95) * 1000:9.1f} {len(latencies):10d}'
+                )
+
+    def _run_scenario(self, encoded, login_rate, options):
+        """Roda um cenário e devolve as latências das requisições ao catálogo."""
+        jobs = queue.Queue()
+        latencies = []
+        lock = threading.Lock()
+        stop = object()
+
+        def worker():
+            client = Client(HTTP_HOST='localhost')
+            while True:
+                job = jobs.get()
+                if job is stop:
+                    break
+                kind, enqueued = job
+                if kind == 'login':
+                    check_password(PASSWORD, encoded)
+                else:
+                    client.get(CATALOG_URL)
+                    with lock:
+                        latencies.append(time.perf_counter() - enqueued)
+            connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+
+        # Produtor: chegadas em intervalos regulares para cada tipo
+        start = time.perf_counter()
+        next_catalog = next_login = start
+        catalog_interval = 1 / options['catalog_rate']
+        login_interval = 1 / login_rate if login_rate else None
+        while time.perf_counter() - start < options['duration']:
+            now = time.perf_counter()
+            if now >= next_catalog:
+                jobs.put(('catalog', now))
+                next_catalog += catalog_interval
+            if login_interval and now >= next_login:
+                jobs.put(('login', now))
+                next_login += login_interval
+            time.sleep(0.0005)
+
+        for _ in threads:
+            jobs.put(stop)
+        for thread in threads:
+            thread.join()
+        return latencies
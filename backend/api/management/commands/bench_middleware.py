@@ -0,0 +1,115 @@
+"""
+Custo por requisição da pilha de middlewares de cada perfil de settings.
+
+Uso:
+    python manage.py bench_middleware
+    python manage.py bench_middleware --profile config.settings --profile config.settings.api --requests 5000
+    python manage.py bench_middleware --path /api/blog/posts/
+
+Cada perfil roda num processo Python novo (DJANGO_SETTINGS_MODULE
+diferente) e mede, em µs por requisição (melhor rodada, a menos afetada
+por outros processos):
+
+- middleware: a cadeia de MIDDLEWARE do perfil em volta de uma view vazia
+  (o que cada requisição paga antes de chegar à view);
+- endpoint: a requisição completa para ``--path`` (roteamento, view DRF,
+  cache de respostas), pelo mesmo handler usado pelo WSGI.
+
+O tempo de montar a requisição de teste (RequestFactory) é medido à parte
+e descontado. Sem rede nem servidor: isola o custo do Django do
+gunicorn/nginx.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PROFILES = ['config.settings', 'config.settings.api']
+
+BENCH_SCRIPT = '''
+import json, time
+import django
+django.setup()
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+
+class EmptyViewHandler(WSGIHandler):
+    def _get_response(self, request):
+        return HttpResponse(b'{{}}', content_type='application/json')
+
+
+class NoopHandler:
+    def get_response(self, request):
+        return HttpResponse()
+
+
+def per_request_us(handler, request_factory, n, repeat):
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n):
+            response = handler.get_response(request_factory())
+            response.close()
+        results.append((time.perf_counter() - start) / n * 1e6)
+    return min(results)
+
+
+factory = RequestFactory(SERVER_NAME='localhost', HTTP_ACCEPT_ENCODING='gzip')
+path = {path!r}
+# Aquece (imports tardios, cache de respostas, índice do catálogo)
+status = WSGIHandler().get_response(factory.get(path)).status_code
+# Custo de montar a requisição/resposta no próprio benchmark, descontado dos demais
+overhead = per_request_us(NoopHandler(), lambda: factory.get(path), {n}, {repeat})
+print(json.dumps({{
+    'middleware': len(settings.MIDDLEWARE),
+    'apps': len(settings.INSTALLED_APPS),
+    'status': status,
+    'middleware_us': per_request_us(EmptyViewHandler(), lambda: factory.get(path), {n}, {repeat}) - overhead,
+    'endpoint_us': per_request_us(WSGIHandler(), lambda: factory.get(path), {n}, {repeat}) - overhead,
+}}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Compara o custo por requisição dos middlewares entre perfis de settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', dest='profiles', help='Módulo de settings (repetível)')
+        parser.add_argument('--path', default='/api/products/categories/')
+        parser.add_argument('--requests', type=int, default=2000, help='Requisições por rodada')
+        parser.add_argument('--repeat', type=int, default=7)
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        # Sem throttle: todas as requisições vêm do mesmo "IP"
+        env['THROTTLE_ANON_RATE'] = '1000000/min'
+        script = BENCH_SCRIPT.format(path=options['path'], n=options['requests'], repeat=options['repeat'])
+
+        results = []
+        for profile in options['profiles'] or DEFAULT_PROFILES:
+            result = subprocess.run(
+                [sys.executable, '-c', script],
+                cwd=settings.BASE_DIR, env={**env, 'DJANGO_SETTINGS_MODULE': profile},
+                capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                raise CommandError(f'{profile}: {result.stderr[-2000:]}')
+            results.append((profile, json.loads(result.stdout.strip().splitlines()[-1])))
+
+        self.stdout.write(f'{options["path"]} ({options["requests"]} requisições x {options["repeat"]} rodadas)')
+        self.stdout.write(f'{"perfil":<24}{"apps":>6}{"mw":>5}{"middleware µs":>16}{"endpoint µs":>14}')
+        base_middleware, base_endpoint = results[0][1]['middleware_us'], results[0][1]['endpoint_us']
+        for profile, data in results:
+            if data['status'] != 200:
+                self.stdout.write(self.style.WARNING(f'{profile}: {options["path"]} respondeu {data["status"]}'))
+            self.stdout.write(
+                f'{profile:<24}{data["apps"]:>6}{data["middleware"]:>5}'
+                f'{data["middleware_us"]:>9.1f} ({data["middleware_us"] / base_middleware:>4.0%})'
+                f'{data["endpoint_us"]:>7.1f} ({data["endpoint_us"] / base_endpoint:>4.0%})'
+            )
@@ -0,0 +1,151 @@
+"""
+Leituras e escritas concorrentes no SQLite, backend padrão x config.backends.sqlite3.
+
+Uso:
+    python manage.py bench_sqlite
+    python manage.py bench_sqlite --workers 6 --duration 15 --write-ratio 0.3
+    python manage.py bench_sqlite --mode tuned
+
+Para cada modo copia o banco (API de backup) para um diretório temporário
+e sobe ``--workers`` processos, como workers do gunicorn, que durante
+``--duration`` segundos alternam:
+
+- leitura: 20 produtos ativos com categoria/variantes/tamanhos;
+- escrita (fração ``--write-ratio``): transação que lê um produto e o
+  salva (signals inclusos), o padrão que promove o lock no meio da
+  transação.
+
+"stock" reproduz a configuração anterior (backend do Django, rollback
+journal, timeout de 5 s); "tuned" usa o backend e os PRAGMAs de
+config/backends/sqlite3. O banco de desenvolvimento não é alterado.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from .bench_http import percentile
+
+MODES = {
+    'stock': {'SQLITE_TUNED': 'False', 'SQLITE_BUSY_TIMEOUT': '5', 'journal_mode': 'DELETE'},
+    'tuned': {'SQLITE_TUNED': 'True', 'journal_mode': 'WAL'},
+}
+
+WORKER_SCRIPT = '''
+import json, os, random, time
+from collections import Counter
+import django
+django.setup()
+from django.db import OperationalError, transaction
+from apps.products.models import Product
+
+rnd = random.Random(os.getpid())
+ids = list(Product.objects.values_list('pk', flat=True))
+reads, writes, errors = [], [], Counter()
+time.sleep(max(0, {start_at} - time.time()))
+deadline = time.time() + {duration}
+while time.time() < deadline:
+    start = time.perf_counter()
+    try:
+        if rnd.random() < {write_ratio}:
+            with transaction.atomic():
+                product = Product.objects.get(pk=rnd.choice(ids))
+                product.description = 'bench %d %f' % (os.getpid(), time.time())
+                product.save(update_fields=['description', 'updated_at'])
+            writes.append(time.perf_counter() - start)
+        else:
+            list(Product.objects.filter(is_active=True).with_details()[:20])
+            reads.append(time.perf_counter() - start)
+    except OperationalError as exc:
+        errors[str(exc)] += 1
+print(json.dumps({{'reads': reads, 'writes': writes, 'errors': errors}}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Mede leituras/escritas concorrentes de vários processos no SQLite (padrão x otimizado)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10.0, help='Segundos por modo')
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+        parser.add_argument('--mode', choices=['both', *MODES], default='both')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('O banco default não é SQLite (USE_SQLITE=False)')
+        if options['workers'] < 1:
+            raise CommandError('--workers deve ser >= 1')
+        primary = str(settings.DATABASES['default']['NAME'])
+        modes = list(MODES) if options['mode'] == 'both' else [options['mode']]
+
+        self.stdout.write(
+            f'{options["workers"]} processos, {options["duration"]:.0f}s, '
+            f'{options["write_ratio"]:.0%} escritas'
+        )
+        self.stdout.write(
+            f'{"modo":<7}{"leituras/s":>12}{"escritas/s":>12}{"erros":>7}'
+            f'{"leit. p95":>11}{"escr. p95":>11}{"escr. máx":>11}'
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for mode in modes:
+                path = os.path.join(tmpdir, f'{mode}.sqlite3')
+                self.copy_database(primary, path, MODES[mode]['journal_mode'])
+                result = self.run_workers(mode, path, options)
+                self.report(mode, result, options['duration'])
+
+    @staticmethod
+    def copy_database(primary, path, journal_mode):
+        source, target = sqlite3.connect(primary), sqlite3.connect(path)
+        try:
+            source.backup(target)
+            target.execute(f'PRAGMA journal_mode = {journal_mode}')
+        finally:
+            target.close()
+            source.close()
+
+    def run_workers(self, mode, path, options):
+        env = {**os.environ, 'SQLITE_PATH': path, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        env.update({key: value for key, value in MODES[mode].items() if key.isupper()})
+        # Todos começam juntos, depois do boot do Django
+        script = WORKER_SCRIPT.format(
+            start_at=time.time() + 3, duration=options['duration'], write_ratio=options['write_ratio'],
+        )
+        processes = [
+            subprocess.Popen(
+                [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            for _ in range(options['workers'])
+        ]
+        merged = {'reads': [], 'writes': [], 'errors': Counter()}
+        for process in processes:
+            stdout, stderr = process.communicate()
+            if process.returncode != 0:
+                raise CommandError(f'{mode}: worker falhou\n{stderr[-2000:]}')
+            data = json.loads(stdout.strip().splitlines()[-1])
+            merged['reads'] += data['reads']
+            merged['writes'] += data['writes']
+            merged['errors'].update(data['errors'])
+        return merged
+
+    def report(self, mode, result, duration):
+        reads = sorted(value * 1000 for value in result['reads'])
+        writes = sorted(value * 1000 for value in result['writes'])
+        errors = sum(result['errors'].values())
+        line = (
+            f'{mode:<7}{len(reads) / duration:>12.1f}{len(writes) / duration:>12.1f}{errors:>7}'
+            f'{percentile(reads, 0.95):>9.1f}ms{percentile(writes, 0.95):>9.1f}ms'
+            f'{(writes[-1] if writes else 0):>9.1f}ms'
+        )
+        self.stdout.write(self.style.WARNING(line) if errors else line)
+        for message, count in result['errors'].most_common():
+            self.stdout.write(f'       {count}x {message}')
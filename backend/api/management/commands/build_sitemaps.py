@@ -0,0 +1,32 @@
+"""
+Gera os arquivos de sitemap.xml, rss.xml e atom.xml da versão atual.
+
+Uso:
+    python manage.py build_sitemaps
+    python manage.py build_sitemaps --only sitemap.xml
+
+As views geram o arquivo na primeira requisição após uma alteração do
+catálogo/blog (config/sitemaps.py); rodar este comando depois do deploy ou
+de importações em massa tira essa montagem do caminho do crawler.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from config import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Pré-gera sitemap.xml (com imagens) e os feeds RSS/Atom do blog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=list(sitemaps.DOCUMENTS), action='append', help='Documento a gerar')
+
+    def handle(self, *args, **options):
+        for name in options['only'] or sitemaps.DOCUMENTS:
+            start = time.perf_counter()
+            path = sitemaps.build_document(name)
+            self.stdout.write(
+                f'{name}: {path} ({path.stat().st_size / 1024:.1f} KiB, '
+                f'{(time.perf_counter() - start) * 1000:.0f} ms)'
+            )
@@ -0,0 +1,147 @@
+"""
+EXPLAIN das consultas de cada endpoint público da API.
+
+Uso:
+    python manage.py explain_queries
+    python manage.py explain_queries --verbose        # plano completo de cada consulta
+    python manage.py explain_queries --fail-on-scan   # sai com erro se houver varredura (CI)
+
+Faz um GET anônimo em cada endpoint (slugs tirados do próprio banco),
+com o cache de respostas, o índice do catálogo e os arquivos pré-gerados
+do sitemap/feeds desligados para que as consultas cheguem ao banco, captura os SELECTs executados e roda
+``EXPLAIN QUERY PLAN`` (SQLite) ou ``EXPLAIN`` (PostgreSQL) em cada um.
+
+Sinaliza:
+    SCAN  varredura completa de uma tabela (SQLite "SCAN tabela" sem
+          índice; PostgreSQL "Seq Scan")
+    SORT  ordenação fora de índice (SQLite "USE TEMP B-TREE"; PostgreSQL "Sort")
+
+No PostgreSQL o planejador prefere Seq Scan em tabelas pequenas mesmo
+com índice adequado; rode contra uma base com volume real (e ANALYZE).
+"""
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.blog.models import Post
+from apps.products.models import Category, Product
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def public_endpoints():
+    """(nome, caminho) dos GETs públicos, com slugs existentes no banco."""
+    category = Category.objects.filter(is_active=True, products__is_active=True).first()
+    product = Product.objects.filter(is_active=True).first()
+    post = Post.objects.published().select_related('category').first()
+
+    endpoints = [
+        ('categorias', '/api/products/categories/'),
+        ('produtos', '/api/products/products/'),
+        ('posts', '/api/blog/posts/'),
+        ('arquivo do blog', '/api/blog/posts/archive/'),
+        ('busca no blog', '/api/blog/posts/search/?q=valvula'),
+        ('sitemap', '/sitemap.xml'),
+        ('feed RSS', '/rss.xml'),
+    ]
+    if category is not None:
+        endpoints += [
+            ('categoria', f'/api/products/categories/{category.slug}/'),
+            ('produtos da categoria', f'/api/products/categories/{category.slug}/products/'),
+            ('produtos por categoria', f'/api/products/products/by-category/{category.slug}/'),
+            ('produtos ?category=', f'/api/products/products/?category={category.slug}'),
+        ]
+    if product is not None:
+        endpoints += [
+            ('produto', f'/api/products/products/{product.slug}/'),
+            ('página do produto', f'/api/products/products/{product.slug}/page/'),
+            ('produtos similares', f'/api/products/products/{product.slug}/related/'),
+        ]
+    if post is not None:
+        endpoints += [
+            ('post', f'/api/blog/posts/{post.slug}/'),
+            ('posts relacionados', f'/api/blog/posts/{post.slug}/related/'),
+            ('post anterior/próximo', f'/api/blog/posts/{post.slug}/adjacent/'),
+        ]
+        if post.category_id:
+            endpoints.append(('posts da categoria', f'/api/blog/posts/category/{post.category.slug}/'))
+        if post.published_at:
+            endpoints.append((
+                'posts do mês',
+                f'/api/blog/posts/archive/{post.published_at.year}/{post.published_at.month}/',
+            ))
+    return endpoints
+
+
+def explain(sql):
+    """Linhas do plano e os alertas (SCAN/SORT) encontrados."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            lines = [row[-1] for row in cursor.fetchall()]
+        else:
+            cursor.execute('EXPLAIN ' + sql)
+            lines = [row[0] for row in cursor.fetchall()]
+
+    flags = []
+    for line in lines:
+        text = line.strip()
+        if connection.vendor == 'sqlite':
+            if text.startswith('SCAN ') and ' USING ' not in text:
+                flags.append(('SCAN', text))
+            elif 'USE TEMP B-TREE' in text:
+                flags.append(('SORT', text))
+        elif 'Seq Scan' in text:
+            flags.append(('SCAN', text.lstrip('-> ')))
+        elif text.lstrip('-> ').startswith('Sort '):
+            flags.append(('SORT', text.lstrip('-> ')))
+    return lines, flags
+
+
+class Command(BaseCommand):
+    help = 'Roda EXPLAIN nas consultas dos endpoints públicos e aponta varreduras completas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose', action='store_true', help='Mostra o plano completo de cada consulta')
+        parser.add_argument('--fail-on-scan', action='store_true', help='Erro se alguma consulta varrer uma tabela')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Banco não suportado: {connection.vendor}')
+
+        client = Client(SERVER_NAME='localhost')
+        scans = sorts = total = 0
+        # Diretório vazio: o sitemap/feeds são gerados (e consultados) nesta execução
+        with tempfile.TemporaryDirectory() as sitemap_root, override_settings(
+            CACHES=NO_CACHE, CATALOG_INDEX_ENABLED=False, SITEMAP_ROOT=sitemap_root,
+        ):
+            for name, path in public_endpoints():
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(path)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                selects = [q['sql'] for q in captured.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f'{name}: GET {path} -> {response.status_code}, {len(selects)} consultas'
+                ))
+                for sql in selects:
+                    total += 1
+                    lines, flags = explain(sql)
+                    scans += sum(1 for kind, _ in flags if kind == 'SCAN')
+                    sorts += sum(1 for kind, _ in flags if kind == 'SORT')
+                    if flags or options['verbose']:
+                        self.stdout.write(f'  {sql[:160]}{"..." if len(sql) > 160 else ""}')
+                    for kind, text in flags:
+                        style = self.style.ERROR if kind == 'SCAN' else self.style.WARNING
+                        self.stdout.write(style(f'    {kind}  {text}'))
+                    if options['verbose']:
+                        for line in lines:
+                            self.stdout.write(f'      {line}')
+
+        summary = f'\n{total} consultas: {scans} varreduras completas, {sorts} ordenações fora de índice'
+        self.stdout.write(self.style.ERROR(summary) if scans else self.style.SUCCESS(summary))
+        if scans and options['fail_on_scan']:
+            raise CommandError('Há consultas com varredura completa de tabela')
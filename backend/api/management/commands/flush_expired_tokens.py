@@ -0,0 +1,43 @@
+"""
+Remove em lotes os refresh tokens expirados da blacklist do simplejwt.
+
+Uso (agendar periodicamente, ex: cron diário):
+    python manage.py flush_expired_tokens
+    python manage.py flush_expired_tokens --batch-size 2000 --sleep 0.1
+
+Cada lote é uma transação curta (seleciona ids pelo índice de
+expires_at e apaga OutstandingToken + BlacklistedToken em cascata),
+evitando um DELETE gigante que trava a tabela.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = "Remove em lotes os refresh tokens expirados (outstanding e blacklist)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Tokens removidos por transação')
+        parser.add_argument('--sleep', type=float, default=0, help='Pausa (s) entre lotes')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        now = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by()
+
+        total = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                OutstandingToken.objects.filter(pk__in=ids).delete()
+            total += len(ids)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'{total} tokens expirados removidos'))
@@ -0,0 +1,83 @@
+"""
+Gera todos os snapshots HTML para crawlers e remove os órfãos.
+
+Uso:
+    python manage.py prerender_pages
+    python manage.py prerender_pages --only produtos
+
+Os signals regeram só as páginas afetadas por cada alteração
+(config/prerender.py); este comando é para o deploy (templates novos),
+importações em massa (bulk_create/update não disparam signals) ou para
+recompor PRERENDER_ROOT do zero. Percorre o banco com ``.iterator()``, com
+os mesmos prefetches da API, e apaga os arquivos de páginas que já não
+existem.
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import Post
+from apps.products.models import Category
+from config import prerender
+from config.purge import schedule_purge
+
+CHUNK_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = 'Gera os snapshots HTML de categorias, produtos e posts (para crawlers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['produtos', 'blog'], help='Só uma seção do site')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        sections = [options['only']] if options['only'] else ['produtos', 'blog']
+        written = set()
+        start = time.perf_counter()
+        if 'produtos' in sections:
+            written |= self.build_catalog()
+        if 'blog' in sections:
+            written |= self.build_blog()
+        removed = self.prune(sections, written)
+        schedule_purge(['prerender'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(written)} página(s) gerada(s), {len(removed)} órfã(s) removida(s) '
+            f'em {time.perf_counter() - start:.1f}s ({settings.PRERENDER_ROOT})'
+        ))
+
+    def write(self, path, html):
+        prerender.write_snapshot(path, html)
+        if self.verbosity >= 2:
+            self.stdout.write(f'  {path}')
+        return path
+
+    def build_catalog(self):
+        written = set()
+        for category in Category.objects.filter(is_active=True).iterator(chunk_size=CHUNK_SIZE):
+            products = prerender.public_category_products(category)
+            written.add(self.write(prerender.category_path(category.slug), prerender.render_category(category, products)))
+        for product in prerender.public_products().with_details().iterator(chunk_size=CHUNK_SIZE):
+            path = prerender.product_path(product.category.slug, product.slug)
+            written.add(self.write(path, prerender.render_product(product)))
+        return written
+
+    def build_blog(self):
+        written = set()
+        posts = Post.objects.published().select_related('category', 'author')
+        for post in posts.iterator(chunk_size=CHUNK_SIZE):
+            written.add(self.write(prerender.post_path(post.slug), prerender.render_post(post)))
+        return written
+
+    def prune(self, sections, written):
+        root = Path(settings.PRERENDER_ROOT)
+        removed = []
+        for section in sections:
+            for file in (root / section).rglob('*.html'):
+                path = file.relative_to(root).with_suffix('').as_posix()
+                if path not in written:
+                    file.unlink(missing_ok=True)
+                    removed.append(path)
+        return removed
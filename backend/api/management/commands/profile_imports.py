@@ -0,0 +1,89 @@
+"""
+Perfil do tempo de importação no boot (``python -X importtime``).
+
+Uso:
+    python manage.py profile_imports                      # boot de worker: setup + URLs
+    python manage.py profile_imports --target setup       # só django.setup() (migrate, collectstatic)
+    python manage.py profile_imports --env DEFER_ADMIN_IMPORTS=True --repeat 9
+    python manage.py profile_imports --by module --top 30
+
+Cada rodada é um processo Python novo (imports a frio, como um worker
+recém-criado). O tempo de boot (relógio e CPU do processo, menos sensível
+a uma máquina ocupada) é a mediana das rodadas; a tabela vem da
+última rodada e soma o tempo "self" de cada import por pacote (ou por
+módulo), que é o que um import adiado economiza.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_SCRIPT = '''
+import os, time
+start, cpu_start = time.perf_counter(), time.process_time()
+import django
+django.setup()
+if {load_urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print('BOOT_MS=%.1f CPU_MS=%.1f' % ((time.perf_counter() - start) * 1000, (time.process_time() - cpu_start) * 1000))
+'''
+
+IMPORTTIME_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de boot e os imports mais caros (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=['setup', 'urls'], default='urls')
+        parser.add_argument('--repeat', type=int, default=5, help='Rodadas para a mediana do boot')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--by', choices=['package', 'module'], default='package')
+        parser.add_argument('--env', action='append', default=[], help='Variável KEY=VALUE (repetível)')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        for item in options['env']:
+            key, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'--env espera KEY=VALUE, recebeu {item!r}')
+            env[key] = value
+
+        script = BOOT_SCRIPT.format(load_urls=options['target'] == 'urls')
+        boot_times, cpu_times, stderr = [], [], ''
+        for _ in range(max(1, options['repeat'])):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', script],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            match = re.search(r'BOOT_MS=([\d.]+) CPU_MS=([\d.]+)', result.stdout)
+            if result.returncode != 0 or not match:
+                raise CommandError(result.stderr[-2000:] or 'falha ao executar o boot')
+            boot_times.append(float(match.group(1)))
+            cpu_times.append(float(match.group(2)))
+            stderr = result.stderr
+
+        rows = [
+            (int(m.group(1)), int(m.group(2)), m.group(4))
+            for m in map(IMPORTTIME_RE.match, stderr.splitlines()) if m
+        ]
+        totals = Counter()
+        for self_us, _, name in rows:
+            totals[name if options['by'] == 'module' else name.split('.')[0]] += self_us
+
+        self.stdout.write(
+            f'boot ({options["target"]}): mediana {statistics.median(boot_times):.0f} ms '
+            f'(min {min(boot_times):.0f}, max {max(boot_times):.0f}, {len(boot_times)} rodadas); '
+            f'CPU mediana {statistics.median(cpu_times):.0f} ms'
+        )
+        self.stdout.write(f'{len(rows)} módulos importados, {sum(r[0] for r in rows) / 1000:.0f} ms em imports')
+        self.stdout.write(f'\n{"ms":>8}  {options["by"]}')
+        for name, self_us in totals.most_common(options['top']):
+            self.stdout.write(f'{self_us / 1000:8.1f}  {name}')
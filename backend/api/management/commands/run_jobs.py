@@ -0,0 +1,42 @@
+"""
+Executa a fila de tarefas pós-commit (config/jobs.py): recomendações,
+snapshots HTML e purga do CDN.
+
+Uso:
+    python manage.py run_jobs                    # uma rodada (cron a cada minuto)
+    python manage.py run_jobs --loop             # worker (docker-compose: serviço worker)
+    python manage.py run_jobs --kind purge --loop --interval 2
+
+Com LocMemCache (sem REDIS_URL) a invalidação do cache de respostas feita
+aqui (recomendações) não chega aos workers do gunicorn; em produção use
+Redis, como para o publish_scheduled.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from config import jobs
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas pendentes (purga do CDN, snapshots HTML, recomendações)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(jobs.HANDLERS), action='append', help='Só estes tipos')
+        parser.add_argument('--loop', action='store_true', help='Não termina: repete a cada --interval segundos')
+        parser.add_argument('--interval', type=float, default=5, help='Pausa entre rodadas com --loop')
+        parser.add_argument('--batch-size', type=int, default=jobs.BATCH_SIZE, help='Chaves por execução')
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            done = jobs.run_pending(options['kind'], max(1, options['batch_size']))
+            if done or not options['loop']:
+                summary = ', '.join(f'{kind}: {count}' for kind, count in done.items()) or 'nada pendente'
+                self.stdout.write(f'{summary} ({(time.perf_counter() - start) * 1000:.0f} ms)')
+            if not options['loop']:
+                return
+            # Conexões abertas há mais que CONN_MAX_AGE (ou quebradas) são reabertas
+            close_old_connections()
+            time.sleep(options['interval'])
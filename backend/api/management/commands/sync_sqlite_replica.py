@@ -0,0 +1,65 @@
+"""
+Copia o banco SQLite primário para as réplicas de SQLITE_REPLICA_PATHS.
+
+Uso (teste local do roteamento para réplicas, config/db_router.py):
+    SQLITE_REPLICA_PATHS=replica.sqlite3 python manage.py sync_sqlite_replica
+    SQLITE_REPLICA_PATHS=replica.sqlite3 python manage.py sync_sqlite_replica --interval 2   # contínuo, com atraso
+
+Usa a API de backup do SQLite (cópia consistente com o primário em uso)
+para um arquivo temporário, trocado atomicamente pelo da réplica: as
+conexões já abertas terminam na cópia antiga, as novas abrem a nova.
+Com ``--interval`` simula uma réplica com atraso de até N segundos.
+"""
+import os
+import sqlite3
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def replica_paths():
+    paths = []
+    for alias in settings.DATABASE_REPLICAS:
+        name = str(settings.DATABASES[alias]['NAME'])
+        # "file:/caminho/replica.sqlite3?mode=ro" -> "/caminho/replica.sqlite3"
+        paths.append(urlsplit(name).path if name.startswith('file:') else name)
+    return paths
+
+
+class Command(BaseCommand):
+    help = 'Copia o SQLite primário para as réplicas locais (SQLITE_REPLICA_PATHS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Repete a cada N segundos (0 = uma vez)')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('Só para o primário em SQLite; no PostgreSQL use a replicação nativa')
+        paths = replica_paths()
+        if not paths:
+            raise CommandError('Nenhuma réplica configurada (SQLITE_REPLICA_PATHS)')
+
+        primary = str(settings.DATABASES['default']['NAME'])
+        while True:
+            start = time.perf_counter()
+            for path in paths:
+                self.copy(primary, path)
+            self.stdout.write(f'{len(paths)} réplica(s) sincronizada(s) em {(time.perf_counter() - start) * 1000:.0f} ms')
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def copy(primary, path):
+        tmp = f'{path}.tmp'
+        source = sqlite3.connect(primary)
+        target = sqlite3.connect(tmp)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp, path)
@@ -0,0 +1,68 @@
+"""
+Contadores de métricas no cache compartilhado.
+
+Os contadores ficam no mesmo backend de cache dos throttles (Redis em
+produção), então são agregados entre workers. ``metrics_view`` os expõe
+no formato texto do Prometheus.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'metrics:'
+
+THROTTLE_DECISIONS = ('allowed', 'throttled', 'exempt')
+RESPONSE_CACHE_COUNTERS = ('response_cache_hit', 'response_cache_miss')
+DB_ROUTING_COUNTERS = ('db_replica_reads',)
+
+
+def incr(name, amount=1):
+    key = KEY_PREFIX + name
+    # add() cria o contador sem expiração; incr() é atômico no Redis
+    if cache.add(key, amount, timeout=None):
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, timeout=None)
+
+
+def record_throttle(scope, decision):
+    incr(f'throttle_{scope}_{decision}')
+
+
+def counter_names():
+    scopes = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+    names = [f'throttle_{scope}_{decision}' for scope in scopes for decision in THROTTLE_DECISIONS]
+    return names + list(RESPONSE_CACHE_COUNTERS) + list(DB_ROUTING_COUNTERS)
+
+
+def snapshot():
+    """Valores atuais de todos os contadores conhecidos."""
+    names = counter_names()
+    values = cache.get_many([KEY_PREFIX + name for name in names])
+    return {name: values.get(KEY_PREFIX + name, 0) for name in names}
+
+
+def render_prometheus(values):
+    lines = []
+    for name, value in values.items():
+        if name.startswith('throttle_'):
+            for decision in THROTTLE_DECISIONS:
+                suffix = f'_{decision}'
+                if name.endswith(suffix):
+                    scope = name[len('throttle_'):-len(suffix)]
+                    lines.append(
+                        f'nexus_throttle_decisions_total{{scope="{scope}",decision="{decision}"}} {value}'
+                    )
+                    break
+        elif name in RESPONSE_CACHE_COUNTERS:
+            result = name.rsplit('_', 1)[1]
+            lines.append(f'nexus_response_cache_total{{result="{result}"}} {value}')
+        else:
+            # Contadores sem rótulos: db_replica_reads -> nexus_db_replica_reads_total
+            lines.append(f'nexus_{name}_total {value}')
+    header = [
+        '# TYPE nexus_throttle_decisions_total counter',
+        '# TYPE nexus_response_cache_total counter',
+    ] + [f'# TYPE nexus_{name}_total counter' for name in DB_ROUTING_COUNTERS]
+    return '\n'.join(header + lines) + '\n'
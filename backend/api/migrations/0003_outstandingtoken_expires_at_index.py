@@ -0,0 +1,22 @@
+# Migration: índice em token_blacklist_outstandingtoken.expires_at
+#
+# O app token_blacklist (simplejwt) não indexa expires_at; sem o índice,
+# flush_expired_tokens faz varredura completa da tabela a cada lote.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_delete_blogpost_remove_categoryimage_category_and_more"),
+        ("token_blacklist", "0011_linearizes_history"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at_idx "
+            "ON token_blacklist_outstandingtoken (expires_at);",
+            "DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at_idx;",
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Migration: fila de tarefas pós-commit (config/jobs.py)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_outstandingtoken_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeferredJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(max_length=32)),
+                ("key", models.CharField(max_length=512)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Tarefa pendente",
+                "verbose_name_plural": "Tarefas pendentes",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="deferredjob",
+            constraint=models.UniqueConstraint(fields=("kind", "key"), name="api_deferredjob_kind_key_uniq"),
+        ),
+    ]
@@ -1,6 +1,6 @@
 """
-User model apenas - mantido para autenticação.
-Todos os outros models foram removidos (produtos, categorias, etc).
+User model - mantido para autenticação.
+DeferredJob: fila das tarefas pós-commit (config/jobs.py).
 """
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
@@ -43,3 +43,21 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class DeferredJob(models.Model):
+    """Tarefa pendente da fila de config/jobs.py (uma linha por tipo + chave)."""
+    kind = models.CharField(max_length=32)
+    key = models.CharField(max_length=512)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Tarefa pendente'
+        verbose_name_plural = 'Tarefas pendentes'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='api_deferredjob_kind_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}: {self.key}'
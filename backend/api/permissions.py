@@ -1,4 +1,16 @@
 """
-Permissions removidas - apenas blog possui permissions agora.
-Este arquivo é mantido vazio para evitar erros de importação.
+Permissions do app api (as do blog ficam em apps/blog/permissions.py).
 """
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class HasMetricsToken(BasePermission):
+    """Libera o acesso com o header X-Metrics-Token igual a METRICS_TOKEN."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        provided = request.META.get('HTTP_X_METRICS_TOKEN', '')
+        return bool(token) and hmac.compare_digest(provided, token)
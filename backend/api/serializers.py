@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import authenticate
 from .models import User
+from .tokens import UserClaimsRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -16,34 +20,36 @@ class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True, style={'input_type': 'password'})
 
-from .models import User
-
-
-class UserSerializer(serializers.ModelSerializer):
-    """Serializer para o modelo User."""
-    class Meta:
-        model = User
-        fields = ['id', 'email', 'name', 'role', 'is_active', 'is_staff']
-        read_only_fields = ['id', 'is_active', 'is_staff']
 
+class UserClaimsRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh que relê o usuário e regrava role/is_staff/is_superuser/is_active.
 
-class LoginSerializer(serializers.Serializer):
-    """Serializer para login."""
-    email = serializers.EmailField()
-    password = serializers.CharField(write_only=True, style={'input_type': 'password'})
+    Sem isso as claims do login seriam copiadas para cada access token (e
+    para o refresh rotacionado) até a cadeia expirar: um admin rebaixado
+    manteria os privilégios nas leituras sem banco.
+    """
+    token_class = UserClaimsRefreshToken
 
-from .models import User
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
 
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first() if user_id else None
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        refresh.set_user_claims(user)
 
-class UserSerializer(serializers.ModelSerializer):
-    """Serializer para o modelo User."""
-    class Meta:
-        model = User
-        fields = ['id', 'email', 'name', 'role', 'is_active', 'is_staff']
-        read_only_fields = ['id', 'is_active', 'is_staff']
+        data = {'access': str(refresh.access_token)}
 
+        # Rotação como no TokenRefreshSerializer (o refresh usado vai para a blacklist)
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
 
-class LoginSerializer(serializers.Serializer):
-    """Serializer para login."""
-    email = serializers.EmailField()
-    password = serializers.CharField(write_only=True, style={'input_type': 'password'})
+        return data
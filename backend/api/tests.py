@@ -0,0 +1,235 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from config import jobs, purge
+
+from . import metrics
+from .authentication import ClaimsTokenUser, StatelessJWTAuthentication, token_cache
+from .models import DeferredJob, User
+from .throttling import AnonBurstThrottle
+from .tokens import UserClaimsRefreshToken
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            email='admin@nexus.test', password='senha-forte-123', role='ADMIN', is_staff=True, is_superuser=True,
+        )
+        response = self.client.post(
+            '/api/auth/login', {'email': 'admin@nexus.test', 'password': 'senha-forte-123'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.tokens = response.json()
+        self.token = self.tokens['token']
+
+    def authenticate(self, method):
+        request = getattr(RequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return StatelessJWTAuthentication().authenticate(request)[0]
+
+    def test_login_tokens_carry_claims(self):
+        access = AccessToken(self.token)
+        self.assertEqual((access['role'], access['is_staff'], access['is_superuser']), ('ADMIN', True, True))
+        self.assertIs(access['is_active'], True)
+
+    def test_safe_method_uses_claims_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate('get')
+        self.assertIsInstance(user, ClaimsTokenUser)
+        self.assertEqual((user.role, user.is_staff), ('ADMIN', True))
+
+    def test_write_loads_user_from_database(self):
+        user = self.authenticate('post')
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_inactive_claim_is_rejected(self):
+        self.user.is_active = False
+        self.token = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('get')
+
+    @override_settings(JWT_CLAIMS_MAX_AGE=0)
+    def test_claims_past_max_age_fall_back_to_database(self):
+        self.assertIsInstance(self.authenticate('get'), User)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('get')
+
+    def test_rotated_refresh_token_is_blacklisted(self):
+        def refresh():
+            return self.client.post(
+                '/api/auth/refresh', {'refresh_token': self.tokens['refresh_token']},
+                content_type='application/json',
+            )
+
+        self.assertEqual(refresh().status_code, 200)
+        self.assertEqual(refresh().status_code, 401)
+
+
+class ClaimsRefreshTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            email='admin@nexus.test', password='senha-forte-123', role='ADMIN', is_staff=True, is_superuser=True,
+        )
+
+    def login(self):
+        response = self.client.post(
+            '/api/auth/login', {'email': 'admin@nexus.test', 'password': 'senha-forte-123'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def refresh(self, refresh_token):
+        return self.client.post(
+            '/api/auth/refresh', {'refresh_token': refresh_token}, content_type='application/json',
+        )
+
+    def metrics(self, access_token):
+        return self.client.get('/api/metrics', HTTP_AUTHORIZATION=f'Bearer {access_token}')
+
+    def test_refresh_rereads_demoted_user(self):
+        tokens = self.login()
+        self.assertEqual(self.metrics(tokens['token']).status_code, 200)
+
+        User.objects.filter(pk=self.user.pk).update(role='USER', is_staff=False, is_superuser=False)
+        response = self.refresh(tokens['refresh_token'])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        access, refresh = AccessToken(data['token']), RefreshToken(data['refresh_token'])
+        for token in (access, refresh):
+            self.assertEqual((token['role'], token['is_staff'], token['is_superuser']), ('USER', False, False))
+        self.assertEqual(self.metrics(data['token']).status_code, 403)
+
+    def test_refresh_rejects_inactive_user(self):
+        tokens = self.login()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(tokens['refresh_token']).status_code, 401)
+
+    def test_token_without_claims_falls_back_to_database(self):
+        # Emitido antes das claims: sem elas o usuário não pode virar "comum"
+        legacy = RefreshToken.for_user(self.user).access_token
+        self.assertNotIn('is_staff', legacy)
+        self.assertEqual(self.metrics(str(legacy)).status_code, 200)
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=False, is_superuser=False)
+        token_cache.clear()
+        self.assertEqual(self.metrics(str(legacy)).status_code, 403)
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(AnonBurstThrottle, 'timer', lambda throttle: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rates = mock.patch.object(AnonBurstThrottle, 'THROTTLE_RATES', {'anon': '3/min'})
+        rates.start()
+        self.addCleanup(rates.stop)
+
+    def allow(self, **headers):
+        request = RequestFactory().get('/api/products/products/', **headers)
+        request.user = mock.Mock(is_authenticated=False)
+        throttle = AnonBurstThrottle()
+        return throttle.allow_request(request, view=object()), throttle.wait()
+
+    def test_burst_then_refill(self):
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True, True, True, False])
+        allowed, wait = self.allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 20.0)
+
+        self.now += 20
+        self.assertEqual([self.allow()[0] for _ in range(2)], [True, False])
+
+    def test_refill_is_capped_at_capacity(self):
+        self.allow()
+        self.now += 3600
+        self.assertEqual([self.allow()[0] for _ in range(4)], [True, True, True, False])
+
+    def test_client_supplied_forwarded_for_is_ignored(self):
+        # O nginx acrescenta o IP real ao fim; o que vem antes é do cliente
+        spoofed = [
+            self.allow(HTTP_X_FORWARDED_FOR=f'10.0.0.{n}, 203.0.113.7', REMOTE_ADDR='172.18.0.5')[0]
+            for n in range(4)
+        ]
+        self.assertEqual(spoofed, [True, True, True, False])
+        self.assertTrue(self.allow(HTTP_X_FORWARDED_FOR='203.0.113.8', REMOTE_ADDR='172.18.0.5')[0])
+
+    def test_concurrent_requests_do_not_overspend(self):
+        # Leitura lenta alarga a janela entre get e set: sem o lock, várias
+        # threads leem o mesmo saldo e liberam mais que a capacidade
+        def slow_get(*args, **kwargs):
+            value = cache.get(*args, **kwargs)
+            time.sleep(0.005)
+            return value
+
+        slow_cache = mock.Mock(wraps=cache, get=mock.Mock(side_effect=slow_get))
+        with mock.patch.object(AnonBurstThrottle, 'cache', slow_cache), ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.allow()[0], range(32)))
+        self.assertEqual(results.count(True), 3)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_replica_reads_have_their_own_counter(self):
+        metrics.incr('db_replica_reads', 7)
+        metrics.incr('response_cache_hit')
+        lines = metrics.render_prometheus(metrics.snapshot()).splitlines()
+        self.assertIn('# TYPE nexus_db_replica_reads_total counter', lines)
+        self.assertIn('nexus_db_replica_reads_total 7', lines)
+        self.assertIn('nexus_response_cache_total{result="hit"} 1', lines)
+        self.assertFalse([line for line in lines if 'result="reads"' in line])
+
+
+class DeferredJobTests(TestCase):
+    def setUp(self):
+        purge.get_purger().history.clear()
+
+    def test_enqueue_collapses_duplicate_keys(self):
+        purge.schedule_purge(['product-1', 'product-list'])
+        purge.schedule_purge(['product-list'])
+        self.assertEqual(
+            sorted(DeferredJob.objects.values_list('kind', 'key')),
+            [('purge', 'product-1'), ('purge', 'product-list')],
+        )
+        self.assertEqual(list(purge.get_purger().history), [])
+
+    def test_run_pending_sends_one_purge(self):
+        purge.schedule_purge(['product-1', 'product-list'])
+        self.assertEqual(jobs.run_pending(), {'purge': 2})
+        self.assertEqual(list(purge.get_purger().history), [('product-1', 'product-list')])
+        self.assertFalse(DeferredJob.objects.exists())
+
+    def test_failed_job_is_retried_then_dropped(self):
+        purge.schedule_purge(['product-1'])
+        with mock.patch.object(purge.LoggingPurger, 'purge', side_effect=OSError('timeout')):
+            for attempt in range(1, jobs.MAX_ATTEMPTS):
+                with self.assertLogs('config.jobs', 'ERROR'):
+                    self.assertEqual(jobs.run_pending(), {})
+                self.assertEqual(DeferredJob.objects.get().attempts, attempt)
+            with self.assertLogs('config.jobs', 'ERROR'):
+                jobs.run_pending()
+        self.assertFalse(DeferredJob.objects.exists())
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge.schedule_purge(['post-list'])
+            self.assertEqual(list(purge.get_purger().history), [])
+        self.assertEqual(list(purge.get_purger().history), [('post-list',)])
+        self.assertFalse(DeferredJob.objects.exists())
@@ -0,0 +1,188 @@
+"""
+Throttles da API.
+
+SlidingWindowThrottle usa o algoritmo de janela deslizante por contador:
+dois contadores no cache (janela atual e anterior) e a estimativa
+``anterior * (1 - fração decorrida) + atual``. São duas leituras e um
+incremento por requisição, sem guardar o histórico de timestamps como o
+SimpleRateThrottle do DRF.
+
+TokenBucketThrottle (tráfego geral da API) guarda ``(tokens, timestamp)``
+por cliente: o balde enche a ``taxa / duração`` tokens por segundo até a
+capacidade, permitindo rajadas curtas sem estourar a média. Ler, reabastecer
+e consumir é uma operação atômica, para que requisições simultâneas de
+vários workers não passem todas com o mesmo saldo: com Redis (REDIS_URL)
+é um script Lua executado no servidor; com o LocMemCache (um cache por
+processo) é um lock do processo. Respostas já presentes no cache de
+respostas (``config.cache``) não consomem tokens.
+
+Todas as decisões são contadas em ``api.metrics``.
+"""
+import threading
+
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import SimpleRateThrottle
+
+from api import metrics
+
+# Reabastece e consome um token numa única operação no Redis.
+# KEYS[1] = balde; ARGV = capacidade, tokens/s, agora, ttl.
+# Devolve {1 se permitido, tokens restantes (string: Lua trunca números)}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return {allowed, tostring(tokens)}
+"""
+
+_bucket_lock = threading.Lock()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Base para throttles por janela deslizante (taxas em DEFAULT_THROTTLE_RATES)."""
+
+    cache_format = 'throttle:%(scope)s:%(ident)s:%(window)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        elapsed = (now % self.duration) / self.duration
+        current_key = self.cache_format % {'scope': self.scope, 'ident': ident, 'window': window}
+        previous_key = self.cache_format % {'scope': self.scope, 'ident': ident, 'window': window - 1}
+
+        counts = self.cache.get_many([current_key, previous_key])
+        previous = counts.get(previous_key, 0)
+        current = counts.get(current_key, 0)
+        if previous * (1 - elapsed) + current >= self.num_requests:
+            self._wait = self._compute_wait(previous, current, elapsed)
+            metrics.record_throttle(self.scope, 'throttled')
+            return False
+
+        # add() não sobrescreve um contador existente; incr() é atômico no Redis
+        self.cache.add(current_key, 0, timeout=self.duration * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, timeout=self.duration * 2)
+        metrics.record_throttle(self.scope, 'allowed')
+        return True
+
+    def _compute_wait(self, previous, current, elapsed):
+        """Segundos até a estimativa cair abaixo do limite."""
+        if current >= self.num_requests or not previous:
+            return (1 - elapsed) * self.duration
+        needed = 1 - (self.num_requests - current) / previous
+        return max(0.0, (needed - elapsed) * self.duration)
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    """Tentativas de login por IP."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginEmailThrottle(SlidingWindowThrottle):
+    """Tentativas de login por email (protege cada conta contra força bruta distribuída)."""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not email or not isinstance(email, str):
+            return None
+        return email.strip().lower()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Base para throttles por balde de tokens (capacidade = número de requisições da taxa)."""
+
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        # Resposta já cacheada custa quase nada: não consome tokens
+        get_cached_response = getattr(view, 'get_cached_response', None)
+        if get_cached_response is not None and get_cached_response(request) is not None:
+            metrics.record_throttle(self.scope, 'exempt')
+            return True
+
+        refill_rate = self.num_requests / self.duration
+        allowed, tokens = self.take_token(self.timer(), refill_rate)
+        if not allowed:
+            self._wait = (1 - tokens) / refill_rate
+            metrics.record_throttle(self.scope, 'throttled')
+            return False
+
+        metrics.record_throttle(self.scope, 'allowed')
+        return True
+
+    def take_token(self, now, refill_rate):
+        """Reabastece e tenta consumir um token; devolve (permitido, tokens restantes)."""
+        if isinstance(self.cache, RedisCache):
+            key = self.cache.make_key(self.key)
+            client = self.cache._cache.get_client(key, write=True)
+            allowed, tokens = client.register_script(TOKEN_BUCKET_LUA)(
+                keys=[key], args=[self.num_requests, refill_rate, now, self.duration],
+            )
+            return bool(allowed), float(tokens)
+
+        # LocMemCache é por processo: o lock do processo basta para a atomicidade
+        with _bucket_lock:
+            tokens, updated_at = self.cache.get(self.key, (self.num_requests, now))
+            tokens = min(self.num_requests, tokens + max(0.0, now - updated_at) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.cache.set(self.key, (tokens, now), timeout=self.duration)
+        return allowed, tokens
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class AnonBurstThrottle(TokenBucketThrottle):
+    """Requisições anônimas por IP."""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UserBurstThrottle(TokenBucketThrottle):
+    """Requisições autenticadas por usuário."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
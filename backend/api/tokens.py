@@ -0,0 +1,28 @@
+"""
+Tokens JWT com as claims usadas pela autenticação sem banco
+(ver api/authentication.py).
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Claims copiadas do usuário para o token (e do refresh para o access)
+USER_CLAIMS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+
+def has_user_claims(token):
+    """Tokens emitidos antes das claims (ou por outro emissor) não as têm."""
+    return all(claim in token for claim in USER_CLAIMS)
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """RefreshToken que carrega role/is_staff/is_superuser/is_active do usuário."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        """Grava (ou atualiza, no refresh) as claims com o estado atual do usuário."""
+        for claim in USER_CLAIMS:
+            self[claim] = getattr(user, claim)
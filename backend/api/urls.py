@@ -3,14 +3,6 @@ from . import views
 
 urlpatterns = [
     path('auth/login', views.login_view, name='login'),
-]
-
-
-urlpatterns = [
-    path('auth/login', views.login_view, name='login'),
-]
-
-
-urlpatterns = [
-    path('auth/login', views.login_view, name='login'),
+    path('auth/refresh', views.refresh_view, name='token-refresh'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
@@ -1,19 +1,27 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import authenticate
-from .serializers import LoginSerializer, UserSerializer
+from django.http import HttpResponse
+from . import metrics
+from .permissions import HasMetricsToken
+from .serializers import LoginSerializer, UserClaimsRefreshSerializer, UserSerializer
+from .throttling import LoginIPThrottle, LoginEmailThrottle
+from .tokens import UserClaimsRefreshToken
 from .models import User
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login_view(request):
     """
     Endpoint de login.
     Retorna token JWT e dados do usuário.
+    Limitado por IP e por email (janela deslizante, ver api/throttling.py).
     """
     serializer = LoginSerializer(data=request.data)
     
@@ -41,8 +49,8 @@ def login_view(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Gerar tokens JWT
-    refresh = RefreshToken.for_user(user)
+    # Gerar tokens JWT (com role/is_staff nas claims, ver api/authentication.py)
+    refresh = UserClaimsRefreshToken.for_user(user)
     
     # Serializar dados do usuário
     user_data = UserSerializer(user).data
@@ -53,108 +61,46 @@ def login_view(request):
         'user': user_data
     }, status=status.HTTP_200_OK)
 
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
-from .serializers import LoginSerializer, UserSerializer
-from .models import User
-
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
-def login_view(request):
+def refresh_view(request):
     """
-    Endpoint de login.
-    Retorna token JWT e dados do usuário.
+    Renova o token de acesso a partir do refresh_token.
+    Com ROTATE_REFRESH_TOKENS, o refresh usado vai para a blacklist e um
+    novo refresh_token é devolvido. As claims de papel são relidas do banco
+    (usuário inativo ou removido recebe 401).
     """
-    serializer = LoginSerializer(data=request.data)
-    
-    if not serializer.is_valid():
+    refresh_token = request.data.get('refresh_token')
+    if not refresh_token:
         return Response(
-            {'error': 'Dados inválidos', 'details': serializer.errors},
+            {'error': 'refresh_token é obrigatório'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    
-    email = serializer.validated_data['email']
-    password = serializer.validated_data['password']
-    
-    # Autenticar usuário
-    user = authenticate(request, username=email, password=password)
-    
-    if not user:
+
+    serializer = UserClaimsRefreshSerializer(data={'refresh': refresh_token})
+    try:
+        serializer.is_valid(raise_exception=True)
+    except (TokenError, AuthenticationFailed):
         return Response(
-            {'error': 'Email ou senha incorretos'},
+            {'error': 'Token inválido ou expirado'},
             status=status.HTTP_401_UNAUTHORIZED
         )
-    
-    if not user.is_active:
-        return Response(
-            {'error': 'Usuário inativo'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    # Gerar tokens JWT
-    refresh = RefreshToken.for_user(user)
-    
-    # Serializar dados do usuário
-    user_data = UserSerializer(user).data
-    
+
     return Response({
-        'token': str(refresh.access_token),
-        'refresh_token': str(refresh),
-        'user': user_data
+        'token': serializer.validated_data['access'],
+        'refresh_token': serializer.validated_data.get('refresh', refresh_token),
     }, status=status.HTTP_200_OK)
 
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
-from .serializers import LoginSerializer, UserSerializer
-from .models import User
-
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def login_view(request):
+@api_view(['GET'])
+@permission_classes([HasMetricsToken | IsAdminUser])
+@throttle_classes([])
+def metrics_view(request):
     """
-    Endpoint de login.
-    Retorna token JWT e dados do usuário.
+    Contadores de throttling e do cache de respostas no formato do Prometheus.
     """
-    serializer = LoginSerializer(data=request.data)
-    
-    if not serializer.is_valid():
-        return Response(
-            {'error': 'Dados inválidos', 'details': serializer.errors},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    email = serializer.validated_data['email']
-    password = serializer.validated_data['password']
-    
-    # Autenticar usuário
-    user = authenticate(request, username=email, password=password)
-    
-    if not user:
-        return Response(
-            {'error': 'Email ou senha incorretos'},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
-    
-    if not user.is_active:
-        return Response(
-            {'error': 'Usuário inativo'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    # Gerar tokens JWT
-    refresh = RefreshToken.for_user(user)
-    
-    # Serializar dados do usuário
-    user_data = UserSerializer(user).data
-    
-    return Response({
-        'token': str(refresh.access_token),
-        'refresh_token': str(refresh),
-        'user': user_data
-    }, status=status.HTTP_200_OK)
+    return HttpResponse(
+        metrics.render_prometheus(metrics.snapshot()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from django.db.models import Q
 from django.utils import timezone
+from . import search as blog_search
 from .models import Category, Post
 
 
@@ -20,13 +22,15 @@ class PostAdmin(admin.ModelAdmin):
         "category",
         "cover_image_preview",
         "is_published",
+        "publication_status",
         "published_at",
         "created_at",
     ]
     list_filter = ["is_published", "category", "created_at", "published_at"]
-    search_fields = ["title", "slug", "content", "excerpt", "meta_title", "keywords"]
+    # A busca usa o índice invertido (get_search_results); slug casa direto
+    search_fields = ["title", "slug", "excerpt", "content", "keywords", "focus_keyword"]
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ["created_at", "updated_at", "cover_image_preview", "published_at"]
+    readonly_fields = ["created_at", "updated_at", "cover_image_preview"]
     autocomplete_fields = ["author", "category"]
 
     fieldsets = (
@@ -43,6 +47,7 @@ class PostAdmin(admin.ModelAdmin):
         }),
         ("Publicação", {
             "fields": ("author", "category", "is_published", "published_at", "created_at", "updated_at"),
+            "description": "Com \"Publicado\" marcado e data futura, o post fica agendado para essa data.",
             "classes": ("collapse",),
         }),
     )
@@ -57,9 +62,25 @@ class PostAdmin(admin.ModelAdmin):
 
     cover_image_preview.short_description = "Preview"
 
+    def get_search_results(self, request, queryset, search_term):
+        """Busca pelo índice invertido em vez de icontains sobre o HTML dos posts."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        post_ids = [post_id for post_id, _ in blog_search.search(search_term)]
+        return queryset.filter(Q(pk__in=post_ids) | Q(slug=search_term)), False
+
+    def publication_status(self, obj):
+        if not obj.is_published:
+            return "Rascunho"
+        if obj.published_at and obj.published_at > timezone.now():
+            return "Agendado"
+        return "Publicado"
+
+    publication_status.short_description = "Situação"
+
     def save_model(self, request, obj, form, change):
-        if obj.is_published and not obj.published_at:
-            obj.published_at = timezone.now()
+        # published_at vazio é preenchido em Post.save (um único save)
         if not change and not obj.author_id:
             obj.author = request.user
         super().save_model(request, obj, form, change)
@@ -0,0 +1,107 @@
+"""
+Publica os posts agendados cuja data chegou.
+
+Uso (cron/systemd timer, ex: a cada minuto):
+    python manage.py publish_scheduled
+    python manage.py publish_scheduled --no-prewarm --lookback 86400
+
+A visibilidade já é calculada na consulta (``Post.objects.published()``);
+o que fica para trás são as respostas em cache (API e sitemap) montadas
+antes da data. O comando procura os posts com published_at entre a
+última execução (marca em PublishWatermark, no banco) e agora, invalida o
+namespace "blog" uma única vez (e purga do CDN a listagem e esses posts,
+gerando os snapshots HTML deles) e, em seguida, aquece o cache com a
+listagem, o detalhe de cada post publicado e o sitemap/feeds, para que o
+primeiro visitante não pague a montagem.
+
+Exige cache compartilhado (REDIS_URL): com LocMemCache a invalidação e o
+aquecimento ficariam no processo do comando, sem chegar aos workers do
+gunicorn.
+"""
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+
+from apps.blog.models import Post, PublishWatermark
+from config import prerender
+from config.cache import bump_version, cache_is_shared
+from config.purge import schedule_purge
+
+WATERMARK_NAME = 'publish_scheduled'
+
+
+class Command(BaseCommand):
+    help = 'Publica posts agendados e aquece os caches do blog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Posts lidos por lote')
+        parser.add_argument(
+            '--lookback', type=int, default=3600,
+            help='Janela (segundos) usada quando não há marca da última execução'
+        )
+        parser.add_argument('--no-prewarm', action='store_true', help='Apenas invalida o cache')
+        parser.add_argument(
+            '--base-url', default=settings.PUBLIC_URL,
+            help='Esquema e host usados nas chaves de cache (padrão: PUBLIC_URL)'
+        )
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'Cache por processo (LocMemCache): a invalidação e o aquecimento não chegariam '
+                'aos workers do gunicorn. Defina REDIS_URL.'
+            )
+        self.verbosity = options['verbosity']
+        now = timezone.now()
+        watermark = PublishWatermark.objects.filter(name=WATERMARK_NAME).values_list('value', flat=True).first()
+        since = watermark or now - timedelta(seconds=options['lookback'])
+
+        due = (
+            Post.objects.published(now=now)
+            .filter(published_at__gt=since)
+            .order_by('published_at', 'pk')
+            .values_list('pk', 'slug')
+        )
+        posts = []
+        batch_size = options['batch_size']
+        offset = 0
+        while True:
+            batch = list(due[offset:offset + batch_size])
+            posts.extend(batch)
+            if len(batch) < batch_size:
+                break
+            offset += batch_size
+
+        if posts:
+            bump_version('blog')
+            schedule_purge(['post-list'] + [f'post-{pk}' for pk, _ in posts])
+            for pk, _ in posts:
+                prerender.schedule('post', pk)
+            if not options['no_prewarm']:
+                self.prewarm(options['base_url'], [slug for _, slug in posts])
+        PublishWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'value': now})
+
+        self.stdout.write(self.style.SUCCESS(f'{len(posts)} post(s) publicado(s)'))
+
+    def prewarm(self, base_url, slugs):
+        """Faz GETs anônimos pelo stack completo (mesmas chaves de cache das requisições reais)."""
+        url = urlsplit(base_url)
+        client = Client(
+            HTTP_HOST=url.netloc,
+            raise_request_exception=False,
+            **({'HTTP_X_FORWARDED_PROTO': 'https'} if url.scheme == 'https' else {}),
+        )
+        paths = ['/api/blog/posts/', '/api/blog/posts/archive/', '/sitemap.xml', '/rss.xml', '/atom.xml']
+        paths += [f'/api/blog/posts/{slug}/' for slug in slugs]
+        for path in paths:
+            response = client.get(path)
+            # Sitemap/feeds vêm de arquivo (FileResponse): gerá-lo já é o aquecimento
+            response.close()
+            if response.status_code != 200:
+                self.stderr.write(f'{path}: HTTP {response.status_code}')
+            elif self.verbosity >= 2:
+                self.stdout.write(f'{path}: {response.get("X-Cache", "-")}')
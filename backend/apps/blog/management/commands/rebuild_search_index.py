@@ -0,0 +1,33 @@
+"""
+Reconstrói o índice de busca do blog (PostSearchTerm).
+
+Uso:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --slug meu-post
+
+O índice é mantido pelos signals a cada save; este comando serve para
+alterações feitas fora do ORM (update(), SQL direto) ou após mudar os
+pesos/stopwords em apps/blog/search.py.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import Post
+from apps.blog.search import index_post
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca do blog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slug', help='Reindexa apenas o post com este slug')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['slug']:
+            posts = posts.filter(slug=options['slug'])
+
+        count = 0
+        for post in posts.iterator():
+            index_post(post)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'{count} post(s) reindexado(s)'))
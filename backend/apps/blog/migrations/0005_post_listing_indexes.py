@@ -0,0 +1,95 @@
+# Migration: ordenação e índices da listagem do blog
+
+import ckeditor.fields
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    """Posts publicados sem data entram na ordenação pela data de criação."""
+    Post = apps.get_model("blog", "Post")
+    Post.objects.filter(is_published=True, published_at__isnull=True).update(published_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_category_author_fk_seo"),
+    ]
+
+    operations = [
+        # Campos alterados no model sem migration correspondente
+        # (focus_keyword ainda estava NOT NULL no banco)
+        migrations.AlterField(
+            model_name="post",
+            name="content",
+            field=ckeditor.fields.RichTextField(),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="focus_keyword",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="is_published",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="keywords",
+            field=models.CharField(blank=True, help_text="Palavras-chave separadas por vírgula", max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="meta_description",
+            field=models.CharField(blank=True, help_text="Descrição SEO (Google)", max_length=160),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="meta_title",
+            field=models.CharField(blank=True, help_text="Título SEO (Google)", max_length=70),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="published_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="slug",
+            field=models.SlugField(blank=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="title",
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-published_at", "-created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_post_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["category", "-published_at", "-created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_post_category_pub_idx",
+            ),
+        ),
+    ]
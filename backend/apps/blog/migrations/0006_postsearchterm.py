@@ -0,0 +1,100 @@
+# Migration: índice invertido da busca do blog
+
+import html
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+import django.db.models.deletion
+
+# Cópia do tokenizador de apps/blog/search.py na época desta migração: o
+# histórico não muda se a busca mudar (rode rebuild_search_index para isso).
+FIELD_WEIGHTS = {
+    "title": 10,
+    "focus_keyword": 8,
+    "keywords": 6,
+    "excerpt": 3,
+    "content": 1,
+}
+MAX_TERM_FREQUENCY = 5
+MAX_TERM_LENGTH = 64
+MIN_TERM_LENGTH = 2
+
+STOPWORDS = frozenset("""
+    a ao aos as com como da das de do dos e em entre for na nas no nos o os ou
+    para pela pelas pelo pelos por que se sem sob sobre um uma umas uns
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text):
+    folded = []
+    for char in text:
+        base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        base = base.lower()
+        folded.append(base if len(base) == 1 else char.lower()[:1] or " ")
+    return "".join(folded)
+
+
+def tokenize(value):
+    text = html.unescape(strip_tags(value or ""))
+    return [
+        token for token in TOKEN_RE.findall(fold(text))
+        if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def build_terms(post):
+    weights = Counter()
+    for field, field_weight in FIELD_WEIGHTS.items():
+        for term, count in Counter(tokenize(getattr(post, field, ""))).items():
+            weights[term] += field_weight * min(count, MAX_TERM_FREQUENCY)
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    PostSearchTerm = apps.get_model("blog", "PostSearchTerm")
+    for post in Post.objects.all().iterator():
+        PostSearchTerm.objects.bulk_create(
+            [PostSearchTerm(term=term, post_id=post.pk, weight=weight) for term, weight in build_terms(post).items()],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostSearchTerm",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.PositiveIntegerField(default=0)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="blog.post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Termo de busca",
+                "verbose_name_plural": "Termos de busca",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="postsearchterm",
+            constraint=models.UniqueConstraint(fields=("term", "post"), name="blog_search_term_post_uniq"),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
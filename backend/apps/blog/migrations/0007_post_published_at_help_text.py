@@ -0,0 +1,22 @@
+# Migration: published_at editável (agendamento de posts)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_postsearchterm"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="published_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Vazio = agora ao publicar; data futura agenda a publicação",
+                null=True,
+            ),
+        ),
+    ]
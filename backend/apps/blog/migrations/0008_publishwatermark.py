@@ -0,0 +1,24 @@
+# Migration: marca da última execução do publish_scheduled no banco
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_published_at_help_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublishWatermark",
+            fields=[
+                ("name", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("value", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Marca de publicação",
+                "verbose_name_plural": "Marcas de publicação",
+            },
+        ),
+    ]
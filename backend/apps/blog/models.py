@@ -18,6 +18,16 @@ class Category(models.Model):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    def published(self, now=None):
+        """Posts visíveis no site: publicados e com published_at já alcançado."""
+        return self.filter(is_published=True, published_at__lte=now or timezone.now())
+
+    def scheduled(self, now=None):
+        """Posts publicados com data futura (aguardando o publish_scheduled)."""
+        return self.filter(is_published=True, published_at__gt=now or timezone.now())
+
+
 class Post(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True, blank=True)
@@ -55,9 +65,35 @@ class Post(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    published_at = models.DateTimeField(blank=True, null=True)
+    published_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Vazio = agora ao publicar; data futura agenda a publicação",
+    )
     is_published = models.BooleanField(default=False)
 
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Post"
+        verbose_name_plural = "Posts"
+        ordering = ["-published_at", "-created_at"]
+        indexes = [
+            # Índices parciais (só publicados), na mesma ordem do Meta.ordering:
+            # listagem pública, arquivo mensal e anterior/próximo
+            models.Index(
+                fields=["-published_at", "-created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_post_published_idx",
+            ),
+            # Listagem por categoria e posts relacionados
+            models.Index(
+                fields=["category", "-published_at", "-created_at"],
+                condition=models.Q(is_published=True),
+                name="blog_post_category_pub_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -67,3 +103,33 @@ class Post(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class PostSearchTerm(models.Model):
+    """Índice invertido da busca do blog: termo normalizado -> post, com peso."""
+    term = models.CharField(max_length=64)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="search_terms")
+    weight = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Termo de busca"
+        verbose_name_plural = "Termos de busca"
+        constraints = [
+            models.UniqueConstraint(fields=["term", "post"], name="blog_search_term_post_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.weight})"
+
+
+class PublishWatermark(models.Model):
+    """Marca da última execução do publish_scheduled (no banco: sobrevive ao cache)."""
+    name = models.CharField(max_length=64, primary_key=True)
+    value = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Marca de publicação"
+        verbose_name_plural = "Marcas de publicação"
+
+    def __str__(self):
+        return f"{self.name}: {self.value:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,170 @@
+"""
+Busca do blog por índice invertido (PostSearchTerm).
+
+Cada post é quebrado em termos normalizados (HTML removido, minúsculas,
+sem acentos) e cada termo recebe um peso pela soma dos campos em que
+aparece (título pesa mais que o corpo). A busca consulta só as linhas
+dos termos pedidos pelo índice único (term, post), em vez de varrer o
+HTML de todos os posts com ``icontains``:
+
+- todos os termos da consulta precisam aparecer no post (AND);
+- o último termo casa por prefixo, para a busca enquanto se digita (com
+  menos de MIN_PREFIX_LENGTH letras ele vale como termo exato: um prefixo
+  de 1-2 letras casaria quase toda a tabela de termos);
+- a pontuação é a soma dos pesos dos termos encontrados.
+"""
+import html
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils.html import escape, strip_tags
+
+FIELD_WEIGHTS = {
+    'title': 10,
+    'focus_keyword': 8,
+    'keywords': 6,
+    'excerpt': 3,
+    'content': 1,
+}
+# Repetições de um termo no mesmo campo contam até este limite
+MAX_TERM_FREQUENCY = 5
+MAX_TERM_LENGTH = 64
+MIN_TERM_LENGTH = 2
+MIN_PREFIX_LENGTH = 3
+MAX_QUERY_TERMS = 8
+
+STOPWORDS = frozenset("""
+    a ao aos as com como da das de do dos e em entre for na nas no nos o os ou
+    para pela pelas pelo pelos por que se sem sob sobre um uma umas uns
+""".split())
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    """Minúsculas e sem acentos, preservando o comprimento (1 caractere -> 1 caractere)."""
+    folded = []
+    for char in text:
+        base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        base = base.lower()
+        folded.append(base if len(base) == 1 else char.lower()[:1] or ' ')
+    return ''.join(folded)
+
+
+def plain_text(value):
+    """Texto puro de um campo (HTML do CKEditor removido)."""
+    return html.unescape(strip_tags(value or ''))
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_RE.findall(fold(text))
+        if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def build_terms(post):
+    """{termo: peso} de um post."""
+    weights = Counter()
+    for field, field_weight in FIELD_WEIGHTS.items():
+        counts = Counter(tokenize(plain_text(getattr(post, field, ''))))
+        for term, count in counts.items():
+            weights[term] += field_weight * min(count, MAX_TERM_FREQUENCY)
+    return weights
+
+
+def index_post(post):
+    """Regrava os termos de um post."""
+    from .models import PostSearchTerm
+
+    rows = [PostSearchTerm(term=term, post_id=post.pk, weight=weight) for term, weight in build_terms(post).items()]
+    with transaction.atomic():
+        PostSearchTerm.objects.filter(post_id=post.pk).delete()
+        PostSearchTerm.objects.bulk_create(rows, batch_size=500)
+
+
+def parse_query(query):
+    """(termos exatos, prefixo) da consulta; o último termo é prefixo se não houver espaço depois."""
+    terms = list(dict.fromkeys(TOKEN_RE.findall(fold(query or ''))))[:MAX_QUERY_TERMS]
+    prefix = None
+    if terms and not (query or '').endswith(' '):
+        prefix = terms.pop()
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            terms.append(prefix)
+            prefix = None
+    terms = [t for t in terms if len(t) >= MIN_TERM_LENGTH and t not in STOPWORDS]
+    return terms, prefix
+
+
+def search(query):
+    """Lista de (post_id, pontuação), da maior para a menor pontuação."""
+    from .models import PostSearchTerm
+
+    terms, prefix = parse_query(query)
+    lookups = [{'term': term} for term in terms]
+    if prefix:
+        # Intervalo em vez de LIKE: usa o índice (term, post) em qualquer banco
+        lookups.append({'term__gte': prefix, 'term__lt': prefix[:-1] + chr(ord(prefix[-1]) + 1)})
+    if not lookups:
+        return []
+
+    scores = None
+    for lookup in lookups:
+        rows = (
+            PostSearchTerm.objects.filter(**lookup)
+            .values('post_id')
+            .annotate(score=Sum('weight'))
+            .values_list('post_id', 'score')
+        )
+        if scores is not None:
+            rows = rows.filter(post_id__in=list(scores))
+        matched = dict(rows)
+        if scores is None:
+            scores = matched
+        else:
+            scores = {post_id: scores[post_id] + score for post_id, score in matched.items()}
+        if not scores:
+            return []
+    return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+def highlight(text, query, length=200):
+    """Trecho HTML (escapado) em torno da primeira ocorrência, com os termos em <mark>."""
+    text = ' '.join(plain_text(text).split())
+    terms, prefix = parse_query(query)
+    patterns = [rf'\b{re.escape(term)}\b' for term in terms]
+    if prefix:
+        patterns.append(rf'\b{re.escape(prefix)}[a-z0-9]*')
+    if not text or not patterns:
+        return escape(text[:length])
+
+    folded = fold(text)
+    matches = list(re.finditer('|'.join(patterns), folded))
+    start = 0
+    if matches:
+        start = max(0, matches[0].start() - length // 4)
+        # Começa o trecho no início de uma palavra
+        if start:
+            space = text.find(' ', start)
+            start = space + 1 if 0 <= space < matches[0].start() else start
+    end = min(len(text), start + length)
+
+    parts, position = [], start
+    for match in matches:
+        if match.start() < start:
+            continue
+        if match.end() > end:
+            break
+        parts.append(escape(text[position:match.start()]))
+        parts.append(f'<mark>{escape(text[match.start():match.end()])}</mark>')
+        position = match.end()
+    parts.append(escape(text[position:end]))
+    snippet = ''.join(parts)
+    if start > 0:
+        snippet = '…' + snippet
+    if end < len(text):
+        snippet += '…'
+    return snippet
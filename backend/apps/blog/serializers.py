@@ -28,7 +28,8 @@ class PostSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["published_at", "created_at", "updated_at"]
+        # published_at no futuro agenda a publicação (ver publish_scheduled)
+        read_only_fields = ["created_at", "updated_at"]
 
     def get_author_name(self, obj):
         if obj.author:
@@ -95,3 +96,12 @@ class PostListSerializer(serializers.ModelSerializer):
         except Exception:
             pass
         return None
+
+
+class PostSearchResultSerializer(PostListSerializer):
+    """Resultado da busca: dados da listagem + trecho destacado e pontuação."""
+    snippet = serializers.CharField(source="search_snippet", read_only=True)
+    score = serializers.IntegerField(source="search_score", read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ["snippet", "score"]
@@ -0,0 +1,84 @@
+"""
+Signals do app blog.
+
+Qualquer alteração em posts ou categorias incrementa a versão do namespace
+"blog", invalidando as respostas cacheadas da API (config/cache.py), e
+purga do CDN as tags afetadas (config/purge.py).
+
+Busca: cada post salvo é reindexado após o commit (apps/blog/search.py);
+os termos de posts removidos saem por CASCADE.
+
+Prerender: o snapshot HTML do post é regerado pelo worker da fila
+(config/jobs.py, config/prerender.py); o da URL antiga sai se o slug mudar.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, pre_delete, post_save, post_delete
+
+from config import prerender
+from config.cache import bump_version
+from config.purge import schedule_purge
+
+from . import search
+from .models import Category, Post
+
+CACHE_NAMESPACE = 'blog'
+
+
+def invalidate_blog_cache(sender, instance, **kwargs):
+    """Invalida as respostas cacheadas do blog e o CDN após o commit."""
+    if isinstance(instance, Post):
+        schedule_purge([f'post-{instance.pk}', 'post-list'])
+    else:
+        # Categoria aparece em todos os posts dela
+        schedule_purge([CACHE_NAMESPACE])
+    transaction.on_commit(lambda: bump_version(CACHE_NAMESPACE))
+
+
+def reindex_post(sender, instance, raw=False, **kwargs):
+    """Atualiza o índice de busca do post após o commit."""
+    if raw:
+        return
+    transaction.on_commit(lambda: search.index_post(instance))
+
+
+def track_slug_pre_save(sender, instance, raw=False, **kwargs):
+    """Guarda o slug atual do post (a URL do snapshot pode mudar)."""
+    instance._previous_slug = None
+    if not raw and settings.PRERENDER_ENABLED and instance.pk and not instance._state.adding:
+        instance._previous_slug = Post._base_manager.filter(pk=instance.pk).values_list('slug', flat=True).first()
+
+
+def rebuild_post_page(sender, instance, raw=False, **kwargs):
+    """Agenda a regeração do snapshot do post."""
+    if raw:
+        return
+    previous_slug = getattr(instance, '_previous_slug', None)
+    if previous_slug and previous_slug != instance.slug:
+        prerender.schedule_remove(prerender.post_path(previous_slug))
+    prerender.schedule('post', instance.pk)
+
+
+def remove_post_page(sender, instance, **kwargs):
+    prerender.schedule_remove(prerender.post_path(instance.slug))
+
+
+def rebuild_category_posts(sender, instance, raw=False, **kwargs):
+    """O nome da categoria aparece nos posts; no delete, antes do SET_NULL."""
+    if raw or not settings.PRERENDER_ENABLED:
+        return
+    for post_id in instance.post_set.values_list('pk', flat=True):
+        prerender.schedule('post', post_id)
+
+
+post_save.connect(reindex_post, sender=Post, dispatch_uid='blog-search-post-save')
+pre_save.connect(track_slug_pre_save, sender=Post, dispatch_uid='blog-prerender-pre-save')
+post_save.connect(rebuild_post_page, sender=Post, dispatch_uid='blog-prerender-post-save')
+post_delete.connect(remove_post_page, sender=Post, dispatch_uid='blog-prerender-post-delete')
+post_save.connect(rebuild_category_posts, sender=Category, dispatch_uid='blog-prerender-category-save')
+pre_delete.connect(rebuild_category_posts, sender=Category, dispatch_uid='blog-prerender-category-delete')
+
+for model in (Category, Post):
+    uid = model.__name__.lower()
+    post_save.connect(invalidate_blog_cache, sender=model, dispatch_uid=f'blog-cache-post-save-{uid}')
+    post_delete.connect(invalidate_blog_cache, sender=model, dispatch_uid=f'blog-cache-post-delete-{uid}')
@@ -0,0 +1,110 @@
+import datetime
+import io
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import search
+from .models import Category, Post, PublishWatermark
+
+
+@override_settings(PRERENDER_ROOT=tempfile.mkdtemp())
+class ArchiveMonthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tz = timezone.get_current_timezone()
+        category = Category.objects.create(name='Manutenção')
+        Post.objects.create(
+            title='Válvulas em maio', content='<p>Texto</p>', category=category,
+            is_published=True, published_at=datetime.datetime(2024, 5, 31, 23, 30, tzinfo=tz),
+        )
+        Post.objects.create(
+            title='Válvulas em junho', content='<p>Texto</p>', category=category,
+            is_published=True, published_at=datetime.datetime(2024, 6, 1, tzinfo=tz),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.json()['results']]
+
+    def test_lists_posts_of_the_month_only(self):
+        self.assertEqual(self.titles('/api/blog/posts/archive/2024/5/'), ['Válvulas em maio'])
+        self.assertEqual(self.titles('/api/blog/posts/archive/2024/06/'), ['Válvulas em junho'])
+
+    def test_december_ends_at_next_year(self):
+        self.assertEqual(self.titles('/api/blog/posts/archive/9998/12/'), [])
+
+    def test_out_of_range_month_is_404(self):
+        for url in ('/api/blog/posts/archive/2024/0/', '/api/blog/posts/archive/2024/13/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_out_of_range_year_is_404(self):
+        for url in (
+            '/api/blog/posts/archive/0000/1/',
+            '/api/blog/posts/archive/0001/1/',
+            '/api/blog/posts/archive/9999/1/',
+            '/api/blog/posts/archive/9999/12/',
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+
+@override_settings(PRERENDER_ROOT=tempfile.mkdtemp())
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        post = Post.objects.create(
+            title='Válvula esfera', content='<p>Vedação de PTFE</p>', is_published=True,
+        )
+        # O signal indexa após o commit; TestCase não faz commit
+        search.index_post(post)
+        cls.post = post
+
+    def test_prefix_matches_while_typing(self):
+        self.assertEqual(search.parse_query('válv'), ([], 'valv'))
+        self.assertEqual([post_id for post_id, _ in search.search('válv')], [self.post.pk])
+
+    def test_short_prefix_is_an_exact_term(self):
+        self.assertEqual(search.parse_query('va'), (['va'], None))
+        self.assertEqual(search.search('va'), [])
+        self.assertEqual(search.parse_query('v'), ([], None))
+        self.assertEqual(search.search('v'), [])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual([post_id for post_id, _ in search.search('esfera ptfe')], [self.post.pk])
+        self.assertEqual(search.search('esfera gaveta'), [])
+
+
+@override_settings(PRERENDER_ROOT=tempfile.mkdtemp())
+class PublishScheduledTests(TestCase):
+    def publish(self):
+        out = io.StringIO()
+        with mock.patch('apps.blog.management.commands.publish_scheduled.cache_is_shared', return_value=True):
+            call_command('publish_scheduled', '--no-prewarm', stdout=out)
+        return out.getvalue()
+
+    def test_watermark_is_kept_in_the_database(self):
+        Post.objects.create(
+            title='Agendado', content='<p>Texto</p>', is_published=True,
+            published_at=timezone.now() - datetime.timedelta(minutes=5),
+        )
+        self.assertIn('1 post(s)', self.publish())
+        watermark = PublishWatermark.objects.get(name='publish_scheduled').value
+        # O cache pode ser esvaziado: a marca continua no banco
+        cache.clear()
+        self.assertIn('0 post(s)', self.publish())
+        self.assertGreater(PublishWatermark.objects.get(name='publish_scheduled').value, watermark)
+
+    def test_refuses_process_local_cache(self):
+        with self.assertRaisesMessage(CommandError, 'REDIS_URL'):
+            call_command('publish_scheduled', stdout=io.StringIO())
+        self.assertFalse(PublishWatermark.objects.exists())
@@ -1,59 +1,35 @@
+import datetime
+
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.http import HttpResponse
-from .models import Post
-from .serializers import PostSerializer, PostListSerializer
-
-# Base URL do site para o sitemap (pode vir de settings.PUBLIC_URL em produção)
-SITEMAP_BASE = "https://nexusvalvulas.com.br"
+from config.cache import CachedResponseMixin
+from config.db_router import ReplicaReadMixin
+from config.parsers import ORJSONParser
+from . import search as blog_search
+from .models import Category, Post
+from .serializers import PostSerializer, PostListSerializer, PostSearchResultSerializer
 
-# URLs estáticas do React (Home e páginas institucionais)
-STATIC_URLS = [
-    f"{SITEMAP_BASE}/",
-    f"{SITEMAP_BASE}/sobre",
-    f"{SITEMAP_BASE}/produtos",
-    f"{SITEMAP_BASE}/contato",
-    f"{SITEMAP_BASE}/blog",
-]
 
-
-def sitemap_view(request):
-    """
-    Gera sitemap.xml combinando URLs estáticas e posts do blog publicados.
-    Garante que o Google indexe Home, institucionais e blog.
-    """
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-    ]
-
-    # URLs estáticas (changefreq weekly para páginas que mudam pouco)
-    for loc in STATIC_URLS:
-        lines.append("  <url>")
-        lines.append(f"    <loc>{loc}</loc>")
-        lines.append("    <changefreq>weekly</changefreq>")
-        lines.append("  </url>")
-
-    # URLs dinâmicas: posts publicados
-    for post in Post.objects.filter(is_published=True).only("slug"):
-        loc = f"{SITEMAP_BASE}/blog/{post.slug}"
-        lines.append("  <url>")
-        lines.append(f"    <loc>{loc}</loc>")
-        lines.append("    <changefreq>daily</changefreq>")
-        lines.append("  </url>")
-
-    lines.append("</urlset>")
-    xml = "\n".join(lines)
-    return HttpResponse(xml, content_type="application/xml")
-
-
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para posts do blog
     GET /api/blog/posts/ - Lista posts publicados
     GET /api/blog/posts/{slug}/ - Detalhes de um post
+    GET /api/blog/posts/category/{slug}/ - Posts de uma categoria
+    GET /api/blog/posts/archive/ - Meses com posts publicados
+    GET /api/blog/posts/archive/{ano}/{mes}/ - Posts de um mês
+    GET /api/blog/posts/{slug}/related/ - Posts da mesma categoria
+    GET /api/blog/posts/{slug}/adjacent/ - Post anterior e próximo
+    GET /api/blog/posts/search/?q= - Busca com trechos destacados
     POST /api/blog/posts/ - Criar post (autenticado)
     PUT /api/blog/posts/{slug}/ - Atualizar post (autenticado)
     DELETE /api/blog/posts/{slug}/ - Deletar post (autenticado)
@@ -61,7 +37,12 @@ class PostViewSet(viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     lookup_field = 'slug'
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
+    cache_namespace = 'blog'
+    surrogate_key_name = 'post'
+    cached_actions = ('list', 'retrieve', 'category', 'archive', 'archive_month', 'related', 'adjacent', 'search')
+    # Actions que devolvem listas de posts (PostListSerializer, sem author)
+    list_actions = ('list', 'category', 'archive_month', 'related', 'adjacent')
 
     def get_permissions(self):
         """Permissões: público para leitura, autenticado para escrita."""
@@ -73,29 +54,149 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         Filtra posts publicados apenas para usuários anônimos.
         Usuários autenticados (admin via painel) enxergam todos os posts,
-        incluindo rascunhos.
+        incluindo rascunhos e agendados.
         """
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('category')
+        if self.action not in self.list_actions + ('search',):
+            queryset = queryset.select_related('author')
         if not self.request.user.is_authenticated:
-            queryset = queryset.filter(is_published=True)
+            queryset = queryset.published()
         return queryset
 
     def get_serializer_class(self):
         """Usa serializer simplificado para listagem."""
-        if self.action == 'list':
+        if self.action in self.list_actions:
             return PostListSerializer
+        if self.action == 'search':
+            return PostSearchResultSerializer
         return PostSerializer
 
-    def perform_create(self, serializer):
-        """Define published_at ao criar se is_published=True."""
-        post = serializer.save()
-        if post.is_published and not post.published_at:
-            post.published_at = timezone.now()
-            post.save()
-
-    def perform_update(self, serializer):
-        """Define published_at ao atualizar se is_published=True."""
-        post = serializer.save()
-        if post.is_published and not post.published_at:
-            post.published_at = timezone.now()
-            post.save()
+    def _paginated(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def _published(self):
+        """Posts visíveis (índices parciais em is_published + intervalo em published_at)."""
+        return Post.objects.published().select_related('category')
+
+    @action(detail=False, methods=['get'], url_path='category/(?P<category_slug>[^/.]+)')
+    def category(self, request, category_slug=None):
+        """Posts de uma categoria (índice category, is_published, published_at)."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        category = get_object_or_404(Category, slug=category_slug)
+        return self._paginated(self.get_queryset().filter(category=category))
+
+    @action(detail=False, methods=['get'], url_path='archive')
+    def archive(self, request):
+        """Meses com posts publicados e a quantidade de posts em cada um."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        months = (
+            self._published()
+            .annotate(month=TruncMonth('published_at'))
+            .values('month')
+            .annotate(count=Count('id'))
+            .order_by('-month')
+        )
+        return Response([
+            {'year': row['month'].year, 'month': row['month'].month, 'count': row['count']}
+            for row in months
+        ])
+
+    @action(detail=False, methods=['get'], url_path=r'archive/(?P<year>\d{4})/(?P<month>\d{1,2})')
+    def archive_month(self, request, year=None, month=None):
+        """Posts publicados em um mês (intervalo em published_at, usa o índice)."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        year, month = int(year), int(month)
+        # O fim do intervalo é o mês seguinte e a conversão para UTC pode mudar
+        # o ano: fora de (MINYEAR, MAXYEAR) o datetime estoura (ValueError/500)
+        if not 1 <= month <= 12 or not datetime.MINYEAR < year < datetime.MAXYEAR:
+            raise Http404
+        tz = timezone.get_current_timezone()
+        start = datetime.datetime(year, month, 1, tzinfo=tz)
+        end = datetime.datetime(year + month // 12, month % 12 + 1, 1, tzinfo=tz)
+        queryset = self.get_queryset().filter(published_at__gte=start, published_at__lt=end)
+        return self._paginated(queryset)
+
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, slug=None):
+        """Posts publicados mais recentes da mesma categoria."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        post = self.get_object()
+        if post.category_id is None:
+            return Response([])
+        related = (
+            self._published()
+            .filter(category_id=post.category_id)
+            .exclude(pk=post.pk)[:settings.BLOG_RELATED_POSTS]
+        )
+        return Response(self.get_serializer(related, many=True).data)
+
+    @action(detail=True, methods=['get'], url_path='adjacent')
+    def adjacent(self, request, slug=None):
+        """Post publicado anterior (mais antigo) e próximo (mais recente)."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        post = self.get_object()
+        previous = following = None
+        if post.published_at is not None:
+            published = self._published().exclude(pk=post.pk)
+            at = post.published_at
+            previous = (
+                published.filter(Q(published_at__lt=at) | Q(published_at=at, pk__lt=post.pk))
+                .order_by('-published_at', '-pk')
+                .first()
+            )
+            following = (
+                published.filter(Q(published_at__gt=at) | Q(published_at=at, pk__gt=post.pk))
+                .order_by('published_at', 'pk')
+                .first()
+            )
+        return Response({
+            'previous': self.get_serializer(previous).data if previous else None,
+            'next': self.get_serializer(following).data if following else None,
+        })
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Busca no índice invertido; resultados por relevância, com <mark> no trecho."""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        query = request.query_params.get('q', '').strip()
+        ranked = blog_search.search(query) if query else []
+        if ranked:
+            # Remove rascunhos (anônimos) antes de paginar, para o count bater
+            visible = set(
+                self.get_queryset().filter(pk__in=[post_id for post_id, _ in ranked]).values_list('pk', flat=True)
+            )
+            ranked = [(post_id, score) for post_id, score in ranked if post_id in visible]
+        page = self.paginate_queryset(ranked)
+        ranked_page = page if page is not None else ranked
+
+        posts = self.get_queryset().in_bulk([post_id for post_id, _ in ranked_page])
+        results = []
+        for post_id, score in ranked_page:
+            post = posts.get(post_id)
+            if post is None:
+                continue
+            post.search_score = score
+            post.search_snippet = blog_search.highlight(post.content, query)
+            results.append(post)
+
+        serializer = self.get_serializer(results, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
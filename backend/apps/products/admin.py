@@ -1,7 +1,8 @@
 from django.contrib import admin
+from django.core.files.storage import default_storage
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Category, Product, ProductVariant, ProductSize
+from .models import Category, ImageBlob, Product, ProductVariant, ProductSize
 
 
 @admin.register(Category)
@@ -249,3 +250,29 @@ class ProductSizeAdmin(admin.ModelAdmin):
             return format_html('<strong>Produto:</strong> {}', obj.product.title)
         return "-"
     product_or_variant.short_description = "Vinculado a"
+
+
+@admin.register(ImageBlob)
+class ImageBlobAdmin(admin.ModelAdmin):
+    """
+    Arquivos deduplicados. O filtro "Parecida com" lista os uploads com o
+    mesmo hash perceptual de outra imagem (MEDIA_DEDUP_PERCEPTUAL): se for
+    a mesma foto, troque a imagem no registro e limpe o campo.
+    """
+    list_display = ['name', 'image_preview', 'ref_count', 'size', 'similar_to', 'created_at']
+    list_filter = [('similar_to', admin.EmptyFieldListFilter), 'created_at']
+    search_fields = ['name', 'sha256', 'phash']
+    # Contadores e hashes são mantidos pelos signals (apps/products/media.py)
+    readonly_fields = ['name', 'image_preview', 'sha256', 'phash', 'size', 'ref_count', 'created_at']
+    raw_id_fields = ['similar_to']
+
+    def has_add_permission(self, request):
+        return False
+
+    def image_preview(self, obj):
+        return format_html(
+            '<img src="{}" style="max-height: 100px; max-width: 100px;" />',
+            default_storage.url(obj.name)
+        )
+    image_preview.short_description = "Preview"
+
@@ -0,0 +1,122 @@
+"""
+Índice do catálogo em memória, por processo (worker do gunicorn).
+
+O catálogo é pequeno (centenas de produtos) e lido em quase toda
+requisição. Cada worker mantém um snapshot imutável com os produtos
+ativos (já com categoria, variantes e tamanhos pré-carregados), indexado
+por slug e por categoria; retrieve, by_category e a home respondem daqui,
+sem consultar o banco.
+
+Atualização: o snapshot guarda a versão do namespace "catalog"
+(config/cache.py), incrementada pelos signals a cada alteração. No máximo
+a cada CATALOG_INDEX_CHECK_INTERVAL segundos o worker compara a versão do
+snapshot com a do cache compartilhado e, se mudou, recarrega (uma thread
+por vez). Com LocMemCache (sem REDIS_URL) os workers não enxergam as
+versões uns dos outros; CATALOG_INDEX_MAX_AGE limita a defasagem nesse caso.
+
+Os payloads da API dependem do host (URLs absolutas das imagens), então
+são serializados sob demanda e memorizados por origem em cada entrada.
+"""
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+
+from config.cache import get_version
+
+from .models import Category, Product
+from .serializers import ProductSerializer
+
+CACHE_NAMESPACE = 'catalog'
+HOME_PRODUCTS = 12
+# Origens (esquema + host) memorizadas por produto
+MAX_ORIGINS = 8
+
+
+class CatalogEntry:
+    """Produto ativo do snapshot; ``product`` não deve ser alterado."""
+    __slots__ = ('product', 'slug', 'category_slug', '_payloads')
+
+    def __init__(self, product):
+        self.product = product
+        self.slug = product.slug
+        self.category_slug = product.category.slug
+        self._payloads = {}
+
+    def payload(self, request):
+        """Dados do ProductSerializer com as URLs absolutas da origem da requisição."""
+        origin = request.build_absolute_uri('/')
+        data = self._payloads.get(origin)
+        if data is None:
+            data = ProductSerializer(self.product, context={'request': request}).data
+            if len(self._payloads) < MAX_ORIGINS:
+                self._payloads[origin] = data
+        return data
+
+
+class CatalogSnapshot:
+    __slots__ = ('version', 'loaded_at', 'products', 'by_category', 'categories', 'home_products')
+
+    def __init__(self, version, products, categories):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        entries = tuple(CatalogEntry(product) for product in products)
+        self.products = MappingProxyType({entry.slug: entry for entry in entries})
+        self.categories = MappingProxyType({category.slug: category for category in categories})
+        by_category = {slug: [] for slug in self.categories}
+        for entry in entries:
+            if entry.category_slug in by_category:
+                by_category[entry.category_slug].append(entry)
+        self.by_category = MappingProxyType({slug: tuple(items) for slug, items in by_category.items()})
+        self.home_products = tuple(entry.product for entry in entries[:HOME_PRODUCTS])
+
+    @classmethod
+    def load(cls, version):
+        products = Product.objects.filter(is_active=True).with_details().order_by('title')
+        categories = Category.objects.filter(is_active=True)
+        return cls(version, list(products), list(categories))
+
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0.0
+
+
+def get_catalog():
+    """Snapshot atual do catálogo, ou None se o índice estiver desligado."""
+    global _snapshot, _checked_at
+    if not settings.CATALOG_INDEX_ENABLED:
+        return None
+
+    now = time.monotonic()
+    snapshot = _snapshot
+    if snapshot is not None and now - _checked_at < settings.CATALOG_INDEX_CHECK_INTERVAL:
+        return snapshot
+
+    # A versão é lida antes do banco: uma alteração durante a carga
+    # incrementa a versão de novo e força outra recarga na próxima checagem
+    version = get_version(CACHE_NAMESPACE)
+    if snapshot is not None and snapshot.version == version and not _expired(snapshot, now):
+        _checked_at = now
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version or _expired(snapshot, now):
+            snapshot = CatalogSnapshot.load(version)
+            _snapshot = snapshot
+        _checked_at = now
+    return snapshot
+
+
+def _expired(snapshot, now):
+    return now - snapshot.loaded_at > settings.CATALOG_INDEX_MAX_AGE
+
+
+def reset():
+    """Descarta o snapshot do processo (próximo acesso recarrega)."""
+    global _snapshot, _checked_at
+    with _lock:
+        _snapshot = None
+        _checked_at = 0.0
@@ -0,0 +1,122 @@
+"""
+Benchmark de renderização/parse JSON: DRF (json da stdlib) x orjson.
+
+Uso:
+    python manage.py bench_json                 # 1.000 produtos
+    python manage.py bench_json --products 5000 --repeat 20
+
+O payload imita a saída do ProductSerializer (variantes, tamanhos,
+especificações) e inclui datetime, Decimal e textos lazy para exercitar
+o fallback de tipos do ORJSONRenderer. Não acessa o banco.
+"""
+import io
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer, orjson
+
+BASE_URL = 'https://nexusvalvulas.com.br/media/products'
+
+
+def build_payload(count):
+    """Lista de produtos no formato do ProductSerializer."""
+    now = timezone.now()
+    products = []
+    for i in range(count):
+        complex_product = i % 3 == 0
+        variants = []
+        if complex_product:
+            for v in range(3):
+                variants.append({
+                    'id': i * 10 + v,
+                    'name': f'Tripartida {150 * (v + 1)}#',
+                    'description': 'Corpo em aço carbono ASTM A216 WCB, esfera flutuante',
+                    'image': None,
+                    'image_url': f'{BASE_URL}/variants/{i:08x}{v:024x}.jpg',
+                    'product': i,
+                    'order': v,
+                    'sizes': {
+                        size: f'{BASE_URL}/sizes/{i:08x}{s:024x}.jpg'
+                        for s, size in enumerate(['1/2', '3/4', '1', '1 1/4', '1 1/2', '2'])
+                    },
+                })
+        products.append({
+            'id': i,
+            'title': f'Válvula Esfera Modelo {i}',
+            'slug': f'valvula-esfera-modelo-{i}',
+            'description': 'Válvula esfera para aplicações industriais de alta pressão. ' * 3,
+            'image': f'products/{i:032x}.jpg',
+            'image_url': f'{BASE_URL}/{i:032x}.jpg',
+            'category': i % 7,
+            'category_name': 'Válvulas Industriais',
+            'category_slug': 'valvulas-industriais',
+            'specifications': {
+                'Pressão Máxima': f'{150 * (i % 5 + 1)} PSI',
+                'Temperatura': '-20°C a 200°C',
+                'Material': 'Aço inox 316',
+                'Preço de referência': Decimal('1234.50') + i,
+            },
+            'applications': ['Refinarias', 'Indústria química', 'Saneamento'],
+            'standards': ['ASME B16.34', 'API 600', _('Norma técnica')],
+            'variants': variants,
+            'sizes': {} if complex_product else {'1/2': f'{BASE_URL}/sizes/{i:032x}.jpg'},
+            'sizes_detail': [],
+            'product_type': 'complex' if complex_product else 'simple',
+            'is_active': True,
+            'created_at': now - timedelta(days=i),
+            'updated_at': now,
+        })
+    return products
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+class Command(BaseCommand):
+    help = "Compara o JSONRenderer/JSONParser do DRF com os baseados em orjson"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000, help='Produtos no payload')
+        parser.add_argument('--repeat', type=int, default=10, help='Repetições (usa o melhor tempo)')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson não está instalado: pip install orjson')
+
+        payload = build_payload(options['products'])
+        repeat = options['repeat']
+        drf_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+
+        drf_bytes = drf_renderer.render(payload)
+        fast_bytes = fast_renderer.render(payload)
+        if json.loads(drf_bytes) != json.loads(fast_bytes):
+            raise CommandError('Saídas diferentes entre JSONRenderer e ORJSONRenderer')
+
+        results = [
+            ('render', best_of(lambda: drf_renderer.render(payload), repeat),
+             best_of(lambda: fast_renderer.render(payload), repeat)),
+            ('parse', best_of(lambda: JSONParser().parse(io.BytesIO(drf_bytes)), repeat),
+             best_of(lambda: ORJSONParser().parse(io.BytesIO(drf_bytes)), repeat)),
+        ]
+
+        self.stdout.write(
+            f'Payload: {options["products"]} produtos, {len(drf_bytes) / 1024:.0f} KB (melhor de {repeat})'
+        )
+        self.stdout.write(f'{"":8} {"DRF (ms)":>10} {"orjson (ms)":>12} {"ganho":>7}')
+        for name, drf_ms, fast_ms in results:
+            self.stdout.write(f'{name:8} {drf_ms:10.2f} {fast_ms:12.2f} {drf_ms / fast_ms:6.1f}x')
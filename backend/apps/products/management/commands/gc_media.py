@@ -0,0 +1,181 @@
+"""
+Remove de MEDIA_ROOT os arquivos que nada no banco referencia.
+
+Uso:
+    python manage.py gc_media                    # apenas relata (padrão)
+    python manage.py gc_media --delete           # remove os órfãos
+    python manage.py gc_media --prefix products/ --batch-size 1000
+
+Um arquivo é mantido se:
+
+- algum FileField/ImageField aponta para ele;
+- alguma imagem ou link do HTML dos RichTextField (conteúdo do blog,
+  CKEditor) aponta para ele (``src``/``href`` em MEDIA_URL ou MEDIA_CDN_URL);
+- está sob um dos MEDIA_GC_PROTECTED_PREFIXES (uploads do CKEditor);
+- é mais novo que ``--min-age`` (upload ainda sem commit).
+
+O storage é percorrido em streaming (os.scandir) e comparado com o banco
+em lotes: para cada lote de nomes, uma consulta ``campo IN (...)`` por
+FileField devolve os referenciados e a diferença de conjuntos são os
+órfãos. A memória fica limitada ao tamanho do lote (mais as URLs de
+mídia citadas no HTML), mesmo com milhões de arquivos.
+"""
+import os
+import re
+import time
+from urllib.parse import unquote, urlsplit
+
+from ckeditor.fields import RichTextField
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from apps.products.models import ImageBlob
+
+# src="..." / href="..." no HTML do CKEditor
+URL_ATTR_RE = re.compile(r'''\b(?:src|href)\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+
+
+def file_fields():
+    """(model, campo) de todos os FileField gravados no storage padrão."""
+    fields = []
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and field.storage.__class__ is default_storage.__class__:
+                fields.append((model, field.name))
+    return fields
+
+
+def rich_text_fields():
+    """(model, campo) dos RichTextField (HTML que pode embutir mídia)."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, RichTextField)
+    ]
+
+
+def media_name(url):
+    """Nome no storage de uma URL de mídia (relativa ou absoluta), ou None."""
+    path = unquote(urlsplit(url).path)
+    for base in filter(None, (settings.MEDIA_URL, getattr(settings, 'MEDIA_CDN_URL', ''))):
+        base_path = urlsplit(base).path
+        if base_path and path.startswith(base_path):
+            return path[len(base_path):].lstrip('/')
+    return None
+
+
+def rich_text_media():
+    """Nomes de mídia citados no HTML dos RichTextField."""
+    names = set()
+    for model, field in rich_text_fields():
+        for html in model._base_manager.exclude(**{field: ''}).values_list(field, flat=True).iterator():
+            for url in URL_ATTR_RE.findall(html or ''):
+                name = media_name(url)
+                if name:
+                    names.add(name)
+    return names
+
+
+def iter_storage_files(storage, prefix=''):
+    """Gera (nome relativo, mtime) de todos os arquivos sob ``prefix``."""
+    if hasattr(storage, 'path'):
+        root = storage.path('')
+        stack = [os.path.join(root, prefix)]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        name = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                        yield name, entry.stat().st_mtime
+        return
+
+    # Storages remotos: listdir por diretório
+    directories, files = storage.listdir(prefix)
+    for filename in files:
+        name = f'{prefix.rstrip("/")}/{filename}' if prefix else filename
+        yield name, storage.get_modified_time(name).timestamp()
+    for directory in directories:
+        sub = f'{prefix.rstrip("/")}/{directory}' if prefix else directory
+        yield from iter_storage_files(storage, sub)
+
+
+class Command(BaseCommand):
+    help = "Relata (ou remove, com --delete) arquivos de mídia que nada no banco referencia"
+
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--delete', action='store_true', help='Remove os órfãos (sem isso, apenas relata)')
+        mode.add_argument('--dry-run', action='store_true', help='Apenas relata os órfãos (padrão)')
+        parser.add_argument('--prefix', default='', help='Limita a varredura a um subdiretório (ex: products/)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Nomes comparados por consulta')
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=3600,
+            help='Ignora arquivos mais novos que N segundos (uploads ainda sem commit)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = not options['delete']
+        self.verbosity = options['verbosity']
+        batch_size = max(1, options['batch_size'])
+        cutoff = time.time() - options['min_age']
+        protected = tuple(settings.MEDIA_GC_PROTECTED_PREFIXES)
+        fields = file_fields()
+        embedded = rich_text_media()
+
+        scanned = orphans = freed = 0
+        batch = []
+        for name, mtime in iter_storage_files(default_storage, options['prefix']):
+            scanned += 1
+            if mtime > cutoff or name.startswith(protected) or name in embedded:
+                continue
+            batch.append(name)
+            if len(batch) >= batch_size:
+                count, size = self._collect(batch, fields, dry_run)
+                orphans += count
+                freed += size
+                batch = []
+        if batch:
+            count, size = self._collect(batch, fields, dry_run)
+            orphans += count
+            freed += size
+
+        action = 'encontrados (use --delete para remover)' if dry_run else 'removidos'
+        self.stdout.write(self.style.SUCCESS(
+            f'{scanned} arquivos verificados, {orphans} órfãos {action} ({freed / 1024 / 1024:.1f} MB)'
+        ))
+
+    def _collect(self, batch, fields, dry_run):
+        """Remove (ou relata) os órfãos de um lote; retorna (quantidade, bytes)."""
+        referenced = set()
+        for model, field in fields:
+            referenced.update(
+                model._base_manager.filter(**{f'{field}__in': batch}).values_list(field, flat=True)
+            )
+        orphans = [name for name in batch if name not in referenced]
+
+        size = 0
+        for name in orphans:
+            try:
+                size += default_storage.size(name)
+            except OSError:
+                pass
+            if self.verbosity >= 2:
+                self.stdout.write(f'  órfão: {name}')
+            if not dry_run:
+                default_storage.delete(name)
+        if orphans and not dry_run:
+            ImageBlob.objects.filter(name__in=orphans).delete()
+        return len(orphans), size
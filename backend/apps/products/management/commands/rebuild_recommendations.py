@@ -0,0 +1,41 @@
+"""
+Recalcula os produtos similares pré-calculados (ProductSimilarity).
+
+Uso:
+    python manage.py rebuild_recommendations
+    python manage.py rebuild_recommendations --product valvula-esfera   # só as listas afetadas por um produto
+
+Os signals mantêm as listas em dia a cada produto salvo (pelo worker
+``run_jobs``); rode este comando após a migração, importações em massa
+(bulk_create/update não disparam signals) ou mudança de
+RECOMMENDATIONS_TOP_K/FEATURE_WEIGHTS, e periodicamente para atualizar os
+pesos IDF das listas não tocadas.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.products import recommendations
+from apps.products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os produtos similares pré-calculados (recomendações)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', help='Slug: atualiza só as listas afetadas por este produto')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['product']:
+            pk = Product.objects.filter(slug=options['product']).values_list('pk', flat=True).first()
+            if pk is None:
+                raise CommandError(f'Produto não encontrado: {options["product"]}')
+            products, rows = recommendations.update([pk])
+        else:
+            products, rows = recommendations.rebuild_all()
+        numpy = recommendations.np is not None and products >= recommendations.NUMPY_MIN_TARGETS
+        engine = 'numpy' if numpy else 'python'
+        self.stdout.write(self.style.SUCCESS(
+            f'{products} produto(s), {rows} vizinho(s) em {(time.perf_counter() - start) * 1000:.0f} ms ({engine})'
+        ))
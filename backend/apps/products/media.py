@@ -0,0 +1,147 @@
+"""
+Deduplicação de imagens do catálogo.
+
+O mesmo arquivo costuma ser reutilizado em vários ProductSize/variantes
+(ex: a mesma foto para todas as classes de pressão). Cada upload é
+comparado pelo SHA-256 com os arquivos já armazenados; se já existir, o
+registro passa a apontar para o mesmo arquivo. ImageBlob guarda a
+contagem de referências e o arquivo é removido do storage quando a
+última referência some.
+
+O hash perceptual não deduplica: fotos parecidas podem ser produtos
+diferentes (outra cor de pintura, outra plaqueta). Com
+MEDIA_DEDUP_PERCEPTUAL=True, um arquivo novo com o mesmo hash de outro é
+só marcado em ImageBlob.similar_to, para revisão no admin.
+
+Os contadores são mantidos pelos signals (apps/products/signals.py):
+QuerySet.update() e bulk_create() não passam por eles — use
+``manage.py gc_media`` para limpar o que sobrar.
+"""
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import F
+
+from config.storage import file_digest
+
+
+def image_fields(model):
+    """Nomes dos FileField/ImageField de um model."""
+    return [f.name for f in model._meta.get_fields() if isinstance(f, models.FileField)]
+
+
+def perceptual_hash(content):
+    """
+    dHash de 64 bits (hex) do conteúdo de uma imagem.
+    Retorna '' se o arquivo não puder ser lido como imagem.
+    """
+    from PIL import Image
+
+    try:
+        content.seek(0)
+        with Image.open(content) as img:
+            img.draft('L', (64, 64))
+            pixels = list(img.convert('L').resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    except Exception:
+        return ''
+    finally:
+        content.seek(0)
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f'{bits:016x}'
+
+
+def find_duplicate(content):
+    """
+    Procura um ImageBlob com exatamente o mesmo conteúdo (SHA-256) do upload.
+    Retorna (blob ou None, sha256 do upload).
+    """
+    from .models import ImageBlob
+
+    sha256 = file_digest(content)
+    blob = ImageBlob.objects.filter(sha256=sha256).first()
+    if blob is not None and not default_storage.exists(blob.name):
+        blob = None
+    return blob, sha256
+
+
+def dedupe_upload(field_file):
+    """
+    Se o arquivo ainda não foi salvo e já existe um blob equivalente,
+    aponta o campo para o arquivo existente (sem gravar outro no storage).
+    """
+    if not field_file or field_file._committed:
+        return
+    blob, sha256 = find_duplicate(field_file.file)
+    field_file._sha256 = sha256
+    if blob is not None:
+        field_file.name = blob.name
+        field_file._committed = True
+
+
+def _describe(name, sha256=None):
+    """Campos de um novo ImageBlob a partir do arquivo no storage."""
+    data = {'sha256': sha256 or '', 'phash': '', 'size': 0}
+    try:
+        with default_storage.open(name, 'rb') as fh:
+            if not sha256:
+                data['sha256'] = file_digest(fh)
+            data['phash'] = perceptual_hash(fh)
+        data['size'] = default_storage.size(name)
+    except (OSError, ValueError):
+        pass
+    return data
+
+
+def acquire(name, sha256=None):
+    """Incrementa a contagem de referências de um arquivo."""
+    from .models import ImageBlob
+
+    if ImageBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1):
+        return
+    defaults = _describe(name, sha256)
+    defaults['ref_count'] = 1
+    blob, created = ImageBlob.objects.get_or_create(name=name, defaults=defaults)
+    if created:
+        flag_similar(blob)
+    else:
+        ImageBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+
+def flag_similar(blob):
+    """Marca para revisão um arquivo novo com o mesmo hash perceptual de outro."""
+    from .models import ImageBlob
+
+    # Imagens sem textura (cor sólida) geram hash zero: não comparar por ele
+    if not settings.MEDIA_DEDUP_PERCEPTUAL or not blob.phash.strip('0'):
+        return
+    similar = ImageBlob.objects.filter(phash=blob.phash).exclude(pk=blob.pk).order_by('pk').first()
+    if similar is not None:
+        ImageBlob.objects.filter(pk=blob.pk).update(similar_to=similar)
+        blob.similar_to = similar
+
+
+def release(name):
+    """
+    Decrementa a contagem de referências; na última, remove o blob e,
+    após o commit, o arquivo do storage.
+    """
+    from .models import ImageBlob
+
+    ImageBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    deleted, _ = ImageBlob.objects.filter(name=name, ref_count=0).delete()
+    if deleted:
+        transaction.on_commit(lambda: _delete_file(name))
+
+
+def _delete_file(name):
+    from .models import ImageBlob
+
+    # Um upload concorrente pode ter voltado a referenciar o arquivo
+    if not ImageBlob.objects.filter(name=name).exists():
+        default_storage.delete(name)
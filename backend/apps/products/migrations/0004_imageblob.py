@@ -0,0 +1,108 @@
+# Migration: ImageBlob (contagem de referências das imagens do catálogo)
+
+import hashlib
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+IMAGE_FIELDS = {
+    "Category": ["image"],
+    "Product": ["image"],
+    "ProductVariant": ["image"],
+    "ProductSize": ["image"],
+}
+
+
+# Cópias de config.storage.file_digest e apps.products.media.perceptual_hash
+# na época desta migração: o histórico não muda se os helpers mudarem.
+def file_digest(fh):
+    sha = hashlib.sha256()
+    fh.seek(0)
+    for chunk in fh.chunks():
+        sha.update(chunk)
+    fh.seek(0)
+    return sha.hexdigest()
+
+
+def perceptual_hash(fh):
+    from PIL import Image
+
+    try:
+        fh.seek(0)
+        with Image.open(fh) as img:
+            img.draft("L", (64, 64))
+            pixels = list(img.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    except Exception:
+        return ""
+    finally:
+        fh.seek(0)
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def create_blobs(apps, schema_editor):
+    ImageBlob = apps.get_model("products", "ImageBlob")
+
+    refs = Counter()
+    for model_name, fields in IMAGE_FIELDS.items():
+        model = apps.get_model("products", model_name)
+        for field in fields:
+            names = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            refs.update(names.values_list(field, flat=True))
+
+    for name, count in refs.items():
+        blob = ImageBlob(name=name, ref_count=count)
+        try:
+            with default_storage.open(name, "rb") as fh:
+                blob.sha256 = file_digest(fh)
+                blob.phash = perceptual_hash(fh)
+            blob.size = default_storage.size(name)
+        except (OSError, ValueError):
+            pass
+        blob.save()
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_category_order"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True, verbose_name="Arquivo")),
+                ("sha256", models.CharField(blank=True, db_index=True, max_length=64, verbose_name="SHA-256")),
+                (
+                    "phash",
+                    models.CharField(
+                        blank=True,
+                        db_index=True,
+                        help_text="dHash de 64 bits (usado quando MEDIA_DEDUP_PERCEPTUAL=True)",
+                        max_length=16,
+                        verbose_name="Hash perceptual",
+                    ),
+                ),
+                ("size", models.PositiveBigIntegerField(default=0, verbose_name="Tamanho (bytes)")),
+                ("ref_count", models.PositiveIntegerField(default=0, verbose_name="Referências")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Criado em")),
+            ],
+            options={
+                "verbose_name": "Imagem armazenada",
+                "verbose_name_plural": "Imagens armazenadas",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.RunPython(create_blobs, noop),
+    ]
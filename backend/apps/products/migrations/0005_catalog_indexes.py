@@ -0,0 +1,61 @@
+# Migration: índices compostos/parciais das consultas públicas do catálogo
+# (ver python manage.py explain_queries)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_imageblob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["order", "name"],
+                condition=models.Q(is_active=True),
+                name="products_cat_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["title"],
+                condition=models.Q(is_active=True),
+                name="products_prod_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "title"],
+                condition=models.Q(is_active=True),
+                name="products_prod_cat_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productvariant",
+            index=models.Index(
+                fields=["product", "order", "name"],
+                name="products_variant_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productsize",
+            index=models.Index(
+                fields=["product", "order", "size_label"],
+                condition=models.Q(product__isnull=False),
+                name="products_size_prod_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productsize",
+            index=models.Index(
+                fields=["variant", "order", "size_label"],
+                condition=models.Q(variant__isnull=False),
+                name="products_size_var_order_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Migration: ProductSimilarity (vizinhos pré-calculados para /products/{slug}/related/)
+# Preencha com: python manage.py rebuild_recommendations
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0005_catalog_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSimilarity",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Posição")),
+                ("score", models.FloatField(verbose_name="Similaridade")),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarities",
+                        to="products.product",
+                        verbose_name="Produto",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_of",
+                        to="products.product",
+                        verbose_name="Produto similar",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Produto similar",
+                "verbose_name_plural": "Produtos similares",
+                "ordering": ["product", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productsimilarity",
+            constraint=models.UniqueConstraint(fields=("product", "rank"), name="products_similarity_rank_uniq"),
+        ),
+    ]
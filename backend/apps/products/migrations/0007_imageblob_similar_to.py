@@ -0,0 +1,38 @@
+# Migration: ImageBlob.similar_to (uploads com o mesmo hash perceptual, para revisão)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_productsimilarity"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="imageblob",
+            name="phash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="dHash de 64 bits (comparado quando MEDIA_DEDUP_PERCEPTUAL=True)",
+                max_length=16,
+                verbose_name="Hash perceptual",
+            ),
+        ),
+        migrations.AddField(
+            model_name="imageblob",
+            name="similar_to",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Mesmo hash perceptual de uma imagem já armazenada: revisar (não é deduplicada)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="similar_uploads",
+                to="products.imageblob",
+                verbose_name="Parecida com",
+            ),
+        ),
+    ]
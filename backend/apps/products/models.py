@@ -27,6 +27,10 @@ class Category(models.Model):
         verbose_name = "Categoria"
         verbose_name_plural = "Categorias"
         ordering = ["order", "name"]
+        indexes = [
+            # Listagem pública: WHERE is_active ORDER BY order, name
+            models.Index(fields=["order", "name"], condition=models.Q(is_active=True), name="products_cat_active_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -37,6 +41,24 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
 
+class ProductQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Categoria, variantes e tamanhos pré-carregados (o que o ProductSerializer lê).
+
+        Os prefetches ordenam pela FK primeiro: o banco percorre os índices
+        (product, order, ...) / (variant, order, ...) sem ordenar em memória,
+        e a ordem dentro de cada produto/variante continua a do Meta.
+        """
+        return self.select_related('category').prefetch_related(
+            models.Prefetch('variants', queryset=ProductVariant.objects.order_by('product_id', 'order', 'name')),
+            models.Prefetch(
+                'variants__sizes', queryset=ProductSize.objects.order_by('variant_id', 'order', 'size_label')
+            ),
+            models.Prefetch('sizes', queryset=ProductSize.objects.order_by('product_id', 'order', 'size_label')),
+        )
+
+
 class Product(models.Model):
     """Produto principal - Suporta 3 cenários: Simples, Intermediário, Complexo"""
     category = models.ForeignKey(
@@ -86,11 +108,21 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Produto"
         verbose_name_plural = "Produtos"
         ordering = ['title']
         unique_together = [['category', 'slug']]
+        indexes = [
+            # Listagem pública e índice do catálogo: WHERE is_active ORDER BY title
+            models.Index(fields=['title'], condition=models.Q(is_active=True), name='products_prod_active_idx'),
+            # Produtos de uma categoria (by-category, ?category=, products_count)
+            models.Index(
+                fields=['category', 'title'], condition=models.Q(is_active=True), name='products_prod_cat_active_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.category.name})"
@@ -145,6 +177,10 @@ class ProductVariant(models.Model):
         verbose_name_plural = "Variantes"
         ordering = ['order', 'name']
         unique_together = [['product', 'name']]
+        indexes = [
+            # Prefetch das variantes: WHERE product_id IN (...) na ordem do Meta
+            models.Index(fields=['product', 'order', 'name'], name='products_variant_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.product.title} - {self.name}"
@@ -197,6 +233,20 @@ class ProductSize(models.Model):
                 name='product_size_must_have_product_or_variant'
             )
         ]
+        # Cada tamanho pertence a um produto OU a uma variante; índices parciais
+        # só com as linhas de cada caso (a condição NOT NULL é implícita no IN do prefetch)
+        indexes = [
+            models.Index(
+                fields=['product', 'order', 'size_label'],
+                condition=models.Q(product__isnull=False),
+                name='products_size_prod_order_idx',
+            ),
+            models.Index(
+                fields=['variant', 'order', 'size_label'],
+                condition=models.Q(variant__isnull=False),
+                name='products_size_var_order_idx',
+            ),
+        ]
 
     def __str__(self):
         if self.variant:
@@ -213,3 +263,66 @@ class ProductSize(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()  # Executa validações
         super().save(*args, **kwargs)
+
+
+class ProductSimilarity(models.Model):
+    """Vizinho pré-calculado de um produto (ver apps/products/recommendations.py)"""
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='similarities',
+        verbose_name="Produto"
+    )
+    similar = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='similar_of',
+        verbose_name="Produto similar"
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name="Posição")
+    score = models.FloatField(verbose_name="Similaridade")
+
+    class Meta:
+        verbose_name = "Produto similar"
+        verbose_name_plural = "Produtos similares"
+        ordering = ['product', 'rank']
+        constraints = [
+            # Também é o índice de /related/: WHERE product_id = ? ORDER BY rank
+            models.UniqueConstraint(fields=['product', 'rank'], name='products_similarity_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.similar_id} ({self.score:.3f})"
+
+
+class ImageBlob(models.Model):
+    """Arquivo de imagem armazenado uma única vez e compartilhado entre registros"""
+    name = models.CharField(max_length=255, unique=True, verbose_name="Arquivo")
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="SHA-256")
+    phash = models.CharField(
+        max_length=16,
+        blank=True,
+        db_index=True,
+        verbose_name="Hash perceptual",
+        help_text="dHash de 64 bits (comparado quando MEDIA_DEDUP_PERCEPTUAL=True)"
+    )
+    size = models.PositiveBigIntegerField(default=0, verbose_name="Tamanho (bytes)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="Referências")
+    similar_to = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='similar_uploads',
+        verbose_name="Parecida com",
+        help_text="Mesmo hash perceptual de uma imagem já armazenada: revisar (não é deduplicada)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        verbose_name = "Imagem armazenada"
+        verbose_name_plural = "Imagens armazenadas"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
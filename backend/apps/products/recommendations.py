@@ -0,0 +1,229 @@
+"""
+Produtos similares pré-calculados (GET /api/products/products/{slug}/related/).
+
+Cada produto ativo vira um vetor esparso de atributos:
+
+    category:<id>           categoria
+    standard:<norma>        cada item de ``standards``
+    application:<uso>       cada item de ``applications``
+    spec:<chave>=<valor>    cada par de ``specifications``
+    speckey:<chave>         a chave sozinha (mesma grandeza medida)
+
+com peso = FEATURE_WEIGHTS[tipo] x IDF (atributos raros aproximam mais
+que os comuns), normalizado (norma L2 = 1). A similaridade é o cosseno
+(produto escalar dos vetores normalizados); os RECOMMENDATIONS_TOP_K
+vizinhos de cada produto ficam em ProductSimilarity, e a view lê a lista
+pronta numa consulta indexada.
+
+O cálculo usa NumPy (multiplicação de matrizes) se estiver instalado e o
+lote for grande (reconstrução completa); para poucos produtos, e sem
+NumPy, um índice invertido em Python puro compara só produtos que têm
+algum atributo em comum, sem montar a matriz densa do catálogo inteiro.
+Os resultados são os mesmos.
+
+Atualização incremental: os signals agendam os produtos alterados na fila
+de config/jobs.py e o worker chama ``update``, fora da requisição e com
+todos os produtos pendentes de uma vez, que recalcula a lista deles e a
+dos produtos em que eles entram ou saem do top-k. ``rebuild_recommendations``
+recalcula tudo (os pesos IDF das listas não tocadas só são atualizados aí).
+"""
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+
+from config import jobs
+from config.cache import bump_version
+from config.purge import schedule_purge
+
+from .models import Product, ProductSimilarity
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy é opcional
+    np = None
+
+FEATURE_WEIGHTS = {
+    'category': 2.0,
+    'standard': 1.5,
+    'application': 1.0,
+    'spec': 1.0,
+    'speckey': 0.3,
+}
+FEATURE_FIELDS = ('id', 'title', 'category_id', 'standards', 'applications', 'specifications')
+# Tag do CDN das respostas de /related/ (config/purge.py)
+SURROGATE_KEY = 'related'
+# Namespace do cache de respostas só de /related/ (a chave também leva a
+# versão do "catalog"): recalcular vizinhos não esvazia o resto do catálogo
+CACHE_NAMESPACE = 'related'
+# Abaixo disso o índice invertido é mais barato que a matriz densa do NumPy
+NUMPY_MIN_TARGETS = 64
+
+
+def _normalize(value):
+    return ' '.join(str(value).split()).lower()
+
+
+def product_features(row):
+    """Atributos do produto (dict com FEATURE_FIELDS) -> {atributo: peso do tipo}."""
+    features = {f'category:{row["category_id"]}': FEATURE_WEIGHTS['category']}
+    for kind, values in (('standard', row['standards']), ('application', row['applications'])):
+        if isinstance(values, list):
+            for value in values:
+                if str(value).strip():
+                    features[f'{kind}:{_normalize(value)}'] = FEATURE_WEIGHTS[kind]
+    specifications = row['specifications']
+    if isinstance(specifications, dict):
+        for key, value in specifications.items():
+            key = _normalize(key)
+            features[f'speckey:{key}'] = FEATURE_WEIGHTS['speckey']
+            if str(value).strip():
+                features[f'spec:{key}={_normalize(value)}'] = FEATURE_WEIGHTS['spec']
+    return features
+
+
+def build_vectors(rows):
+    """Vetores TF-IDF normalizados, na ordem de ``rows``."""
+    raw = [product_features(row) for row in rows]
+    document_frequency = defaultdict(int)
+    for features in raw:
+        for feature in features:
+            document_frequency[feature] += 1
+    total = len(raw)
+    vectors = []
+    for features in raw:
+        vector = {
+            feature: weight * (math.log((1 + total) / (1 + document_frequency[feature])) + 1)
+            for feature, weight in features.items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        vectors.append({feature: value / norm for feature, value in vector.items()})
+    return vectors
+
+
+def similarity_rows(vectors, targets):
+    """Para cada índice de ``targets``: {índice do outro produto: cosseno > 0}."""
+    if np is not None and len(targets) >= NUMPY_MIN_TARGETS:
+        return _similarity_rows_numpy(vectors, targets)
+    return _similarity_rows_python(vectors, targets)
+
+
+def _similarity_rows_numpy(vectors, targets):
+    vocabulary = {}
+    for vector in vectors:
+        for feature in vector:
+            vocabulary.setdefault(feature, len(vocabulary))
+    matrix = np.zeros((len(vectors), len(vocabulary)))
+    for row, vector in enumerate(vectors):
+        for feature, value in vector.items():
+            matrix[row, vocabulary[feature]] = value
+    scores = matrix[targets] @ matrix.T
+    result = []
+    for position, target in enumerate(targets):
+        row = scores[position]
+        row[target] = 0.0
+        others = np.flatnonzero(row > 0)
+        result.append(dict(zip(others.tolist(), row[others].tolist())))
+    return result
+
+
+def _similarity_rows_python(vectors, targets):
+    postings = defaultdict(list)
+    for index, vector in enumerate(vectors):
+        for feature, value in vector.items():
+            postings[feature].append((index, value))
+    result = []
+    for target in targets:
+        scores = defaultdict(float)
+        for feature, value in vectors[target].items():
+            for other, other_value in postings[feature]:
+                if other != target:
+                    scores[other] += value * other_value
+        result.append(dict(scores))
+    return result
+
+
+def top_k(scores, rows, k):
+    """Os k mais similares (empate: título, depois id, para a ordem ser estável)."""
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], rows[item[0]]['title'], rows[item[0]]['id']))
+    return ranked[:k]
+
+
+def _load():
+    rows = list(Product.objects.filter(is_active=True).order_by('id').values(*FEATURE_FIELDS))
+    return rows, build_vectors(rows)
+
+
+def _save(rows, targets, neighbours, clear=()):
+    """Troca as listas dos produtos ``targets`` (e apaga as de ``clear``) numa transação."""
+    objs = [
+        ProductSimilarity(product_id=rows[target]['id'], similar_id=rows[other]['id'], rank=rank, score=score)
+        for target, items in zip(targets, neighbours)
+        for rank, (other, score) in enumerate(items, 1)
+    ]
+    with transaction.atomic():
+        ProductSimilarity.objects.filter(product_id__in=[rows[target]['id'] for target in targets] + list(clear)).delete()
+        ProductSimilarity.objects.bulk_create(objs, batch_size=500)
+    return len(objs)
+
+
+def _published():
+    # bulk_create não dispara signals: invalida /related/ no cache e no CDN aqui
+    bump_version(CACHE_NAMESPACE)
+    schedule_purge([SURROGATE_KEY])
+
+
+def rebuild_all():
+    """Recalcula os vizinhos de todos os produtos ativos; devolve (produtos, linhas)."""
+    rows, vectors = _load()
+    k = settings.RECOMMENDATIONS_TOP_K
+    targets = list(range(len(rows)))
+    neighbours = [top_k(scores, rows, k) for scores in similarity_rows(vectors, targets)] if rows else []
+    with transaction.atomic():
+        ProductSimilarity.objects.all().delete()
+        count = _save(rows, targets, neighbours)
+    _published()
+    return len(rows), count
+
+
+def update(product_ids):
+    """Recalcula as listas afetadas pela alteração (ou remoção) dos produtos ``product_ids``."""
+    rows, vectors = _load()
+    k = settings.RECOMMENDATIONS_TOP_K
+    index = {row['id']: position for position, row in enumerate(rows)}
+    changed = [index[pk] for pk in product_ids if pk in index]
+
+    # Listas que já têm um dos produtos (a similaridade mudou ou ele saiu do ar)
+    affected = set(
+        ProductSimilarity.objects.filter(similar_id__in=product_ids).values_list('product_id', flat=True)
+    )
+    # Listas em que um dos produtos passa a entrar: cosseno acima do k-ésimo atual
+    current = {
+        item['product_id']: (item['size'], item['lowest'])
+        for item in ProductSimilarity.objects.values('product_id').annotate(size=Count('id'), lowest=Min('score'))
+    }
+    for scores in similarity_rows(vectors, changed):
+        for other, score in scores.items():
+            size, lowest = current.get(rows[other]['id'], (0, 0.0))
+            if size < k or score > lowest:
+                affected.add(rows[other]['id'])
+
+    targets = sorted(set(changed) | {index[pk] for pk in affected if pk in index})
+    neighbours = [top_k(scores, rows, k) for scores in similarity_rows(vectors, targets)]
+    # Inativos (ou removidos) não têm lista
+    inactive = [pk for pk in product_ids if pk not in index]
+    count = _save(rows, targets, neighbours, clear=inactive)
+    _published()
+    return len(targets), count
+
+
+def schedule(product_id):
+    """Atualiza as recomendações após o commit da transação atual (pelo worker)."""
+    jobs.enqueue('recommendations', [product_id])
+
+
+def run(keys):
+    """Tarefa da fila: uma atualização com todos os produtos pendentes."""
+    update(sorted(int(key) for key in keys))
@@ -38,7 +38,8 @@ class ProductVariantSerializer(serializers.ModelSerializer):
     
     def get_sizes(self, obj):
         """Retorna sizes como Record/Dict: { "1/2": "url", "1": "url" }"""
-        sizes = obj.sizes.all().order_by('order', 'size_label')
+        # .all() usa o prefetch (a ordenação 'order', 'size_label' vem do Meta)
+        sizes = obj.sizes.all()
         return {
             size.size_label: self._get_image_url(size)
             for size in sizes
@@ -121,8 +122,8 @@ class ProductSerializer(serializers.ModelSerializer):
             # Se tem variantes, sizes vem dentro das variantes
             return {}
         
-        # Sizes diretos do produto (Cenário Intermediário)
-        sizes = obj.sizes.filter(variant__isnull=True).order_by('order', 'size_label')
+        # Sizes diretos do produto (Cenário Intermediário); filtra em memória para usar o prefetch
+        sizes = [size for size in obj.sizes.all() if size.variant_id is None]
         request = self.context.get('request')
         
         return {
@@ -202,3 +203,29 @@ class CategoryWithProductsSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
         return None
+
+
+class ProductSummarySerializer(serializers.ModelSerializer):
+    """Produto resumido (links e cards): sem variantes, tamanhos nem especificações."""
+    image_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = ['id', 'title', 'slug', 'image_url']
+
+    def get_image_url(self, obj):
+        if obj.image:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.image.url)
+            return obj.image.url
+        return None
+
+
+class RelatedProductSerializer(ProductSummarySerializer):
+    """Produto recomendado: resumo, categoria (pode ser outra) e o cosseno da similaridade."""
+    category_slug = serializers.CharField(source='category.slug', read_only=True)
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(ProductSummarySerializer.Meta):
+        fields = ProductSummarySerializer.Meta.fields + ['category_slug', 'score']
@@ -0,0 +1,179 @@
+"""
+Signals do app products.
+
+Imagens: deduplica uploads e mantém a contagem de referências dos
+arquivos (ver apps/products/media.py).
+
+Cache: qualquer alteração no catálogo incrementa a versão do namespace
+"catalog", invalidando as respostas cacheadas da API (config/cache.py),
+e purga do CDN as tags afetadas (config/purge.py).
+
+Prerender: os snapshots HTML das páginas afetadas são regerados pelo
+worker da fila (config/jobs.py, config/prerender.py); URLs antigas (slug
+ou categoria trocados) são removidas.
+
+Recomendações: produtos salvos ou removidos atualizam os vizinhos
+pré-calculados, também pelo worker (apps/products/recommendations.py).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, pre_delete, post_save, post_delete
+
+from config import prerender
+from config.cache import bump_version
+from config.purge import schedule_purge
+
+from . import media, recommendations
+from .models import Category, Product, ProductSimilarity, ProductVariant, ProductSize
+
+CATALOG_MODELS = (Category, Product, ProductVariant, ProductSize)
+CACHE_NAMESPACE = 'catalog'
+
+
+def track_images_pre_save(sender, instance, raw=False, **kwargs):
+    """Guarda os nomes atuais das imagens e deduplica uploads novos."""
+    fields = media.image_fields(sender)
+    previous = {}
+    if instance.pk and not instance._state.adding:
+        previous = sender._base_manager.filter(pk=instance.pk).values(*fields).first() or {}
+    instance._previous_images = previous
+    if raw:
+        return
+    for field in fields:
+        media.dedupe_upload(getattr(instance, field))
+
+
+def track_images_post_save(sender, instance, raw=False, **kwargs):
+    """Atualiza as referências das imagens trocadas."""
+    previous = getattr(instance, '_previous_images', {})
+    for field in media.image_fields(sender):
+        field_file = getattr(instance, field)
+        new_name = field_file.name or ''
+        old_name = previous.get(field) or ''
+        if new_name == old_name:
+            continue
+        if new_name:
+            media.acquire(new_name, getattr(field_file, '_sha256', None))
+        if old_name:
+            media.release(old_name)
+    instance._previous_images = {
+        field: getattr(instance, field).name or '' for field in media.image_fields(sender)
+    }
+
+
+def release_images_post_delete(sender, instance, **kwargs):
+    """Solta as referências das imagens do registro removido."""
+    for field in media.image_fields(sender):
+        name = getattr(instance, field).name
+        if name:
+            media.release(name)
+
+
+def _product_id(instance):
+    """Produto de uma variante ou tamanho (None se já não existir)."""
+    if instance.product_id is not None or not getattr(instance, 'variant_id', None):
+        return instance.product_id
+    return ProductVariant.objects.filter(pk=instance.variant_id).values_list('product_id', flat=True).first()
+
+
+def surrogate_keys(instance):
+    """Tags do CDN das respostas que mostram o registro (ver config/purge.py)."""
+    if isinstance(instance, Category):
+        # Produtos trazem nome/slug da categoria
+        return [f'category-{instance.pk}', 'category-list', 'product-list']
+    if isinstance(instance, Product):
+        # A categoria mostra a contagem de produtos ativos
+        return [f'product-{instance.pk}', f'category-{instance.category_id}', 'product-list', 'category-list']
+    product_id = _product_id(instance)
+    if product_id is None:
+        return [CACHE_NAMESPACE]
+    return [f'product-{product_id}', 'product-list']
+
+
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    """Invalida as respostas cacheadas do catálogo e o CDN após o commit."""
+    # Tags calculadas agora: após um delete o pk já não existe no commit
+    schedule_purge(surrogate_keys(instance))
+    transaction.on_commit(lambda: bump_version(CACHE_NAMESPACE))
+
+
+def _page_path(instance):
+    """Caminho do snapshot do produto/categoria no estado atual do banco."""
+    if isinstance(instance, Category):
+        return prerender.category_path(instance.slug)
+    category_slug = Category.objects.filter(pk=instance.category_id).values_list('slug', flat=True).first()
+    return prerender.product_path(category_slug, instance.slug) if category_slug else None
+
+
+def track_page_pre_save(sender, instance, raw=False, **kwargs):
+    """Guarda a URL e a categoria atuais (slug ou categoria podem mudar)."""
+    instance._previous_page = None
+    if raw or not settings.PRERENDER_ENABLED or instance._state.adding or not instance.pk:
+        return
+    previous = sender._base_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._previous_page = (_page_path(previous), getattr(previous, 'category_id', None))
+
+
+def rebuild_pages_post_save(sender, instance, raw=False, **kwargs):
+    """Agenda a regeração dos snapshots que mostram o registro."""
+    if raw:
+        return
+    if sender in (ProductVariant, ProductSize):
+        prerender.schedule('product', _product_id(instance))
+        return
+    previous_path, previous_category = getattr(instance, '_previous_page', None) or (None, None)
+    if previous_path and previous_path != _page_path(instance):
+        # Produtos da categoria ficam abaixo da URL dela
+        prerender.schedule_remove(previous_path, tree=sender is Category)
+    if sender is Category:
+        prerender.schedule('category', instance.pk)
+        for product_id in instance.products.values_list('pk', flat=True):
+            prerender.schedule('product', product_id)
+    else:
+        prerender.schedule('product', instance.pk)
+        prerender.schedule('category', instance.category_id)
+        if previous_category != instance.category_id:
+            prerender.schedule('category', previous_category)
+
+
+def remove_pages_post_delete(sender, instance, **kwargs):
+    """Remove o snapshot do registro apagado e regera as páginas que o listavam."""
+    if sender in (ProductVariant, ProductSize):
+        prerender.schedule('product', _product_id(instance))
+        return
+    path = _page_path(instance)
+    if path:
+        prerender.schedule_remove(path, tree=sender is Category)
+    if sender is Product:
+        prerender.schedule('category', instance.category_id)
+
+
+def update_recommendations_post_save(sender, instance, raw=False, **kwargs):
+    """Recalcula os vizinhos do produto e as listas em que ele entra ou sai."""
+    if not raw:
+        recommendations.schedule(instance.pk)
+
+
+def update_recommendations_pre_delete(sender, instance, **kwargs):
+    """As linhas que apontam para o produto somem por CASCADE: agenda as listas delas."""
+    for product_id in ProductSimilarity.objects.filter(similar=instance).values_list('product_id', flat=True):
+        recommendations.schedule(product_id)
+
+
+for model in CATALOG_MODELS:
+    uid = model.__name__.lower()
+    pre_save.connect(track_images_pre_save, sender=model, dispatch_uid=f'products-images-pre-save-{uid}')
+    post_save.connect(track_images_post_save, sender=model, dispatch_uid=f'products-images-post-save-{uid}')
+    post_delete.connect(release_images_post_delete, sender=model, dispatch_uid=f'products-images-post-delete-{uid}')
+    post_save.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'products-cache-post-save-{uid}')
+    post_delete.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'products-cache-post-delete-{uid}')
+    post_save.connect(rebuild_pages_post_save, sender=model, dispatch_uid=f'products-prerender-post-save-{uid}')
+    post_delete.connect(remove_pages_post_delete, sender=model, dispatch_uid=f'products-prerender-post-delete-{uid}')
+
+for model in (Category, Product):
+    uid = model.__name__.lower()
+    pre_save.connect(track_page_pre_save, sender=model, dispatch_uid=f'products-prerender-pre-save-{uid}')
+
+post_save.connect(update_recommendations_post_save, sender=Product, dispatch_uid='products-recommendations-post-save')
+pre_delete.connect(update_recommendations_pre_delete, sender=Product, dispatch_uid='products-recommendations-pre-delete')
@@ -0,0 +1,286 @@
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from api.models import DeferredJob, User
+from api.tokens import UserClaimsRefreshToken
+from apps.blog.models import Post
+from config import jobs
+from config.cache import bump_version, cache_is_shared, get_version
+
+from . import recommendations
+from .models import Category, ImageBlob, Product, ProductSimilarity
+
+
+def png(color, name='foto.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def gradient(tweak=0, name='foto.png'):
+    """Degradê (hash perceptual não nulo); ``tweak`` muda um pixel sem mudar o hash."""
+    image = Image.new('L', (64, 64))
+    image.putdata([255 - x * 4 for y in range(64) for x in range(64)])
+    image.putpixel((0, 0), 255 - tweak)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class MediaTestCase(TestCase):
+    """MEDIA_ROOT e PRERENDER_ROOT temporários por teste."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        prerender_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, prerender_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=self.media_root, PRERENDER_ROOT=prerender_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.category = Category.objects.create(name='Válvulas')
+
+    def stored(self, name):
+        return Path(self.media_root, name).exists()
+
+
+class ImageBlobRefcountTests(MediaTestCase):
+    def test_same_upload_is_stored_once(self):
+        first = Product.objects.create(category=self.category, title='Gaveta', image=png('red'))
+        second = Product.objects.create(category=self.category, title='Globo', image=png('red', 'outra.png'))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(ImageBlob.objects.get(name=first.image.name).ref_count, 2)
+
+    def test_replace_releases_previous_image(self):
+        product = Product.objects.create(category=self.category, title='Gaveta', image=png('red'))
+        Product.objects.create(category=self.category, title='Globo', image=png('red'))
+        old_name = product.image.name
+
+        product.image = png('blue')
+        product.save()
+        self.assertEqual(ImageBlob.objects.get(name=old_name).ref_count, 1)
+        self.assertEqual(ImageBlob.objects.get(name=product.image.name).ref_count, 1)
+
+    def test_last_reference_deletes_blob_and_file(self):
+        product = Product.objects.create(category=self.category, title='Gaveta', image=png('red'))
+        name = product.image.name
+        self.assertTrue(self.stored(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertFalse(ImageBlob.objects.filter(name=name).exists())
+        self.assertFalse(self.stored(name))
+
+    @override_settings(MEDIA_DEDUP_PERCEPTUAL=True)
+    def test_perceptual_match_is_flagged_not_deduplicated(self):
+        first = Product.objects.create(category=self.category, title='Gaveta', image=gradient())
+        second = Product.objects.create(category=self.category, title='Globo', image=gradient(tweak=1))
+        self.assertNotEqual(first.image.name, second.image.name)
+
+        original = ImageBlob.objects.get(name=first.image.name)
+        similar = ImageBlob.objects.get(name=second.image.name)
+        self.assertEqual(similar.phash, original.phash)
+        self.assertEqual(similar.similar_to, original)
+        self.assertIsNone(original.similar_to)
+        self.assertEqual((original.ref_count, similar.ref_count), (1, 1))
+
+    def test_file_kept_while_referenced(self):
+        first = Product.objects.create(category=self.category, title='Gaveta', image=png('red'))
+        second = Product.objects.create(category=self.category, title='Globo', image=png('red'))
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(ImageBlob.objects.get(name=second.image.name).ref_count, 1)
+        self.assertTrue(self.stored(second.image.name))
+
+
+class GcMediaTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = Product.objects.create(category=self.category, title='Gaveta', image=png('red'))
+        Post.objects.create(
+            title='Instalação', content='<p><img src="/media/blog/embutida.png"></p>', is_published=True,
+        )
+        for name in ('orfaos/velha.png', 'blog/embutida.png', 'uploads/2024/ckeditor.png'):
+            self.write(name)
+        ImageBlob.objects.create(name='orfaos/velha.png', ref_count=0)
+        # Arquivos antigos: --min-age não os protege
+        for path in Path(self.media_root).rglob('*'):
+            if path.is_file():
+                os.utime(path, (0, 0))
+
+    def write(self, name):
+        path = Path(self.media_root, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'conteudo')
+
+    def gc(self, *args):
+        out = io.StringIO()
+        call_command('gc_media', *args, stdout=out)
+        return out.getvalue()
+
+    def test_report_only_by_default(self):
+        output = self.gc()
+        self.assertIn('1 órfãos encontrados', output)
+        self.assertTrue(self.stored('orfaos/velha.png'))
+        self.assertIn('1 órfãos encontrados', self.gc('--dry-run'))
+
+    def test_delete_keeps_referenced_embedded_and_protected(self):
+        self.assertIn('1 órfãos removidos', self.gc('--delete'))
+        self.assertFalse(self.stored('orfaos/velha.png'))
+        self.assertFalse(ImageBlob.objects.filter(name='orfaos/velha.png').exists())
+        self.assertTrue(self.stored(self.product.image.name))
+        self.assertTrue(self.stored('blog/embutida.png'))
+        self.assertTrue(self.stored('uploads/2024/ckeditor.png'))
+
+    @override_settings(MEDIA_CDN_URL='https://cdn.nexus.test/media/')
+    def test_keeps_media_linked_through_cdn(self):
+        self.write('blog/cdn.png')
+        os.utime(Path(self.media_root, 'blog/cdn.png'), (0, 0))
+        Post.objects.create(title='CDN', content='<a href="https://cdn.nexus.test/media/blog/cdn.png">PDF</a>')
+        self.gc('--delete')
+        self.assertTrue(self.stored('blog/cdn.png'))
+
+    def test_recent_files_are_skipped(self):
+        self.write('orfaos/novo.png')
+        self.gc('--delete')
+        self.assertTrue(self.stored('orfaos/novo.png'))
+
+
+@override_settings(RECOMMENDATIONS_TOP_K=2, PRERENDER_ENABLED=False)
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.valves = Category.objects.create(name='Válvulas')
+        self.fittings = Category.objects.create(name='Conexões')
+        self.gate = self.product('Gaveta', self.valves, ['API 600'], {'Material': 'Aço carbono'})
+        self.globe = self.product('Globo', self.valves, ['API 600'], {'Material': 'Aço inox'})
+        self.elbow = self.product('Cotovelo', self.fittings, ['ASME B16.9'], {'Material': 'Aço inox'})
+        self.run_jobs()
+
+    def product(self, title, category, standards, specifications):
+        return Product.objects.create(
+            title=title, category=category, standards=standards, specifications=specifications,
+        )
+
+    def run_jobs(self):
+        jobs.run_pending(['recommendations'])
+
+    def related(self, product):
+        return list(
+            ProductSimilarity.objects.filter(product=product).order_by('rank').values_list('similar__title', flat=True)
+        )
+
+    def test_save_queues_update_instead_of_running_it(self):
+        ProductSimilarity.objects.all().delete()
+        self.gate.save()
+        self.assertTrue(DeferredJob.objects.filter(kind='recommendations', key=str(self.gate.pk)).exists())
+        self.assertEqual(self.related(self.gate), [])
+        self.run_jobs()
+        self.assertEqual(self.related(self.gate), ['Globo', 'Cotovelo'])
+
+    def test_new_product_enters_neighbour_lists(self):
+        self.assertEqual(self.related(self.globe), ['Gaveta', 'Cotovelo'])
+        self.product('Esfera', self.valves, ['API 600'], {'Material': 'Aço inox'})
+        self.run_jobs()
+        self.assertEqual(self.related(self.globe)[0], 'Esfera')
+        # Mesma similaridade com Gaveta: empate decidido pelo título
+        self.assertEqual(self.related(self.gate), ['Esfera', 'Globo'])
+
+    def test_deleted_product_leaves_neighbour_lists(self):
+        self.globe.delete()
+        self.run_jobs()
+        self.assertNotIn('Globo', self.related(self.gate) + self.related(self.elbow))
+        self.assertEqual(self.related(self.gate), ['Cotovelo'])
+
+    def test_deactivated_product_has_no_list(self):
+        self.gate.is_active = False
+        self.gate.save()
+        self.run_jobs()
+        self.assertEqual(self.related(self.gate), [])
+        self.assertNotIn('Gaveta', self.related(self.globe))
+
+    def test_related_endpoint(self):
+        cache.clear()
+        response = self.client.get(f'/api/products/products/{self.gate.slug}/related/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['title'] for item in response.json()], ['Globo', 'Cotovelo'])
+
+    def test_update_invalidates_only_related(self):
+        cache.clear()
+        related_url = f'/api/products/products/{self.gate.slug}/related/'
+        self.client.get(related_url)
+        self.client.get('/api/products/categories/')
+        catalog_version = get_version('catalog')
+        DeferredJob.objects.all().delete()
+
+        recommendations.update([self.gate.pk])
+        self.assertEqual(get_version('catalog'), catalog_version)
+        self.assertEqual(list(DeferredJob.objects.values_list('kind', 'key')), [('purge', 'related')])
+        self.assertEqual(self.client.get(related_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/products/categories/')['X-Cache'], 'HIT')
+
+    def test_related_of_inactive_product_is_404(self):
+        cache.clear()
+        # update() não dispara signals: as linhas de ProductSimilarity continuam lá
+        Product.objects.filter(pk=self.gate.pk).update(is_active=False)
+        response = self.client.get(f'/api/products/products/{self.gate.slug}/related/')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(PRERENDER_ROOT=tempfile.mkdtemp())
+class ResponseCacheTests(TestCase):
+    url = '/api/products/categories/'
+
+    def setUp(self):
+        cache.clear()
+        Category.objects.create(name='Válvulas')
+
+    def x_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Cache']
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.x_cache(), 'MISS')
+        self.assertEqual(self.x_cache(), 'HIT')
+
+    def test_bump_version_invalidates(self):
+        self.x_cache()
+        bump_version('catalog')
+        self.assertEqual(self.x_cache(), 'MISS')
+        self.assertEqual(self.x_cache(), 'HIT')
+
+    def test_other_namespace_is_untouched(self):
+        self.x_cache()
+        bump_version('blog')
+        self.assertEqual(self.x_cache(), 'HIT')
+
+    def test_model_change_invalidates_after_commit(self):
+        self.x_cache()
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Conexões')
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.x_cache()
+        user = User.objects.create_user(email='editor@nexus.test', password='senha-forte-123')
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertNotIn('X-Cache', response)
+        self.assertIn('no-store', response['Cache-Control'])
+
+    def test_process_local_cache_is_not_shared(self):
+        self.assertFalse(cache_is_shared())
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis:6379/0'}}
+        with override_settings(CACHES=redis):
+            self.assertTrue(cache_is_shared())
@@ -2,19 +2,30 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
+from django.db.models import F
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from config.cache import CachedResponseMixin, get_version
+from config.db_router import ReplicaReadMixin
+from config.parsers import ORJSONParser
+from config.streaming import StreamingJSONResponse, iter_json_array
+from . import recommendations
+from .catalog import get_catalog
 from .models import Category, Product, ProductVariant, ProductSize
 from .serializers import (
     CategorySerializer,
     CategoryWithProductsSerializer,
     ProductSerializer,
+    ProductSummarySerializer,
     ProductVariantSerializer,
+    RelatedProductSerializer,
     ProductSizeSerializer,
 )
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para categorias
     GET /api/products/categories/ - Lista todas as categorias (público)
@@ -27,7 +38,10 @@ class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = 'slug'
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [ORJSONParser, MultiPartParser, FormParser]
+    cache_namespace = 'catalog'
+    cached_actions = ('list', 'retrieve', 'products')
+    surrogate_key_name = 'category'
 
     def get_permissions(self):
         """
@@ -46,13 +60,23 @@ class CategoryViewSet(viewsets.ModelViewSet):
             return Category.objects.filter(is_active=True)
         return Category.objects.all()
 
+    def get_surrogate_keys(self, request, response):
+        # Produtos da categoria: purgada junto com as demais listagens de produtos
+        if self.action == 'products':
+            return [self.cache_namespace, 'product-list']
+        return super().get_surrogate_keys(request, response)
+
     @action(detail=True, methods=['get'], url_path='products')
     def products(self, request, slug=None):
-        """Retorna produtos de uma categoria"""
+        """Retorna produtos de uma categoria (JSON em streaming, lotes com prefetch)"""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
         category = self.get_object()
-        products = category.products.filter(is_active=True)
-        serializer = ProductSerializer(products, many=True, context={'request': request})
-        return Response(serializer.data)
+        products = category.products.filter(is_active=True).with_details()
+        return StreamingJSONResponse(
+            iter_json_array(products, ProductSerializer, context={'request': request})
+        )
 
     @action(detail=True, methods=['post'], url_path='image')
     def upload_image(self, request, slug=None):
@@ -71,7 +95,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ReplicaReadMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para produtos
     GET /api/products/products/ - Lista todos os produtos (público)
@@ -79,19 +103,24 @@ class ProductViewSet(viewsets.ModelViewSet):
     GET /api/products/products/{slug}/ - Detalhes de um produto (público)
     PUT /api/products/products/{slug}/ - Atualiza produto (admin)
     DELETE /api/products/products/{slug}/ - Deleta produto (admin)
+    GET /api/products/products/{slug}/page/ - Produto, categoria, irmãos e anterior/próximo (público)
+    GET /api/products/products/{slug}/related/ - Produtos similares pré-calculados (público)
     POST /api/products/products/{slug}/variants/ - Cria variante (admin)
     POST /api/products/products/{slug}/sizes/ - Cria tamanho direto (admin)
     """
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     lookup_field = 'slug'
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [ORJSONParser, MultiPartParser, FormParser]
+    cache_namespace = 'catalog'
+    cached_actions = ('list', 'retrieve', 'by_category', 'page', 'related')
+    surrogate_key_name = 'product'
 
     def get_permissions(self):
         """
         Permite leitura pública, mas requer autenticação para escrita
         """
-        if self.action in ['list', 'retrieve', 'by_category']:
+        if self.action in ['list', 'retrieve', 'by_category', 'page', 'related']:
             return [AllowAny()]
         return [IsAuthenticated()]
 
@@ -111,340 +140,149 @@ class ProductViewSet(viewsets.ModelViewSet):
         if self.action == 'list' and not self.request.user.is_authenticated:
             queryset = queryset.filter(is_active=True)
         
-        return queryset.select_related('category').prefetch_related(
-            'variants__sizes',
-            'sizes'
-        )
+        return queryset.with_details()
+
+    def get_response_cache_key(self, request):
+        key = super().get_response_cache_key(request)
+        if key and self.action == 'related':
+            # Invalidada também pelas recomendações, sem mexer no namespace "catalog"
+            namespace = recommendations.CACHE_NAMESPACE
+            key = f'{key}:{namespace}:{get_version(namespace)}'
+        return key
+
+    def get_surrogate_keys(self, request, response):
+        keys = super().get_surrogate_keys(request, response)
+        # O detalhe traz nome/slug da categoria
+        if self.action == 'retrieve' and response.data.get('category'):
+            keys.append(f'category-{response.data["category"]}')
+        if self.action == 'page':
+            # Irmãos e anterior/próximo mudam com qualquer produto da categoria
+            product = response.data['product']
+            keys = [self.cache_namespace, f'product-{product["id"]}', f'category-{product["category"]}', 'product-list']
+        if self.action == 'related':
+            # Purgada quando as recomendações são recalculadas (apps/products/recommendations.py)
+            keys = [self.cache_namespace, recommendations.SURROGATE_KEY]
+        return keys
+
+    def _catalog(self, request):
+        """Índice em memória para leituras anônimas sem filtros (None = usar o banco)."""
+        if request.user.is_authenticated or request.query_params:
+            return None
+        return get_catalog()
+
+    def retrieve(self, request, *args, **kwargs):
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        catalog = self._catalog(request)
+        entry = catalog.products.get(kwargs.get('slug')) if catalog is not None else None
+        if entry is not None:
+            return Response(entry.payload(request))
+        # Produto inativo ou índice desligado: mesmo caminho de antes
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=False, methods=['get'], url_path='by-category/(?P<category_slug>[^/.]+)')
     def by_category(self, request, category_slug=None):
-        """Retorna produtos de uma categoria específica"""
+        """Retorna produtos de uma categoria específica (do índice em memória; sem ele, JSON em streaming)"""
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        catalog = self._catalog(request)
+        if catalog is not None:
+            if category_slug not in catalog.categories:
+                raise Http404
+            return Response([entry.payload(request) for entry in catalog.by_category[category_slug]])
         category = get_object_or_404(Category, slug=category_slug, is_active=True)
         products = self.get_queryset().filter(category=category, is_active=True)
-        serializer = self.get_serializer(products, many=True)
-        return Response(serializer.data)
-
-    @action(detail=True, methods=['post'], url_path='variants')
-    def create_variant(self, request, slug=None):
-        """Cria uma variante para o produto"""
-        from .models import ProductVariant
-        from .serializers import ProductVariantSerializer
-        
-        product = self.get_object()
-        
-        variant_data = {
-            'product': product.id,
-            'name': request.data.get('name'),
-            'description': request.data.get('description', ''),
-        }
-        
-        serializer = ProductVariantSerializer(data=variant_data, context={'request': request})
-        if serializer.is_valid():
-            variant = serializer.save()
-            
-            # Upload de imagem da variante se fornecido
-            if 'image' in request.FILES:
-                variant.image = request.FILES['image']
-                variant.save()
-            
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-    @action(detail=True, methods=['post'], url_path='sizes')
-    def create_size(self, request, slug=None):
-        """Cria um tamanho direto do produto (sem variante)"""
-        from .models import ProductSize
-        from .serializers import ProductSizeSerializer
-        
-        product = self.get_object()
-        
-        if 'image' not in request.FILES:
-            return Response(
-                {'error': 'Imagem é obrigatória'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        size_data = {
-            'product': product.id,
-            'variant': None,  # Tamanho direto do produto
-            'size_label': request.data.get('size_label'),
-            'image': request.FILES['image'],
-        }
-        
-        serializer = ProductSizeSerializer(data=size_data, context={'request': request})
-        if serializer.is_valid():
-            size = serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class ProductVariantViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para variantes de produtos
-    - GET /api/products/variants/            (lista todas as variantes)
-    - GET /api/products/variants/{id}/       (detalhe)
-    - POST /api/products/variants/           (cria variante)
-    - PUT/PATCH /api/products/variants/{id}/ (atualiza)
-    - DELETE /api/products/variants/{id}/    (remove)
-    - POST /api/products/variants/{id}/sizes/ (cria tamanho para a variante)
-    """
-
-    queryset = ProductVariant.objects.all()
-    serializer_class = ProductVariantSerializer
-    permission_classes = [IsAuthenticated]
-    lookup_field = 'id'
-
-    @action(detail=True, methods=['post'], url_path='sizes')
-    def create_size(self, request, id=None):
-        """Cria um tamanho para a variante"""
-        variant = self.get_object()
-
-        if 'image' not in request.FILES:
-            return Response(
-                {'error': 'Imagem é obrigatória'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        size_data = {
-            'product': None,  # Tamanho da variante, não do produto
-            'variant': variant.id,
-            'size_label': request.data.get('size_label'),
-            'image': request.FILES['image'],
-        }
-
-        serializer = ProductSizeSerializer(data=size_data, context={'request': request})
-        if serializer.is_valid():
-            size = serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class ProductSizeViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para tamanhos de produtos e variantes
-    - CRUD completo em /api/products/sizes/{id}/
-    """
-
-    queryset = ProductSize.objects.all()
-    serializer_class = ProductSizeSerializer
-    permission_classes = [IsAuthenticated]
-    lookup_field = 'id'
-
-
-
-class ProductViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para produtos
-    GET /api/products/products/ - Lista todos os produtos (público)
-    POST /api/products/products/ - Cria produto (admin)
-    GET /api/products/products/{slug}/ - Detalhes de um produto (público)
-    PUT /api/products/products/{slug}/ - Atualiza produto (admin)
-    DELETE /api/products/products/{slug}/ - Deleta produto (admin)
-    POST /api/products/products/{slug}/variants/ - Cria variante (admin)
-    POST /api/products/products/{slug}/sizes/ - Cria tamanho direto (admin)
-    """
-    queryset = Product.objects.all()
-    serializer_class = ProductSerializer
-    lookup_field = 'slug'
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+        return StreamingJSONResponse(
+            iter_json_array(products, self.get_serializer_class(), context=self.get_serializer_context())
+        )
 
-    def get_permissions(self):
-        """
-        Permite leitura pública, mas requer autenticação para escrita
+    @action(detail=True, methods=['get'], url_path='page')
+    def page(self, request, slug=None):
         """
-        if self.action in ['list', 'retrieve', 'by_category']:
-            return [AllowAny()]
-        return [IsAuthenticated()]
+        Tudo o que a página do produto mostra, numa requisição: produto,
+        breadcrumb da categoria, outros produtos da categoria (resumidos) e
+        anterior/próximo na ordem da listagem da categoria (título).
 
-    def get_queryset(self):
+        Do índice em memória, sem consultas; sem ele, no máximo 5 consultas
+        (produto com categoria, variantes, tamanhos das variantes, tamanhos
+        e a lista resumida da categoria), qualquer que seja o tamanho dela.
         """
-        Para listagem pública, mostra apenas produtos ativos
-        Para admins, mostra todos
-        """
-        queryset = super().get_queryset()
-        
-        # Filtrar por categoria se fornecido
-        category_slug = self.request.query_params.get('category', None)
-        if category_slug:
-            queryset = queryset.filter(category__slug=category_slug)
-        
-        # Para listagem pública, mostrar apenas ativos
-        if self.action == 'list' and not self.request.user.is_authenticated:
-            queryset = queryset.filter(is_active=True)
-        
-        return queryset.select_related('category').prefetch_related(
-            'variants__sizes',
-            'sizes'
-        )
-
-    @action(detail=False, methods=['get'], url_path='by-category/(?P<category_slug>[^/.]+)')
-    def by_category(self, request, category_slug=None):
-        """Retorna produtos de uma categoria específica"""
-        category = get_object_or_404(Category, slug=category_slug, is_active=True)
-        products = self.get_queryset().filter(category=category, is_active=True)
-        serializer = self.get_serializer(products, many=True)
-        return Response(serializer.data)
-
-    @action(detail=True, methods=['post'], url_path='variants')
-    def create_variant(self, request, slug=None):
-        """Cria uma variante para o produto"""
-        from .models import ProductVariant
-        from .serializers import ProductVariantSerializer
-        
-        product = self.get_object()
-        
-        variant_data = {
-            'product': product.id,
-            'name': request.data.get('name'),
-            'description': request.data.get('description', ''),
-        }
-        
-        serializer = ProductVariantSerializer(data=variant_data, context={'request': request})
-        if serializer.is_valid():
-            variant = serializer.save()
-            
-            # Upload de imagem da variante se fornecido
-            if 'image' in request.FILES:
-                variant.image = request.FILES['image']
-                variant.save()
-            
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-    @action(detail=True, methods=['post'], url_path='sizes')
-    def create_size(self, request, slug=None):
-        """Cria um tamanho direto do produto (sem variante)"""
-        from .models import ProductSize
-        from .serializers import ProductSizeSerializer
-        
-        product = self.get_object()
-        
-        if 'image' not in request.FILES:
-            return Response(
-                {'error': 'Imagem é obrigatória'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        size_data = {
-            'product': product.id,
-            'variant': None,  # Tamanho direto do produto
-            'size_label': request.data.get('size_label'),
-            'image': request.FILES['image'],
-        }
-        
-        serializer = ProductSizeSerializer(data=size_data, context={'request': request})
-        if serializer.is_valid():
-            size = serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class ProductVariantViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para variantes de produtos
-    - GET /api/products/variants/            (lista todas as variantes)
-    - GET /api/products/variants/{id}/       (detalhe)
-    - POST /api/products/variants/           (cria variante)
-    - PUT/PATCH /api/products/variants/{id}/ (atualiza)
-    - DELETE /api/products/variants/{id}/    (remove)
-    - POST /api/products/variants/{id}/sizes/ (cria tamanho para a variante)
-    """
-
-    queryset = ProductVariant.objects.all()
-    serializer_class = ProductVariantSerializer
-    permission_classes = [IsAuthenticated]
-    lookup_field = 'id'
-
-    @action(detail=True, methods=['post'], url_path='sizes')
-    def create_size(self, request, id=None):
-        """Cria um tamanho para a variante"""
-        variant = self.get_object()
-
-        if 'image' not in request.FILES:
-            return Response(
-                {'error': 'Imagem é obrigatória'},
-                status=status.HTTP_400_BAD_REQUEST,
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        catalog = self._catalog(request)
+        entry = catalog.products.get(slug) if catalog is not None else None
+        if entry is not None and entry.category_slug in catalog.categories:
+            product, data = entry.product, entry.payload(request)
+            siblings = [item.product for item in catalog.by_category[entry.category_slug]]
+        else:
+            # Índice desligado, produto inativo (admins) ou categoria inativa
+            product = self.get_object()
+            data = self.get_serializer(product).data
+            siblings = list(
+                Product.objects.filter(category_id=product.category_id, is_active=True)
+                .order_by('title')
+                .only('id', 'title', 'slug', 'image', 'category_id')
             )
-
-        size_data = {
-            'product': None,  # Tamanho da variante, não do produto
-            'variant': variant.id,
-            'size_label': request.data.get('size_label'),
-            'image': request.FILES['image'],
+        return Response({
+            'product': data,
+            'category': {'id': product.category.id, 'name': product.category.name, 'slug': product.category.slug},
+            'breadcrumb': [
+                {'name': 'Produtos', 'path': '/produtos'},
+                {'name': product.category.name, 'path': f'/produtos/{product.category.slug}'},
+                {'name': product.title, 'path': f'/produtos/{product.category.slug}/{product.slug}'},
+            ],
+            **self._neighbours(product, siblings),
+        })
+
+    def _neighbours(self, product, siblings):
+        """Irmãos (os seguintes na listagem, dando a volta) e anterior/próximo."""
+        position = next((index for index, item in enumerate(siblings) if item.pk == product.pk), None)
+        if position is None:
+            # Produto inativo: fora da listagem da categoria
+            others, previous, following = siblings, None, None
+        else:
+            others = siblings[position + 1:] + siblings[:position]
+            previous = siblings[position - 1] if position > 0 else None
+            following = siblings[position + 1] if position + 1 < len(siblings) else None
+        context = self.get_serializer_context()
+        return {
+            'siblings': ProductSummarySerializer(others[:settings.PRODUCT_PAGE_SIBLINGS], many=True, context=context).data,
+            'previous': ProductSummarySerializer(previous, context=context).data if previous else None,
+            'next': ProductSummarySerializer(following, context=context).data if following else None,
         }
 
-        serializer = ProductSizeSerializer(data=size_data, context={'request': request})
-        if serializer.is_valid():
-            size = serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class ProductSizeViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para tamanhos de produtos e variantes
-    - CRUD completo em /api/products/sizes/{id}/
-    """
-
-    queryset = ProductSize.objects.all()
-    serializer_class = ProductSizeSerializer
-    permission_classes = [IsAuthenticated]
-    lookup_field = 'id'
-
-
-
-class ProductViewSet(viewsets.ModelViewSet):
-    """
-    ViewSet para produtos
-    GET /api/products/products/ - Lista todos os produtos (público)
-    POST /api/products/products/ - Cria produto (admin)
-    GET /api/products/products/{slug}/ - Detalhes de um produto (público)
-    PUT /api/products/products/{slug}/ - Atualiza produto (admin)
-    DELETE /api/products/products/{slug}/ - Deleta produto (admin)
-    POST /api/products/products/{slug}/variants/ - Cria variante (admin)
-    POST /api/products/products/{slug}/sizes/ - Cria tamanho direto (admin)
-    """
-    queryset = Product.objects.all()
-    serializer_class = ProductSerializer
-    lookup_field = 'slug'
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
-
-    def get_permissions(self):
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, slug=None):
         """
-        Permite leitura pública, mas requer autenticação para escrita
+        Produtos similares (categoria, normas, aplicações e especificações),
+        pré-calculados em ProductSimilarity: uma consulta pelo índice
+        (product_id, rank), sem comparar produtos na requisição.
         """
-        if self.action in ['list', 'retrieve', 'by_category']:
-            return [AllowAny()]
-        return [IsAuthenticated()]
-
-    def get_queryset(self):
-        """
-        Para listagem pública, mostra apenas produtos ativos
-        Para admins, mostra todos
-        """
-        queryset = super().get_queryset()
-        
-        # Filtrar por categoria se fornecido
-        category_slug = self.request.query_params.get('category', None)
-        if category_slug:
-            queryset = queryset.filter(category__slug=category_slug)
-        
-        # Para listagem pública, mostrar apenas ativos
-        if self.action == 'list' and not self.request.user.is_authenticated:
-            queryset = queryset.filter(is_active=True)
-        
-        return queryset.select_related('category').prefetch_related(
-            'variants__sizes',
-            'sizes'
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        related = list(
+            Product.objects.filter(
+                similar_of__product__slug=slug, similar_of__product__is_active=True, is_active=True,
+            )
+            .select_related('category')
+            .annotate(score=F('similar_of__score'))
+            .order_by('similar_of__rank')
+            .only('id', 'title', 'slug', 'image', 'category__slug')
         )
-
-    @action(detail=False, methods=['get'], url_path='by-category/(?P<category_slug>[^/.]+)')
-    def by_category(self, request, category_slug=None):
-        """Retorna produtos de uma categoria específica"""
-        category = get_object_or_404(Category, slug=category_slug, is_active=True)
-        products = self.get_queryset().filter(category=category, is_active=True)
-        serializer = self.get_serializer(products, many=True)
-        return Response(serializer.data)
+        if not related:
+            # Lista vazia ou produto inexistente (só aqui a consulta extra)
+            catalog = self._catalog(request)
+            exists = (
+                slug in catalog.products if catalog is not None
+                else Product.objects.filter(slug=slug, is_active=True).exists()
+            )
+            if not exists:
+                raise Http404
+        return Response(RelatedProductSerializer(related, many=True, context=self.get_serializer_context()).data)
 
     @action(detail=True, methods=['post'], url_path='variants')
     def create_variant(self, request, slug=None):
@@ -551,4 +389,3 @@ class ProductSizeViewSet(viewsets.ModelViewSet):
     serializer_class = ProductSizeSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
-
@@ -0,0 +1,11 @@
+"""
+URLs do admin carregadas sob demanda (DEFER_ADMIN_IMPORTS).
+
+Importado pelo resolver de /admin/ na primeira requisição (ou no primeiro
+reverse()), quando então os admin.py dos apps são descobertos.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
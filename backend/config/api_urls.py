@@ -0,0 +1,24 @@
+"""
+URLs públicas (API, sitemap, feeds do blog, snapshots para crawlers e mídia), sem o admin.
+
+ROOT_URLCONF do perfil config.settings.api; config/urls.py acrescenta o
+admin a estas.
+"""
+from django.conf import settings
+from django.urls import path, re_path, include
+from config.views import atom_view, media_view, prerender_view, rss_view, sitemap_view
+
+urlpatterns = [
+    path("sitemap.xml", sitemap_view),
+    path("rss.xml", rss_view),
+    path("atom.xml", atom_view),
+    # Caminhos das páginas do React (sem barra final); só slugs, nada de "." ou "/" extras
+    re_path(r"^prerender/(?P<path>produtos/[-\w]+(?:/[-\w]+)?|blog/[-\w]+)/?$", prerender_view),
+    path("api/", include("api.urls")),
+    path("api/products/", include("apps.products.urls")),
+    path("api/blog/", include("apps.blog.urls")),
+]
+
+# Mídia servida pelo Django (com Cache-Control imutável) quando não há nginx/CDN na frente
+if settings.SERVE_MEDIA:
+    urlpatterns.append(re_path(r"^media/(?P<path>.*)$", media_view))
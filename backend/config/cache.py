@@ -0,0 +1,198 @@
+"""
+Cache de respostas da API pública.
+
+Cada namespace (ex: "catalog") tem um número de versão no cache
+compartilhado; as chaves das respostas incluem a versão, então
+``bump_version`` (chamado pelos signals dos models) invalida todas as
+respostas do namespace de uma vez, sem precisar apagar chave por chave.
+
+Só são cacheadas requisições GET/HEAD anônimas das actions listadas em
+``cached_actions`` do ViewSet. As mesmas respostas saem com cabeçalhos
+para o CDN/navegador (``Cache-Control`` público com s-maxage e
+stale-while-revalidate, ``Surrogate-Key``/``Cache-Tag`` para purga por
+tag, ver config/purge.py); as de usuários autenticados, com ``private``.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from api import metrics
+from config.db_router import pin_primary
+
+# Backends que guardam os dados no próprio processo: cada worker vê os seus
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared(alias='default'):
+    """True se todos os processos enxergam o mesmo cache (Redis, Memcached, banco)."""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def get_version(namespace):
+    """Versão atual do namespace (inicializada com o timestamp se ausente)."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Timestamp evita reaproveitar versões antigas se o cache for esvaziado
+        cache.add(key, int(time.time()), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_version(namespace):
+    """Invalida todas as respostas cacheadas do namespace."""
+    key = _version_key(namespace)
+    # A nova versão é preenchida a partir do primário, não de uma réplica atrasada
+    pin_primary()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time())
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def store_response(key, content, content_type, timeout=None, surrogate_keys=()):
+    cache.set(
+        key,
+        {'content': content, 'content_type': content_type, 'surrogate_keys': list(surrogate_keys)},
+        timeout if timeout is not None else settings.API_CACHE_TIMEOUT,
+    )
+
+
+def set_cdn_headers(response, surrogate_keys):
+    """Resposta pública: cacheável pelo CDN (purgável pelas tags) e, por pouco tempo, pelo navegador."""
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.CDN_BROWSER_MAX_AGE,
+        s_maxage=settings.CDN_S_MAXAGE,
+        stale_while_revalidate=settings.CDN_STALE_WHILE_REVALIDATE,
+        stale_if_error=settings.CDN_STALE_IF_ERROR,
+    )
+    # Com token a resposta é outra (rascunhos, itens inativos)
+    patch_vary_headers(response, ('Accept-Encoding', 'Authorization'))
+    response['Surrogate-Key'] = ' '.join(surrogate_keys)
+    response['Cache-Tag'] = ','.join(surrogate_keys)
+
+
+class CachedResponseMixin:
+    """
+    Mixin para ViewSets: serve do cache as respostas anônimas das
+    ``cached_actions`` e grava as respostas 200 após a renderização.
+    Actions customizadas devem começar com::
+
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+    """
+    cache_namespace = None
+    cached_actions = ('list', 'retrieve')
+    # Prefixo das tags do CDN (ex: "product" -> product-<id>, product-list)
+    surrogate_key_name = None
+
+    def get_response_cache_key(self, request):
+        if request.method not in ('GET', 'HEAD') or self.action not in self.cached_actions:
+            return None
+        if request.user.is_authenticated:
+            return None
+        # Host/esquema entram na chave: os payloads têm URLs absolutas
+        url = request.build_absolute_uri()
+        digest = hashlib.md5(url.encode()).hexdigest()
+        return f'response:{self.cache_namespace}:{get_version(self.cache_namespace)}:{digest}'
+
+    def get_cached_response(self, request):
+        """Resposta cacheada para a requisição, ou None (resultado memorizado)."""
+        if not hasattr(request, '_cached_response'):
+            key = self.get_response_cache_key(request)
+            entry = cache.get(key) if key else None
+            request._response_cache_key = key
+            request._cached_response = None
+            if entry is not None:
+                response = HttpResponse(entry['content'], content_type=entry['content_type'])
+                response['X-Cache'] = 'HIT'
+                set_cdn_headers(response, entry.get('surrogate_keys') or [self.cache_namespace])
+                # Usada pelo CompressionMiddleware para cachear a variante comprimida
+                response.cache_key = key
+                request._cached_response = response
+            if key:
+                metrics.incr('response_cache_hit' if entry is not None else 'response_cache_miss')
+        return request._cached_response
+
+    def list(self, request, *args, **kwargs):
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        cached = self.get_cached_response(request)
+        if cached is not None:
+            return cached
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_surrogate_keys(self, request, response):
+        """Tags do CDN: o namespace e o objeto (retrieve) ou a listagem do modelo."""
+        data = getattr(response, 'data', None)
+        if self.action == 'retrieve' and isinstance(data, dict) and 'id' in data:
+            return [self.cache_namespace, f'{self.surrogate_key_name}-{data["id"]}']
+        return [self.cache_namespace, f'{self.surrogate_key_name}-list']
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(request, '_response_cache_key', None)
+        if not key:
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True, no_store=True)
+            return response
+        if request._cached_response is not None or response.status_code != 200:
+            return response
+
+        response['X-Cache'] = 'MISS'
+        surrogate_keys = self.get_surrogate_keys(request, response)
+        set_cdn_headers(response, surrogate_keys)
+        # Response do DRF (via SimpleTemplateResponse: importar o DRF aqui
+        # o carregaria no setup de todo processo, inclusive migrate/collectstatic)
+        if isinstance(response, SimpleTemplateResponse):
+            response.cache_key = key
+            response.add_post_render_callback(
+                lambda rendered: store_response(
+                    key, rendered.content, rendered['Content-Type'], surrogate_keys=surrogate_keys
+                )
+            )
+        elif response.streaming:
+            response.streaming_content = self._tee_streaming(key, response, surrogate_keys)
+        return response
+
+    @staticmethod
+    def _tee_streaming(key, response, surrogate_keys):
+        """Repassa os chunks e grava no cache ao final, se couber em API_CACHE_MAX_BYTES."""
+        content_type = response['Content-Type']
+        source = response.streaming_content
+
+        def stream():
+            chunks, size = [], 0
+            for chunk in source:
+                if chunks is not None:
+                    size += len(chunk)
+                    if size <= settings.API_CACHE_MAX_BYTES:
+                        chunks.append(chunk)
+                    else:
+                        chunks = None
+                yield chunk
+            if chunks is not None:
+                store_response(key, b''.join(chunks), content_type, surrogate_keys=surrogate_keys)
+
+        return stream()
@@ -0,0 +1,110 @@
+"""
+Leituras públicas em réplicas do banco (DATABASE_REPLICAS).
+
+Só vão para uma réplica as requisições GET/HEAD/OPTIONS anônimas dos
+ViewSets com ``ReplicaReadMixin`` (catálogo e blog); escritas, usuários
+autenticados, o admin e as demais views usam sempre o ``default``. A
+decisão é tomada por requisição (após a autenticação do DRF) e guardada
+numa ContextVar, lida pelo ``ReadReplicaRouter``; uma réplica é sorteada
+por requisição, para que todas as consultas dela vejam o mesmo estado.
+
+Leia-suas-escritas:
+- após uma escrita autenticada bem-sucedida, o cliente recebe o cookie
+  REPLICA_STICKY_COOKIE e suas leituras ficam no primário por
+  DATABASE_REPLICA_STICKY_SECONDS;
+- ``pin_primary`` (chamado por ``bump_version`` a cada alteração do
+  catálogo/blog) manda todas as leituras ao primário pela mesma janela,
+  para que o cache de respostas e o índice do catálogo da nova versão não
+  sejam preenchidos com dados de uma réplica atrasada. Com LocMemCache (sem
+  REDIS_URL) isso vale só no worker que recebeu a escrita.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+
+from api import metrics
+
+REPLICA_STICKY_COOKIE = 'nx_primary'
+PIN_KEY = 'db:primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def _reset(**kwargs):
+    # Threads do gunicorn atendem várias requisições: cada uma começa no
+    # primário, e o código que roda depois dela (ex: o prewarm do
+    # publish_scheduled) também. request_finished só dispara ao fechar a
+    # resposta, depois do streaming.
+    _read_alias.set(None)
+
+
+request_started.connect(_reset, dispatch_uid='db_router_reset_started')
+request_finished.connect(_reset, dispatch_uid='db_router_reset_finished')
+
+
+def pin_primary():
+    """Leituras de todos os clientes no primário pela janela de replicação."""
+    if settings.DATABASE_REPLICAS:
+        window = settings.DATABASE_REPLICA_STICKY_SECONDS
+        cache.set(PIN_KEY, time.time() + window, window)
+
+
+def use_replica(request):
+    """Marca a requisição atual para ler de uma réplica, se ela puder."""
+    if (
+        not settings.DATABASE_REPLICAS
+        or request.method not in SAFE_METHODS
+        or request.user.is_authenticated
+        or REPLICA_STICKY_COOKIE in request.COOKIES
+        or (cache.get(PIN_KEY) or 0) > time.time()
+    ):
+        _read_alias.set(None)
+        return None
+    alias = random.choice(settings.DATABASE_REPLICAS)
+    _read_alias.set(alias)
+    metrics.incr('db_replica_reads')
+    return alias
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas têm os mesmos dados do primário
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Réplicas recebem o schema por replicação (ou sync_sqlite_replica)
+        return db == 'default'
+
+
+class ReplicaReadMixin:
+    """ViewSets cujas leituras anônimas podem ir para uma réplica."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and response.status_code < 400
+            and request.method not in SAFE_METHODS
+            and request.user.is_authenticated
+        ):
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
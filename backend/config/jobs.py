@@ -0,0 +1,112 @@
+"""
+Fila das tarefas pós-commit: purga do CDN, snapshots HTML e recomendações.
+
+Nenhuma delas roda na requisição que salvou: ``enqueue`` grava as chaves
+em DeferredJob (api/models.py) na mesma transação da alteração (se ela
+for desfeita, as tarefas somem junto) e o comando ``run_jobs`` (worker
+em loop ou cron a cada minuto) as executa em lote. Chaves repetidas
+viram uma linha só (índice único kind + key): vinte saves seguidos do
+mesmo produto geram uma única atualização.
+
+Tipos, na ordem em que ``run_pending`` os executa (recomendações e
+snapshots agendam purgas, que saem na mesma rodada):
+
+    recommendations   <id do produto>                  apps/products/recommendations.py
+    prerender         build:<tipo>:<pk>, remove:<0|1>:<caminho>
+                                                       config/prerender.py
+    purge             <tag do CDN>                     config/purge.py
+
+Com JOBS_EAGER=True (desenvolvimento, sem worker) as tarefas rodam logo
+após o commit, no processo da requisição. Uma tarefa que falha volta à
+fila (até MAX_ATTEMPTS tentativas, depois é descartada com log).
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {
+    'recommendations': 'apps.products.recommendations.run',
+    'prerender': 'config.prerender.run',
+    'purge': 'config.purge.run',
+}
+MAX_ATTEMPTS = 5
+BATCH_SIZE = 500
+
+_pending = threading.local()
+
+
+def enqueue(kind, keys):
+    """Agenda as chaves do tipo ``kind`` (gravadas na transação atual)."""
+    keys = sorted({str(key) for key in keys})
+    if not keys:
+        return
+    if settings.JOBS_EAGER:
+        pending = getattr(_pending, 'jobs', None)
+        if pending is None:
+            pending = _pending.jobs = {}
+        pending.setdefault(kind, set()).update(keys)
+        # Um callback por chamada; o primeiro a rodar leva todas as chaves pendentes
+        transaction.on_commit(_flush)
+        return
+
+    from api.models import DeferredJob
+
+    DeferredJob.objects.bulk_create([DeferredJob(kind=kind, key=key) for key in keys], ignore_conflicts=True)
+
+
+def _flush():
+    jobs = getattr(_pending, 'jobs', None)
+    if not jobs:
+        return
+    _pending.jobs = None
+    for kind in HANDLERS:
+        if kind in jobs:
+            _run(kind, sorted(jobs[kind]))
+
+
+def _run(kind, keys):
+    try:
+        import_string(HANDLERS[kind])(keys)
+    except Exception:
+        logger.exception('Falha na tarefa %s: %s', kind, ' '.join(keys))
+        return False
+    return True
+
+
+def run_pending(kinds=None, batch_size=BATCH_SIZE):
+    """Executa as tarefas da fila; devolve {tipo: quantidade de chaves executadas}."""
+    from api.models import DeferredJob
+
+    done = {}
+    for kind in kinds or HANDLERS:
+        while True:
+            # Retira o lote da fila antes de executar: uma alteração feita
+            # durante a execução grava uma linha nova e roda na próxima vez
+            with transaction.atomic():
+                jobs = list(
+                    DeferredJob.objects.select_for_update(skip_locked=True)
+                    .filter(kind=kind)
+                    .order_by('id')[:batch_size]
+                )
+                DeferredJob.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+            if not jobs:
+                break
+            keys = [job.key for job in jobs]
+            if not _run(kind, keys):
+                retry = [job for job in jobs if job.attempts + 1 < MAX_ATTEMPTS]
+                if len(retry) < len(jobs):
+                    logger.error('Tarefas %s descartadas após %d tentativas', kind, MAX_ATTEMPTS)
+                DeferredJob.objects.bulk_create(
+                    [DeferredJob(kind=kind, key=job.key, attempts=job.attempts + 1) for job in retry],
+                    ignore_conflicts=True,
+                )
+                break
+            done[kind] = done.get(kind, 0) + len(keys)
+            if len(jobs) < batch_size:
+                break
+    return done
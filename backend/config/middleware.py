@@ -0,0 +1,145 @@
+"""
+Compressão das respostas da API (brotli ou gzip).
+
+O GZipMiddleware do Django não serve aqui: não fala brotli e comprime a
+mesma resposta a cada requisição. Este middleware:
+
+- negocia ``br`` (se o pacote ``brotli`` estiver instalado) ou ``gzip``
+  pelo Accept-Encoding, respeitando q=0;
+- comprime apenas GET/HEAD de tipos em COMPRESSION_CONTENT_TYPES (JSON/XML),
+  o que mantém fora respostas de login com tokens (mitigação do BREACH);
+- para respostas vindas do cache de respostas (``response.cache_key``,
+  ver config/cache.py), guarda os bytes comprimidos em
+  ``<cache_key>:<encoding>``: respostas quentes são comprimidas uma vez,
+  não a cada acerto. A chave leva a versão do namespace, então a
+  invalidação vale também para as variantes comprimidas;
+- respostas em streaming são comprimidas em fluxo.
+"""
+import gzip
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+# Níveis por caminho: em fluxo prioriza latência; a variante cacheada é
+# comprimida uma única vez, então vale o nível mais alto
+GZIP_LEVEL = 6
+GZIP_CACHED_LEVEL = 9
+BROTLI_QUALITY = 5
+BROTLI_CACHED_QUALITY = 9
+
+
+def parse_accept_encoding(header):
+    """{codificação: q} do header Accept-Encoding."""
+    encodings = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+def choose_encoding(header):
+    """'br', 'gzip' ou None, conforme o cliente aceita e o servidor suporta."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, cached=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_CACHED_QUALITY if cached else BROTLI_QUALITY)
+    # mtime=0: mesmo conteúdo gera os mesmos bytes (ETag/cache estáveis)
+    return gzip.compress(data, compresslevel=GZIP_CACHED_LEVEL if cached else GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    # wbits 16 + MAX_WBITS: formato gzip (cabeçalho e CRC)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        encoding = self.negotiate(request, response)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = self.compress_body(response, encoding)
+            if compressed is None:
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def negotiate(self, request, response):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+            return None
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.has_header('Content-Encoding') or response.status_code != 200:
+            return None
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return None
+        return choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+
+    def compress_body(self, response, encoding):
+        """Bytes comprimidos (do cache quando a resposta é cacheável) ou None se não compensar."""
+        cache_key = getattr(response, 'cache_key', None)
+        if cache_key:
+            variant_key = f'{cache_key}:{encoding}'
+            compressed = cache.get(variant_key)
+            if compressed is None:
+                compressed = compress(response.content, encoding, cached=True)
+                cache.set(variant_key, compressed, settings.API_CACHE_TIMEOUT)
+        else:
+            compressed = compress(response.content, encoding)
+        return compressed if len(compressed) < len(response.content) else None
@@ -0,0 +1,293 @@
+"""
+Snapshots HTML pré-renderizados das páginas de categoria, produto e post.
+
+O site é uma SPA React: crawlers precisam executar o JS (e chamar a API)
+para ver o conteúdo. Aqui cada página pública vira um HTML estático com
+os dados dos mesmos serializers da API (título, descrição, imagens,
+canonical, Open Graph e JSON-LD), gravado em PRERENDER_ROOT:
+
+    /produtos/<categoria>             produtos/<categoria>.html
+    /produtos/<categoria>/<produto>   produtos/<categoria>/<produto>.html
+    /blog/<slug>                      blog/<slug>.html
+
+Os signals dos models chamam ``schedule``/``schedule_remove`` com as
+páginas afetadas; o worker da fila (config/jobs.py) regera só elas (ou as
+remove, se o registro saiu do ar), fora da requisição, e purga do CDN a
+tag ``page:<caminho>`` de cada uma. O
+comando ``prerender_pages`` regera tudo e apaga snapshots órfãos. O nginx
+encaminha os bots para ``/prerender/<caminho>`` (docker/nginx.conf).
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from apps.blog.models import Post
+from apps.blog.serializers import PostSerializer
+from apps.products.models import Category, Product
+from apps.products.serializers import CategorySerializer, ProductSerializer
+from config import jobs
+from config.purge import schedule_purge
+from config.sitemaps import site_url
+
+logger = logging.getLogger(__name__)
+
+SITE_NAME = 'Nexus Válvulas'
+# Tamanho da meta description
+DESCRIPTION_CHARS = 160
+
+
+def category_path(slug):
+    return f'produtos/{slug}'
+
+
+def product_path(category_slug, slug):
+    return f'produtos/{category_slug}/{slug}'
+
+
+def post_path(slug):
+    return f'blog/{slug}'
+
+
+def page_tag(path):
+    """Tag do CDN do snapshot (ver config/purge.py)."""
+    return f'page:{path}'
+
+
+def snapshot_file(path):
+    return Path(settings.PRERENDER_ROOT) / f'{path}.html'
+
+
+# --- Renderização -----------------------------------------------------------
+
+def _json_ld(data):
+    # Mesmo escape do json_script: o JSON não fecha o <script>
+    text = json.dumps(data, ensure_ascii=False)
+    return mark_safe(text.replace('<', '\\u003C').replace('>', '\\u003E').replace('&', '\\u0026'))
+
+
+def _absolute(url):
+    # Serializers sem request devolvem /media/...; MEDIA_CDN_URL já vem absoluta
+    return site_url(url) if url else url
+
+
+def _render(template, path, title, description, image, json_ld, **context):
+    return render_to_string(template, {
+        'site_name': SITE_NAME,
+        'site_url': site_url('/'),
+        'canonical': site_url(f'/{path}'),
+        'title': title,
+        'description': Truncator(description or '').chars(DESCRIPTION_CHARS),
+        'image': image,
+        'json_ld': _json_ld(json_ld),
+        **context,
+    })
+
+
+def render_category(category, products):
+    data = CategorySerializer(category).data
+    data['image_url'] = _absolute(data['image_url'])
+    items = [
+        {
+            'title': product.title,
+            'url': site_url(f'/{product_path(category.slug, product.slug)}'),
+            'image_url': _absolute(product.image.url) if product.image else None,
+            'description': product.description,
+        }
+        for product in products
+    ]
+    path = category_path(category.slug)
+    json_ld = {
+        '@context': 'https://schema.org',
+        '@type': 'CollectionPage',
+        'name': category.name,
+        'url': site_url(f'/{path}'),
+        'mainEntity': {
+            '@type': 'ItemList',
+            'itemListElement': [
+                {'@type': 'ListItem', 'position': position, 'url': item['url'], 'name': item['title']}
+                for position, item in enumerate(items, 1)
+            ],
+        },
+    }
+    return _render(
+        'prerender/category.html', path, f'{category.name} | {SITE_NAME}', category.description,
+        data['image_url'], json_ld, category=data, products=items,
+    )
+
+
+def render_product(product):
+    """``product`` com ``with_details()`` (mesmas consultas do ProductViewSet)."""
+    data = ProductSerializer(product).data
+    data['image_url'] = _absolute(data['image_url'])
+    data['sizes'] = {label: _absolute(url) for label, url in data['sizes'].items()}
+    for variant in data['variants']:
+        variant['image_url'] = _absolute(variant['image_url'])
+        variant['sizes'] = {label: _absolute(url) for label, url in variant['sizes'].items()}
+    path = product_path(product.category.slug, product.slug)
+    category_url = site_url(f'/{category_path(product.category.slug)}')
+    json_ld = [
+        {
+            '@context': 'https://schema.org',
+            '@type': 'Product',
+            'name': product.title,
+            'description': product.description,
+            'image': [data['image_url']] if data['image_url'] else [],
+            'category': product.category.name,
+            'brand': {'@type': 'Brand', 'name': SITE_NAME},
+            'url': site_url(f'/{path}'),
+        },
+        {
+            '@context': 'https://schema.org',
+            '@type': 'BreadcrumbList',
+            'itemListElement': [
+                {'@type': 'ListItem', 'position': 1, 'name': 'Produtos', 'item': site_url('/produtos')},
+                {'@type': 'ListItem', 'position': 2, 'name': product.category.name, 'item': category_url},
+                {'@type': 'ListItem', 'position': 3, 'name': product.title},
+            ],
+        },
+    ]
+    return _render(
+        'prerender/product.html', path, f'{product.title} | {SITE_NAME}', product.description,
+        data['image_url'], json_ld, product=data, category_url=category_url,
+    )
+
+
+def render_post(post):
+    data = PostSerializer(post).data
+    data['cover_image_url'] = _absolute(data['cover_image_url'])
+    path = post_path(post.slug)
+    json_ld = {
+        '@context': 'https://schema.org',
+        '@type': 'BlogPosting',
+        'headline': post.title,
+        'description': post.meta_description or post.excerpt,
+        'image': [data['cover_image_url']] if data['cover_image_url'] else [],
+        'datePublished': data['published_at'],
+        'dateModified': data['updated_at'],
+        'author': {'@type': 'Organization', 'name': SITE_NAME},
+        'url': site_url(f'/{path}'),
+    }
+    return _render(
+        'prerender/post.html', path, f'{post.meta_title or post.title} | {SITE_NAME}',
+        post.meta_description or post.excerpt, data['cover_image_url'], json_ld, post=data,
+    )
+
+
+# --- Arquivos ---------------------------------------------------------------
+
+def write_snapshot(path, html):
+    """Grava num temporário e troca atomicamente (um bot nunca lê HTML pela metade)."""
+    target = snapshot_file(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            out.write(html)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def remove_snapshot(path, tree=False):
+    """Remove o snapshot (e, com ``tree``, o diretório com as páginas abaixo dele)."""
+    snapshot_file(path).unlink(missing_ok=True)
+    if tree:
+        shutil.rmtree(Path(settings.PRERENDER_ROOT) / path, ignore_errors=True)
+
+
+def public_products():
+    return Product.objects.filter(is_active=True, category__is_active=True)
+
+
+def public_category_products(category):
+    return category.products.filter(is_active=True).only('title', 'slug', 'description', 'image', 'category_id')
+
+
+def build_category(pk):
+    """Regera (ou remove, se inativa) a página da categoria; devolve o caminho tocado."""
+    category = Category.objects.filter(pk=pk).first()
+    if category is None:
+        return None
+    path = category_path(category.slug)
+    if category.is_active:
+        write_snapshot(path, render_category(category, public_category_products(category)))
+    else:
+        remove_snapshot(path)
+    return path
+
+
+def build_product(pk):
+    product = Product.objects.filter(pk=pk).with_details().first()
+    if product is None:
+        return None
+    path = product_path(product.category.slug, product.slug)
+    if product.is_active and product.category.is_active:
+        write_snapshot(path, render_product(product))
+    else:
+        remove_snapshot(path)
+    return path
+
+
+def build_post(pk):
+    post = Post.objects.filter(pk=pk).select_related('category', 'author').first()
+    if post is None:
+        return None
+    path = post_path(post.slug)
+    if Post.objects.published().filter(pk=pk).exists():
+        write_snapshot(path, render_post(post))
+    else:
+        # Rascunho ou agendado: publish_scheduled agenda a geração na publicação
+        remove_snapshot(path)
+    return path
+
+
+BUILDERS = {'category': build_category, 'product': build_product, 'post': build_post}
+
+
+# --- Regeração incremental --------------------------------------------------
+
+def schedule(kind, pk):
+    """Regera a página do registro ("category", "product" ou "post") após o commit."""
+    if settings.PRERENDER_ENABLED and pk is not None:
+        jobs.enqueue('prerender', [f'build:{kind}:{pk}'])
+
+
+def schedule_remove(path, tree=False):
+    """Remove o snapshot do caminho (URL antiga ou registro apagado) após o commit."""
+    if settings.PRERENDER_ENABLED:
+        jobs.enqueue('prerender', [f'remove:{int(tree)}:{path}'])
+
+
+def run(keys):
+    """Tarefa da fila: remoções primeiro, depois as regerações; purga as páginas tocadas."""
+    removes, builds = [], []
+    for key in keys:
+        action, arg, value = key.split(':', 2)
+        if action == 'remove':
+            removes.append((value, arg == '1'))
+        else:
+            builds.append((arg, int(value)))
+    touched = set()
+    for path, tree in sorted(removes):
+        remove_snapshot(path, tree)
+        touched.add(path)
+    for kind, pk in sorted(builds):
+        try:
+            path = BUILDERS[kind](pk)
+        except Exception:
+            # Uma página com erro não impede as demais (nem volta à fila)
+            logger.exception('Falha ao pré-renderizar %s %s', kind, pk)
+            continue
+        if path:
+            touched.add(path)
+    if touched:
+        schedule_purge([page_tag(path) for path in touched])
@@ -0,0 +1,90 @@
+"""
+Purga do CDN por surrogate keys (tags).
+
+As respostas públicas da API saem com ``Surrogate-Key`` (Fastly/Varnish)
+e ``Cache-Tag`` (Cloudflare) montadas por ``CachedResponseMixin``:
+
+    catalog / blog            namespace inteiro
+    product-<id>              detalhe do produto
+    category-<id>             detalhe da categoria e produtos dela
+    post-<id>                 detalhe do post
+    product-list, category-list, post-list
+                              listagens, buscas e ações de coleção
+
+Os signals dos models chamam ``schedule_purge`` com as tags afetadas; as
+tags vão para a fila de config/jobs.py e o worker (``run_jobs``) as envia
+em lote ao purger de CDN_PURGER, fora da requisição: a escrita não espera
+a API do CDN. Uma purga que falha volta à fila (e, até sair, as respostas
+expiram por s-maxage).
+"""
+import functools
+import json
+import logging
+from collections import deque
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from config import jobs
+
+logger = logging.getLogger(__name__)
+
+
+class BasePurger:
+    def purge(self, keys):
+        raise NotImplementedError
+
+
+class LoggingPurger(BasePurger):
+    """Sem CDN (desenvolvimento/testes): registra as purgas no log e em ``history``."""
+
+    def __init__(self):
+        self.history = deque(maxlen=100)
+
+    def purge(self, keys):
+        self.history.append(tuple(keys))
+        logger.info('purge: %s', ' '.join(keys))
+
+
+class CloudflarePurger(BasePurger):
+    """Purge por Cache-Tag na API do Cloudflare (CLOUDFLARE_ZONE_ID / CLOUDFLARE_API_TOKEN)."""
+    # Limite de tags por chamada da API
+    BATCH_SIZE = 30
+    TIMEOUT = 5
+
+    def purge(self, keys):
+        url = f'https://api.cloudflare.com/client/v4/zones/{settings.CLOUDFLARE_ZONE_ID}/purge_cache'
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            request = Request(
+                url,
+                data=json.dumps({'tags': list(keys[start:start + self.BATCH_SIZE])}).encode(),
+                headers={
+                    'Authorization': f'Bearer {settings.CLOUDFLARE_API_TOKEN}',
+                    'Content-Type': 'application/json',
+                },
+                method='POST',
+            )
+            with urlopen(request, timeout=self.TIMEOUT) as response:
+                result = json.loads(response.read())
+            if not result.get('success'):
+                raise RuntimeError(f'Cloudflare purge falhou: {result.get("errors")}')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_purger(path):
+    return import_string(path)()
+
+
+def get_purger():
+    return _load_purger(settings.CDN_PURGER)
+
+
+def schedule_purge(keys):
+    """Purga as tags após o commit da transação atual (pelo worker de config/jobs.py)."""
+    jobs.enqueue('purge', keys)
+
+
+def run(keys):
+    """Tarefa da fila: uma chamada ao purger com todas as tags pendentes."""
+    get_purger().purge(sorted(keys))
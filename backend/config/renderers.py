@@ -0,0 +1,42 @@
+"""
+Renderer JSON rápido baseado em orjson.
+
+orjson é opcional: sem ele instalado, ORJSONRenderer se comporta
+exatamente como o JSONRenderer do DRF. Tipos que o orjson não serializa
+nativamente (datetime, Decimal, lazy translation, QuerySet...) são
+convertidos pelo mesmo encoder do DRF, então a saída é equivalente.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _drf_encoder.default(obj)
+
+
+if orjson is not None:
+    # datetime/date/time passam pelo encoder do DRF (formato "Z", milissegundos)
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer que usa orjson quando disponível."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Saída indentada (?format=json; indent=4) continua com o renderer do DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        # Mesmo escape de U+2028/U+2029 feito pelo DRF (JSON embutido em JS)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,471 @@
+"""
+Django settings for nexus_valvulas project.
+
+Configuração completa (API + admin em um só processo), usada por padrão.
+Perfis para processos separados, que importam esta e ajustam:
+    config.settings.api    API pública: apps e middlewares mínimos, sem admin
+    config.settings.admin  workers do admin (sessões em cache, sem índice do catálogo)
+"""
+
+import os
+from pathlib import Path
+from datetime import timedelta
+from decouple import config
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-this-in-production')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+# python-decouple lê automaticamente do arquivo .env
+DEBUG = False  # Temporário para depuração (voltar para config após)
+
+ALLOWED_HOSTS = config(
+    'ALLOWED_HOSTS',
+    default='admin.nexusvalvulas.com.br,nexusvalvulas.com.br,localhost,127.0.0.1'
+).split(',')
+
+# CSRF: confiar nas origens do admin atrás do proxy (Cloudflare/Plesk)
+CSRF_TRUSTED_ORIGINS = [
+    'https://admin.nexusvalvulas.com.br',
+    'http://admin.nexusvalvulas.com.br',
+]
+
+# Proxy/SSL (Cloudflare ou outro reverse proxy)
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+USE_X_FORWARDED_HOST = True
+USE_X_FORWARDED_PORT = True
+
+# Cookies em produção (HTTPS)
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+CSRF_COOKIE_SAMESITE = 'Lax'
+
+
+# Application definition
+
+# Processos só de API: o admin (e os admin.py de cada app, CKEditor,
+# jazzmin) é importado na primeira requisição a /admin/, não no boot.
+# Ver config/urls.py e profile_imports.
+DEFER_ADMIN_IMPORTS = config('DEFER_ADMIN_IMPORTS', default=False, cast=bool)
+
+INSTALLED_APPS = [
+    'jazzmin',  # Tema admin Nexus (azul/cinza)
+    # SimpleAdminConfig não roda o autodiscover no setup
+    'django.contrib.admin.apps.SimpleAdminConfig' if DEFER_ADMIN_IMPORTS else 'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    # Third party
+    'ckeditor',
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',  # rotação de refresh tokens
+    'corsheaders',
+    # Local apps
+    'api',  # User model apenas
+    'apps.products',  # Sistema de produtos
+    'apps.blog',      # Blog (nova estrutura)
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Depois do WhiteNoise (estáticos já vêm pré-comprimidos) e antes do resto
+    'config.middleware.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'config.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+
+# Use SQLite para desenvolvimento local (mais fácil)
+# Para produção, altere para PostgreSQL
+USE_SQLITE = config('USE_SQLITE', default='True', cast=bool)
+
+# Backend SQLite com WAL, BEGIN IMMEDIATE e PRAGMAs de desempenho
+# (config/backends/sqlite3); False volta ao backend padrão do Django
+SQLITE_TUNED = config('SQLITE_TUNED', default=True, cast=bool)
+
+if USE_SQLITE:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'config.backends.sqlite3' if SQLITE_TUNED else 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            # Conexão reaproveitada entre requisições: mantém o cache de páginas
+            'CONN_MAX_AGE': config('SQLITE_CONN_MAX_AGE', default=60, cast=int),
+            'OPTIONS': {
+                # Espera (s) por um lock de escrita antes de "database is locked"
+                'timeout': config('SQLITE_BUSY_TIMEOUT', default=15, cast=float),
+            },
+        }
+    }
+    if SQLITE_TUNED:
+        DATABASES['default']['OPTIONS'].update({
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+                'cache_size': -config('SQLITE_CACHE_SIZE_KB', default=20000, cast=int),
+            },
+        })
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='nexus_valvulas'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+        }
+    }
+
+# Réplicas de leitura (config/db_router.py): leituras anônimas do catálogo e
+# do blog. PostgreSQL: DB_REPLICA_HOSTS=host[:porta],... com as credenciais do
+# primário. SQLite (teste local): SQLITE_REPLICA_PATHS=caminho,... abertos só
+# para leitura e atualizados por "python manage.py sync_sqlite_replica".
+if USE_SQLITE:
+    _replicas = [
+        {'ENGINE': 'django.db.backends.sqlite3', 'NAME': f'file:{BASE_DIR / path.strip()}?mode=ro'}
+        for path in config('SQLITE_REPLICA_PATHS', default='').split(',') if path.strip()
+    ]
+else:
+    _replicas = [
+        {**DATABASES['default'], 'HOST': host.strip(), 'PORT': port or DATABASES['default']['PORT']}
+        for host, _, port in (entry.partition(':') for entry in config('DB_REPLICA_HOSTS', default='').split(','))
+        if host.strip()
+    ]
+
+DATABASE_REPLICAS = []
+for _n, _replica in enumerate(_replicas, 1):
+    DATABASES[f'replica_{_n}'] = {**_replica, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{_n}')
+
+DATABASE_ROUTERS = ['config.db_router.ReadReplicaRouter'] if DATABASE_REPLICAS else []
+# Janela (s) em que um cliente que escreveu, e todos após uma alteração do
+# catálogo/blog, leem do primário (maior que o atraso típico da replicação)
+DATABASE_REPLICA_STICKY_SECONDS = config('DATABASE_REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Hashers: Argon2 (se argon2-cffi estiver instalado) com custo configurável.
+# Senhas antigas são convertidas no próximo login bem-sucedido.
+try:
+    import argon2  # noqa: F401
+    _ARGON2_HASHERS = ['api.hashers.TunedArgon2PasswordHasher']
+except ImportError:
+    _ARGON2_HASHERS = []
+
+# Um hasher por algoritmo: os "Tuned" substituem os padrões de argon2/pbkdf2_sha256
+PASSWORD_HASHERS = _ARGON2_HASHERS + [
+    'api.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=600000, cast=int)
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.0/topics/i18n/
+
+LANGUAGE_CODE = 'pt-br'
+
+TIME_ZONE = 'America/Sao_Paulo'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images) — WhiteNoise em produção
+# https://docs.djangoproject.com/en/5.0/howto/static-files/
+
+STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Additional locations of static files (collectstatic copia para STATIC_ROOT)
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+] if (BASE_DIR / 'static').exists() else []
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Uploads com nome = hash do conteúdo (dedup + cache imutável), ver config/storage.py
+DEFAULT_FILE_STORAGE = 'config.storage.HashedMediaStorage'
+# Base URL da CDN para mídia (ex: https://cdn.nexusvalvulas.com.br/media/); vazio = MEDIA_URL
+MEDIA_CDN_URL = config('MEDIA_CDN_URL', default='')
+# Servir /media/ pelo Django (deploy sem nginx); nginx/CDN podem servir direto
+SERVE_MEDIA = config('SERVE_MEDIA', default='True', cast=bool)
+# Cache para arquivos antigos (sem hash no nome)
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=604800, cast=int)
+# Marca para revisão (ImageBlob.similar_to) imagens novas com o mesmo hash
+# perceptual de outra; a deduplicação em si é só por SHA-256 (conteúdo idêntico)
+MEDIA_DEDUP_PERCEPTUAL = config('MEDIA_DEDUP_PERCEPTUAL', default='False', cast=bool)
+# Prefixos que o gc_media nunca remove (uploads do CKEditor, referenciados só no HTML)
+MEDIA_GC_PROTECTED_PREFIXES = [
+    prefix.strip() for prefix in config('MEDIA_GC_PROTECTED_PREFIXES', default='uploads/').split(',') if prefix.strip()
+]
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Cache compartilhado entre os workers (throttling, etc.).
+# Sem REDIS_URL, usa memória local de cada processo (o gunicorn então
+# exige um único worker, ver gunicorn.conf.py).
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'nexus',
+        }
+    }
+
+# Custom User Model
+AUTH_USER_MODEL = 'api.User'
+
+# REST Framework
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        # Leituras usam as claims do token, sem buscar o User no banco
+        'api.authentication.StatelessJWTAuthentication',
+    ),
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.AllowAny',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 100,
+    # orjson quando instalado; sem ele, mesmo comportamento do JSONRenderer/JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+    ],
+    # Balde de tokens por IP (anônimos) e por usuário; login tem throttles próprios
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonBurstThrottle',
+        'api.throttling.UserBurstThrottle',
+    ],
+    # IP dos throttles: o endereço que o último proxy (nginx) acrescentou ao
+    # X-Forwarded-For; entradas anteriores vêm do cliente e são ignoradas.
+    # 0 = sem proxy (usa REMOTE_ADDR); 2 = Cloudflare + nginx
+    'NUM_PROXIES': config('NUM_PROXIES', default=1, cast=int),
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': config('THROTTLE_ANON_RATE', default='120/min'),
+        'user': config('THROTTLE_USER_RATE', default='600/min'),
+        'login_ip': config('THROTTLE_LOGIN_IP_RATE', default='20/min'),
+        'login_email': config('THROTTLE_LOGIN_EMAIL_RATE', default='5/min'),
+    },
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Tamanho do lote nas respostas JSON em streaming (config/streaming.py)
+API_STREAM_CHUNK_SIZE = config('API_STREAM_CHUNK_SIZE', default=100, cast=int)
+
+# Índice do catálogo em memória por worker (apps/products/catalog.py)
+CATALOG_INDEX_ENABLED = config('CATALOG_INDEX_ENABLED', default=True, cast=bool)
+# Intervalo (s) entre checagens da versão do catálogo no cache compartilhado
+CATALOG_INDEX_CHECK_INTERVAL = config('CATALOG_INDEX_CHECK_INTERVAL', default=1.0, cast=float)
+# Recarga forçada (s); limita a defasagem quando o cache não é compartilhado (LocMem)
+CATALOG_INDEX_MAX_AGE = config('CATALOG_INDEX_MAX_AGE', default=300, cast=int)
+
+# Cache de respostas anônimas da API (config/cache.py)
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+# Respostas em streaming maiores que isso não são cacheadas
+API_CACHE_MAX_BYTES = config('API_CACHE_MAX_BYTES', default=2 * 1024 * 1024, cast=int)
+
+# Cabeçalhos de cache HTTP/CDN das respostas públicas (config/cache.py)
+CDN_BROWSER_MAX_AGE = config('CDN_BROWSER_MAX_AGE', default=60, cast=int)
+CDN_S_MAXAGE = config('CDN_S_MAXAGE', default=API_CACHE_TIMEOUT, cast=int)
+CDN_STALE_WHILE_REVALIDATE = config('CDN_STALE_WHILE_REVALIDATE', default=60, cast=int)
+CDN_STALE_IF_ERROR = config('CDN_STALE_IF_ERROR', default=86400, cast=int)
+# Purga por tag após alterações (config/purge.py); CloudflarePurger exige o plano Enterprise
+CDN_PURGER = config('CDN_PURGER', default='config.purge.LoggingPurger')
+CLOUDFLARE_ZONE_ID = config('CLOUDFLARE_ZONE_ID', default='')
+CLOUDFLARE_API_TOKEN = config('CLOUDFLARE_API_TOKEN', default='')
+# Purga, snapshots e recomendações rodam no worker (manage.py run_jobs, config/jobs.py);
+# True executa logo após o commit, na própria requisição (desenvolvimento sem worker)
+JOBS_EAGER = config('JOBS_EAGER', default=False, cast=bool)
+
+# Quantidade de posts em /api/blog/posts/{slug}/related/
+BLOG_RELATED_POSTS = config('BLOG_RELATED_POSTS', default=4, cast=int)
+# Outros produtos da categoria em /api/products/products/{slug}/page/
+PRODUCT_PAGE_SIBLINGS = config('PRODUCT_PAGE_SIBLINGS', default=12, cast=int)
+# Vizinhos pré-calculados por produto em /api/products/products/{slug}/related/
+RECOMMENDATIONS_TOP_K = config('RECOMMENDATIONS_TOP_K', default=8, cast=int)
+
+# Compressão das respostas da API (config/middleware.py); br se o pacote brotli estiver instalado
+COMPRESSION_MIN_LENGTH = config('COMPRESSION_MIN_LENGTH', default=512, cast=int)
+COMPRESSION_CONTENT_TYPES = (
+    'application/json',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'text/xml',
+)
+
+# Token para o Prometheus ler /api/metrics (header X-Metrics-Token); vazio = só admins
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# JWT Settings
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_TTL', 1440))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=14),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': SECRET_KEY,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
+    'USER_ID_FIELD': 'id',
+    'USER_ID_CLAIM': 'user_id',
+    'TOKEN_USER_CLASS': 'api.authentication.ClaimsTokenUser',
+}
+
+# Leituras confiam nas claims do access token (sem banco) só até esta idade,
+# em segundos; depois buscam o usuário. É a janela em que um usuário
+# desativado ou rebaixado ainda lê com um token já emitido (api/authentication.py)
+JWT_CLAIMS_MAX_AGE = config('JWT_CLAIMS_MAX_AGE', default=300, cast=int)
+
+# Tokens JWT já validados mantidos em memória por processo (até expirarem)
+JWT_VALIDATED_TOKEN_CACHE_SIZE = config('JWT_VALIDATED_TOKEN_CACHE_SIZE', default=1024, cast=int)
+
+# CORS Settings
+CORS_ALLOWED_ORIGINS = os.environ.get(
+    'CORS_ALLOWED_ORIGINS',
+    'http://localhost:3000,http://localhost:5173,http://localhost:4000'
+).split(',')
+
+CORS_ALLOW_CREDENTIALS = False
+CORS_ALLOW_ALL_ORIGINS = DEBUG  # Only in development
+
+# Email Settings
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = os.environ.get('MAIL_HOST', 'smtp.gmail.com')
+EMAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
+EMAIL_USE_TLS = os.environ.get('MAIL_ENCRYPTION', 'tls') == 'tls'
+EMAIL_HOST_USER = os.environ.get('MAIL_USERNAME', '')
+EMAIL_HOST_PASSWORD = os.environ.get('MAIL_PASSWORD', '')
+DEFAULT_FROM_EMAIL = os.environ.get('MAIL_FROM_ADDRESS', '')
+CONTACT_EMAIL = os.environ.get('CONTACT_EMAIL', 'nexus@nexusvalvulas.com.br')
+
+# Public URL for file serving
+PUBLIC_URL = os.environ.get('PUBLIC_URL', 'http://localhost:8000')
+
+# Sitemap e feeds do blog (config/sitemaps.py): URL do site (React) e arquivos pré-gerados
+SITE_URL = config('SITE_URL', default='https://nexusvalvulas.com.br')
+SITEMAP_ROOT = config('SITEMAP_ROOT', default=str(BASE_DIR / 'var' / 'sitemaps'))
+FEED_ITEMS = config('FEED_ITEMS', default=20, cast=int)
+# Snapshots HTML de categorias, produtos e posts para crawlers (config/prerender.py)
+PRERENDER_ENABLED = config('PRERENDER_ENABLED', default=True, cast=bool)
+PRERENDER_ROOT = config('PRERENDER_ROOT', default=str(BASE_DIR / 'var' / 'prerender'))
+
+# -----------------------------------------------------------------------------
+# CKEditor — Editor rico para o blog
+# -----------------------------------------------------------------------------
+CKEDITOR_CONFIGS = {
+    'default': {
+        'toolbar': 'full',
+        'height': 300,
+        'width': '100%',
+    },
+}
+
+# -----------------------------------------------------------------------------
+# Jazzmin — Admin Nexus (visual azul/cinza, industrial/corporativo)
+# -----------------------------------------------------------------------------
+JAZZMIN_SETTINGS = {
+    "site_title": "Nexus Admin",
+    "site_header": "Nexus Válvulas",
+    "site_brand": "Nexus Forge",
+    "welcome_sign": "Bem-vindo à Nexus",
+    "copyright": "Nexus Válvulas e Conexões",
+    "show_ui_builder": False,
+}
+
+JAZZMIN_UI_TWEAKS = {
+    "theme": "flatly",
+    "dark_mode_theme": "darkly",
+    "navbar": "navbar-dark",
+    "sidebar": "sidebar-dark-primary",
+    "brand_colour": "navbar-primary",
+    "accent": "accent-primary",
+    "button_classes": {
+        "primary": "btn-primary",
+        "secondary": "btn-secondary",
+        "info": "btn-info",
+        "warning": "btn-warning",
+        "danger": "btn-danger",
+        "success": "btn-success",
+    },
+}
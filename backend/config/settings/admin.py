@@ -0,0 +1,19 @@
+"""
+Perfil dos workers do admin (DJANGO_SETTINGS_MODULE=config.settings.admin).
+
+Todos os apps e middlewares da configuração base. O nginx encaminha
+/admin/ e /static/ para estes workers; a API pública fica com os de
+config.settings.api. Poucos usuários, então:
+
+- sessões em cache com escrita no banco (cached_db): uma consulta a
+  menos por página do admin;
+- índice do catálogo em memória desligado por padrão (cada save no admin
+  o invalidaria, e o tráfego de leitura do catálogo não passa por aqui).
+"""
+from decouple import config
+
+from . import *  # noqa: F401,F403
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+CATALOG_INDEX_ENABLED = config('CATALOG_INDEX_ENABLED', default=False, cast=bool)
@@ -0,0 +1,49 @@
+"""
+Perfil do processo público da API (DJANGO_SETTINGS_MODULE=config.settings.api).
+
+Só JSON com autenticação JWT: sem admin, jazzmin, sessões, mensagens,
+CKEditor (o campo RichTextField não depende do app) e sem os middlewares
+de sessão/CSRF/autenticação/mensagens/clickjacking, que rodariam em toda
+requisição sem uso. /static/ fica com o nginx ou com os workers do admin.
+
+Escalado separadamente dos workers do admin (config.settings.admin); ver
+a seção "Perfis" de GUNICORN.md e o comando bench_middleware.
+"""
+from . import *  # noqa: F401,F403
+from . import INSTALLED_APPS, TEMPLATES
+
+# Apps usados só pelo admin (ou por sessões/cookies do navegador)
+ADMIN_ONLY_APPS = (
+    'jazzmin',
+    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'ckeditor',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'config.middleware.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'config.api_urls'
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+# Sem admin para descobrir
+DEFER_ADMIN_IMPORTS = False
@@ -0,0 +1,184 @@
+"""
+Sitemap (com imagens do catálogo) e feeds RSS/Atom do blog, pré-gerados em arquivo.
+
+Documentos:
+    sitemap.xml  páginas estáticas, categorias, produtos e posts; cada
+                 produto com <image:image> da imagem principal, das
+                 variantes e dos tamanhos, e cada post com a capa
+    rss.xml      últimos FEED_ITEMS posts publicados (RSS 2.0)
+    atom.xml     os mesmos posts em Atom 1.0
+
+Os documentos são escritos em fluxo direto no arquivo (SimplerXMLGenerator,
+consultas com ``.iterator()``): o XML inteiro nunca fica em memória. O
+nome do arquivo em SITEMAP_ROOT leva as versões de cache dos namespaces de
+que o documento depende (config/cache.py); uma alteração no catálogo ou no
+blog muda a versão, e a próxima requisição (ou ``build_sitemaps``) gera o
+arquivo novo. As views servem o arquivo com FileResponse, também em fluxo.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.utils import feedgenerator
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from apps.blog.models import Post
+from apps.products.models import Category, Product
+from config.cache import get_version
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+IMAGE_NS = 'http://www.google.com/schemas/sitemap-image/1.1'
+# Limite do Google de imagens por <url>
+MAX_IMAGES_PER_URL = 1000
+CHUNK_SIZE = 500
+# Arquivos de versões antigas ficam um tempo: com LocMemCache (sem
+# REDIS_URL) cada worker tem as próprias versões e pode ainda servi-los
+STALE_SECONDS = 3600
+
+# Rotas do React (Home e páginas institucionais)
+STATIC_PAGES = ['/', '/sobre', '/produtos', '/contato', '/blog']
+
+
+def site_url(path):
+    """URL absoluta no site (caminhos já absolutos, ex: mídia na CDN, ficam como estão)."""
+    return urljoin(settings.SITE_URL, path)
+
+
+def _url(xml, loc, lastmod=None, changefreq=None, images=()):
+    xml.startElement('url', {})
+    xml.addQuickElement('loc', loc)
+    if lastmod is not None:
+        xml.addQuickElement('lastmod', lastmod.date().isoformat())
+    if changefreq:
+        xml.addQuickElement('changefreq', changefreq)
+    for image in images[:MAX_IMAGES_PER_URL]:
+        xml.startElement('image:image', {})
+        xml.addQuickElement('image:loc', image)
+        xml.endElement('image:image')
+    xml.endElement('url')
+
+
+def product_images(product):
+    """URLs (sem repetição, na ordem da página) das imagens do produto, variantes e tamanhos."""
+    files = [product.image]
+    for variant in product.variants.all():
+        files.append(variant.image)
+        files.extend(size.image for size in variant.sizes.all())
+    files.extend(size.image for size in product.sizes.all())
+    # Uploads deduplicados (apps/products/media.py) repetem o mesmo arquivo
+    return list(dict.fromkeys(site_url(file.url) for file in files if file))
+
+
+def write_sitemap(out):
+    xml = SimplerXMLGenerator(out, 'utf-8', short_empty_elements=True)
+    xml.startDocument()
+    xml.startElement('urlset', {'xmlns': SITEMAP_NS, 'xmlns:image': IMAGE_NS})
+
+    for path in STATIC_PAGES:
+        _url(xml, site_url(path), changefreq='weekly')
+
+    categories = Category.objects.filter(is_active=True).order_by('order', 'name').only('slug', 'updated_at')
+    for category in categories.iterator(chunk_size=CHUNK_SIZE):
+        _url(xml, site_url(f'/produtos/{category.slug}'), lastmod=category.updated_at, changefreq='weekly')
+
+    products = Product.objects.filter(is_active=True, category__is_active=True).with_details()
+    for product in products.iterator(chunk_size=CHUNK_SIZE):
+        _url(
+            xml, site_url(f'/produtos/{product.category.slug}/{product.slug}'),
+            lastmod=product.updated_at, changefreq='weekly', images=product_images(product),
+        )
+
+    posts = Post.objects.published().only('slug', 'cover_image', 'updated_at')
+    for post in posts.iterator(chunk_size=CHUNK_SIZE):
+        _url(
+            xml, site_url(f'/blog/{post.slug}'), lastmod=post.updated_at, changefreq='daily',
+            images=[site_url(post.cover_image.url)] if post.cover_image else [],
+        )
+
+    xml.endElement('urlset')
+    xml.endDocument()
+
+
+def _write_feed(feed_class, feed_path):
+    def write(out):
+        feed = feed_class(
+            title='Blog Nexus Válvulas',
+            link=site_url('/blog'),
+            description='Artigos técnicos sobre válvulas e conexões industriais',
+            language='pt-br',
+            feed_url=site_url(feed_path),
+            author_name='Nexus Válvulas',
+        )
+        # Só os FEED_ITEMS posts mais recentes passam pela memória do feed
+        posts = Post.objects.published().select_related('category')[:settings.FEED_ITEMS]
+        for post in posts:
+            link = site_url(f'/blog/{post.slug}')
+            feed.add_item(
+                title=post.title,
+                link=link,
+                unique_id=link,
+                description=post.excerpt or post.meta_description or '',
+                pubdate=post.published_at,
+                updateddate=post.updated_at,
+                categories=[post.category.name] if post.category else None,
+            )
+        feed.write(out, 'utf-8')
+    return write
+
+
+DOCUMENTS = {
+    # nome: (namespaces de cache de que depende, função que escreve o XML)
+    'sitemap.xml': (('catalog', 'blog'), write_sitemap),
+    'rss.xml': (('blog',), _write_feed(feedgenerator.Rss201rev2Feed, '/rss.xml')),
+    'atom.xml': (('blog',), _write_feed(feedgenerator.Atom1Feed, '/atom.xml')),
+}
+
+
+def document_path(name):
+    """Arquivo do documento na versão atual do catálogo/blog."""
+    namespaces, _ = DOCUMENTS[name]
+    stem, ext = os.path.splitext(name)
+    versions = '-'.join(str(get_version(namespace)) for namespace in namespaces)
+    return Path(settings.SITEMAP_ROOT) / f'{stem}.{versions}{ext}'
+
+
+def build_document(name, path=None):
+    """Gera o documento num temporário e o troca atomicamente pelo arquivo final."""
+    path = path or document_path(name)
+    _, write = DOCUMENTS[name]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            write(out)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _remove_stale(name, path)
+    return path
+
+
+def _remove_stale(name, current):
+    stem, ext = os.path.splitext(name)
+    limit = time.time() - STALE_SECONDS
+    for path in current.parent.glob(f'{stem}.*{ext}'):
+        try:
+            if path != current and path.stat().st_mtime < limit:
+                path.unlink()
+        except FileNotFoundError:
+            # Removido por outro worker
+            pass
+
+
+def open_document(name):
+    """Arquivo (binário, aberto) da versão atual, gerado agora se ainda não existir."""
+    path = document_path(name)
+    try:
+        return open(path, 'rb')
+    except FileNotFoundError:
+        # Dois workers podem gerar ao mesmo tempo: o os.replace mantém o arquivo íntegro
+        return open(build_document(name, path), 'rb')
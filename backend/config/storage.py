@@ -0,0 +1,65 @@
+"""
+Storage de mídia com nomes derivados do conteúdo (content-addressed).
+
+Cada upload é gravado como ``<upload_to>/<sha256[:32]>.<ext>``:
+- o mesmo arquivo enviado duas vezes vira um único arquivo em disco;
+- um nome nunca é sobrescrito com outro conteúdo, então pode ser
+  servido com ``Cache-Control: immutable`` (ver ``config.views.media_view``);
+- ``MEDIA_CDN_URL`` permite servir as URLs por uma CDN sem mudar o banco.
+"""
+import hashlib
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+HASH_LENGTH = 32
+HASHED_NAME_RE = re.compile(r'(?:^|/)[0-9a-f]{%d}\.[A-Za-z0-9]+$' % HASH_LENGTH)
+
+
+def file_digest(content):
+    """SHA-256 (hex) do conteúdo de um File, lido em chunks."""
+    sha = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        sha.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return sha.hexdigest()
+
+
+def is_hashed_name(name):
+    """True se o nome foi gerado pelo HashedMediaStorage (conteúdo imutável)."""
+    return bool(HASHED_NAME_RE.search(name or ''))
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """FileSystemStorage com nomes por hash do conteúdo e base URL de CDN."""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        # Mesmo hash = mesmo conteúdo: reaproveita o arquivo existente
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def hashed_name(self, name, content):
+        dirname, basename = posixpath.split(str(name).replace('\\', '/'))
+        ext = posixpath.splitext(basename)[1].lower()
+        digest = file_digest(content)[:HASH_LENGTH]
+        return posixpath.join(dirname, f'{digest}{ext}')
+
+    @cached_property
+    def base_url(self):
+        cdn_url = getattr(settings, 'MEDIA_CDN_URL', '')
+        if cdn_url:
+            return cdn_url if cdn_url.endswith('/') else f'{cdn_url}/'
+        return super().base_url
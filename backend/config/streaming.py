@@ -0,0 +1,43 @@
+"""
+Respostas JSON em streaming para listas grandes.
+
+Em vez de serializar a lista inteira e renderizar uma única string, o
+queryset é percorrido em lotes (``QuerySet.iterator(chunk_size)`` com os
+prefetches aplicados por lote) e cada lote é serializado e enviado em
+seguida. O pico de memória depende do tamanho do lote, não da lista.
+"""
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+
+
+def iter_json_array(queryset, serializer_class, context=None, chunk_size=None, renderer=None):
+    """Gera os bytes de um array JSON com os objetos serializados do queryset."""
+    chunk_size = chunk_size or settings.API_STREAM_CHUNK_SIZE
+    renderer = renderer or api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    def render(rows):
+        data = serializer_class(rows, many=True, context=context or {}).data
+        # Remove os colchetes: os lotes são concatenados no mesmo array
+        return renderer.render(data)[1:-1]
+
+    yield b'['
+    first = True
+    rows = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        rows.append(obj)
+        if len(rows) >= chunk_size:
+            yield render(rows) if first else b',' + render(rows)
+            first = False
+            rows = []
+    if rows:
+        yield render(rows) if first else b',' + render(rows)
+    yield b']'
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """StreamingHttpResponse com content type JSON."""
+
+    def __init__(self, streaming_content=(), **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(streaming_content, **kwargs)
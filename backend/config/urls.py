@@ -1,14 +1,21 @@
 """
 URL configuration for nexus_valvulas project.
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
-from apps.blog.views import sitemap_view
+from django.urls import path
+from django.urls.resolvers import RoutePattern, URLResolver
+from config.api_urls import urlpatterns as public_urlpatterns
+
+if settings.DEFER_ADMIN_IMPORTS:
+    # Módulo como string: o URLResolver só o importa quando /admin/ é usado
+    admin_urls = URLResolver(
+        RoutePattern("admin/", is_endpoint=False), "config.admin_urls", app_name="admin", namespace=admin.site.name
+    )
+else:
+    admin_urls = path("admin/", admin.site.urls)
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("sitemap.xml", sitemap_view),
-    path("api/", include("api.urls")),
-    path("api/products/", include("apps.products.urls")),
-    path("api/blog/", include("apps.blog.urls")),
+    admin_urls,
+    *public_urlpatterns,
 ]
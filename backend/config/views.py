@@ -1,19 +1,87 @@
+from django.conf import settings
+from django.http import FileResponse, Http404
 from django.shortcuts import render
+from django.views.static import serve
 
+from apps.products.catalog import HOME_PRODUCTS, get_catalog
 from apps.products.models import Product
+from config import prerender, sitemaps
+from config.cache import set_cdn_headers
+from config.storage import is_hashed_name
+
+# Arquivos com hash no nome nunca mudam de conteúdo: cache de 1 ano
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 def home(request):
   """
-  Página inicial simples listando produtos ativos.
+  Página inicial simples listando produtos ativos (do índice em memória quando ligado).
   """
-  products = (
-    Product.objects.filter(is_active=True)
-    .select_related("category")
-    .order_by("title")[:12]
-  )
+  catalog = get_catalog()
+  if catalog is not None:
+    products = catalog.home_products
+  else:
+    products = (
+      Product.objects.filter(is_active=True)
+      .select_related("category")
+      .order_by("title")[:HOME_PRODUCTS]
+    )
   context = {
     "products": products,
   }
   return render(request, "home.html", context)
 
+
+def media_view(request, path):
+  """
+  Serve arquivos de MEDIA_ROOT com cabeçalhos de cache.
+  Nomes gerados pelo HashedMediaStorage são imutáveis (browsers e proxies
+  não revalidam); arquivos antigos, sem hash, recebem MEDIA_CACHE_MAX_AGE.
+  """
+  response = serve(request, path, document_root=settings.MEDIA_ROOT)
+  if is_hashed_name(path):
+    response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+  else:
+    response["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+  return response
+
+
+def _document_response(name, content_type, surrogate_keys):
+  """Serve em fluxo o arquivo pré-gerado por config/sitemaps.py, com cabeçalhos de CDN."""
+  response = FileResponse(sitemaps.open_document(name), content_type=content_type)
+  set_cdn_headers(response, surrogate_keys)
+  return response
+
+
+def sitemap_view(request):
+  """
+  sitemap.xml com páginas estáticas, categorias, produtos (com imagens) e posts.
+  Purgado do CDN junto com as listagens do catálogo e do blog.
+  """
+  return _document_response(
+    "sitemap.xml", "application/xml", ["catalog", "blog", "category-list", "product-list", "post-list"]
+  )
+
+
+def rss_view(request):
+  """Feed RSS 2.0 dos últimos posts do blog."""
+  return _document_response("rss.xml", "application/rss+xml; charset=utf-8", ["blog", "post-list"])
+
+
+def atom_view(request):
+  """Feed Atom 1.0 dos últimos posts do blog."""
+  return _document_response("atom.xml", "application/atom+xml; charset=utf-8", ["blog", "post-list"])
+
+
+def prerender_view(request, path):
+  """
+  Snapshot HTML de categoria, produto ou post (config/prerender.py) para crawlers.
+  Sem snapshot, 404: o nginx devolve a SPA no lugar.
+  """
+  try:
+    snapshot = open(prerender.snapshot_file(path), "rb")
+  except FileNotFoundError:
+    raise Http404
+  response = FileResponse(snapshot, content_type="text/html; charset=utf-8")
+  set_cdn_headers(response, ["prerender", prerender.page_tag(path)])
+  return response
@@ -6,5 +6,5 @@ cd /app
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput || true
 
-gunicorn config.wsgi:application --bind 0.0.0.0:8000 --workers 3
-
+# Workers, threads, preload e reciclagem: ver gunicorn.conf.py (variáveis GUNICORN_*)
+exec gunicorn -c gunicorn.conf.py
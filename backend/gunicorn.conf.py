@@ -0,0 +1,140 @@
+"""
+Configuração do gunicorn (lida por ``gunicorn -c gunicorn.conf.py``).
+
+Tudo pode ser ajustado por variáveis de ambiente; os padrões valem para
+o container do docker-compose (nginx na frente). Medições em GUNICORN.md.
+
+GUNICORN_WORKER_CLASS:
+    sync     um request por worker; workers = 2 * CPUs + 1
+    gthread  GUNICORN_THREADS threads por worker; workers = CPUs + 1
+             (padrão: as views passam a maior parte do tempo no banco/cache)
+    uvicorn  config.asgi com uvicorn.workers.UvicornWorker; exige
+             ``pip install uvicorn``; workers = CPUs + 1
+
+Com GUNICORN_PRELOAD=True (padrão) a aplicação é importada uma vez no
+master e os workers nascem por fork: boot mais rápido e as páginas de
+código compartilhadas por copy-on-write. Com GUNICORN_WARM_CATALOG=True o
+índice do catálogo (apps/products/catalog.py) também é carregado no
+master, antes do fork.
+"""
+import multiprocessing
+import os
+
+
+def env(name, default, cast=str):
+    value = os.environ.get(name)
+    if value is None or value == '':
+        return default
+    if cast is bool:
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return cast(value)
+
+
+def available_cpus():
+    """CPUs utilizáveis, respeitando cpuset e a cota de CPU do cgroup (containers)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+_kind = env('GUNICORN_WORKER_CLASS', 'gthread').lower()
+if _kind not in WORKER_CLASSES:
+    raise ValueError(f'GUNICORN_WORKER_CLASS inválido: {_kind} (use {", ".join(WORKER_CLASSES)})')
+
+_cpus = available_cpus()
+_default_workers = 2 * _cpus + 1 if _kind == 'sync' else _cpus + 1
+
+wsgi_app = 'config.asgi:application' if _kind == 'uvicorn' else 'config.wsgi:application'
+worker_class = WORKER_CLASSES[_kind]
+workers = min(env('GUNICORN_WORKERS', _default_workers, int), env('GUNICORN_MAX_WORKERS', 12, int))
+threads = env('GUNICORN_THREADS', 4, int) if _kind == 'gthread' else 1
+
+bind = env('GUNICORN_BIND', '0.0.0.0:8000')
+preload_app = env('GUNICORN_PRELOAD', True, bool)
+
+# Reciclagem dos workers (vazamentos de memória); o jitter evita que
+# todos reiniciem juntos
+max_requests = env('GUNICORN_MAX_REQUESTS', 1000, int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', 100, int)
+
+timeout = env('GUNICORN_TIMEOUT', 30, int)
+graceful_timeout = env('GUNICORN_GRACEFUL_TIMEOUT', 30, int)
+# Atrás do nginx: conexões keep-alive curtas
+keepalive = env('GUNICORN_KEEPALIVE', 5, int)
+
+# Heartbeat dos workers em memória (evita travas de disco no overlayfs do Docker)
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+forwarded_allow_ips = env('GUNICORN_FORWARDED_ALLOW_IPS', '127.0.0.1')
+accesslog = env('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = env('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Vários workers exigem cache compartilhado (REDIS_URL).
+
+    Com LocMemCache cada worker tem seus próprios token buckets, versões do
+    cache de respostas (``bump_version``) e contadores de /api/metrics.
+    GUNICORN_ALLOW_LOCAL_CACHE=True só avisa (desenvolvimento).
+    """
+    if workers < 2:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    from config.cache import cache_is_shared
+
+    if cache_is_shared():
+        return
+    message = (
+        f'{workers} workers sem cache compartilhado: throttles, cache de respostas e '
+        '/api/metrics ficariam por processo. Defina REDIS_URL ou GUNICORN_WORKERS=1 '
+        '(GUNICORN_ALLOW_LOCAL_CACHE=True para só avisar)'
+    )
+    if env('GUNICORN_ALLOW_LOCAL_CACHE', False, bool):
+        server.log.warning(message)
+        return
+    raise RuntimeError(message)
+
+
+def when_ready(server):
+    """Master pronto (com preload, a aplicação já foi importada)."""
+    if preload_app and env('GUNICORN_WARM_CATALOG', True, bool):
+        from apps.products.catalog import get_catalog
+
+        try:
+            catalog = get_catalog()
+        except Exception as exc:  # banco indisponível não impede o boot
+            server.log.warning('Índice do catálogo não pré-carregado: %s', exc)
+        else:
+            if catalog is not None:
+                server.log.info('Índice do catálogo pré-carregado: %d produtos', len(catalog.products))
+        _close_db_connections()
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master não podem ser compartilhadas entre processos
+    _close_db_connections()
+
+
+def _close_db_connections():
+    if not preload_app:
+        return
+    from django.db import connections
+
+    connections.close_all()